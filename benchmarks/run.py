@@ -0,0 +1,297 @@
+"""
+Headless benchmarks for TermFlow.
+
+Drives TermFlowApp through App.run_test() against a throwaway data
+directory seeded with N tasks and times:
+
+    import           importing termflow.ui.app (also checked against BUDGETS)
+    startup          import of the app to the first painted frame
+    add / toggle / delete
+                     one task edit through the task panel's handlers, up to
+                     the refresh that shows it
+    flow_enter / flow_exit
+                     switching to the flow view and back, up to the refresh
+    next_flow_task   one load_next_flow_task() call
+    buddy_frame      one focus-buddy animation step (FocusBuddy.advance)
+    palette_search   one command-palette task search (TodoSearchProvider)
+
+Every size runs in its own interpreter, so each one really is a cold start
+and no store singleton leaks from one size into the next. Results (in
+milliseconds, median over the repeats) are written as JSON and compared
+with a stored baseline; the exit status is 1 if anything regressed.
+
+    python benchmarks/run.py                      # all sizes, compare with baseline.json
+    python benchmarks/run.py --sizes 10 1000      # a quick pass
+    python benchmarks/run.py --update-baseline    # accept the current numbers
+
+Timings depend on the machine: refresh the baseline when moving the suite
+to different hardware, and compare runs from the same machine only.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+HERE = Path(__file__).resolve().parent
+ROOT = HERE.parent
+DEFAULT_SIZES = [10, 1_000, 10_000, 100_000]
+DEFAULT_BASELINE = HERE / "baseline.json"
+DEFAULT_RESULTS = HERE / "results.json"
+
+# Terminal size the app is driven at
+SCREEN = (120, 40)
+# Repetitions of each measured operation inside one run
+EDIT_OPS = 20
+FLOW_OPS = 5
+CALL_OPS = 200
+SEARCH_QUERIES = ["task", "task 4", "dev 99", "tsk 12", "school"]
+# A metric regresses when it is slower than the baseline by more than
+# TOLERANCE (relative) *and* FLOOR_MS (absolute): sub-millisecond metrics
+# are too noisy for a ratio alone.
+TOLERANCE = 0.5
+FLOOR_MS = 1.0
+# Hard limits (ms) that fail the run whatever the baseline says. Measured on
+# the machine the baseline comes from; raise them with care, not by habit.
+BUDGETS = {"import": 350.0}
+
+TAGS = ["dev", "school", "life", "ops"]
+
+
+def seed(data_home: Path, size: int) -> None:
+    """Writes `size` tasks (every third one done, tags rotating) into a fresh data dir."""
+    data_dir = data_home / "termflow"
+    data_dir.mkdir(parents=True)
+    todos = [
+        {"text": f"task {i} [{TAGS[i % len(TAGS)]}]", "done": i % 3 == 0}
+        for i in range(size)
+    ]
+    (data_dir / "todos.json").write_text(json.dumps(todos), encoding="utf-8")
+
+
+async def _settle(pilot) -> None:
+    # wait for the app to go idle (untimed: the pilot's idle polling is slow)
+    await pilot.pause()
+
+
+async def _painted(app) -> None:
+    """Returns once the app has processed its queue and refreshed the screen."""
+    done = asyncio.Event()
+    app.call_after_refresh(done.set)
+    await done.wait()
+
+
+async def measure(size: int) -> Dict[str, float]:
+    """One run against the data dir in $XDG_DATA_HOME; returns milliseconds per metric."""
+    clock = time.perf_counter
+    results: Dict[str, float] = {}
+
+    start = clock()
+    from textual.widgets import Input
+    from termflow.ui.app import TermFlowApp, TodoSearchProvider
+    from termflow.panels.todo_list import TodoListView, TodoPanel
+    from termflow.utils.todos import get_todo_store
+    results["import"] = (clock() - start) * 1e3
+
+    app = TermFlowApp()
+    async with app.run_test(size=SCREEN) as pilot:
+        await _painted(app)
+        results["startup"] = (clock() - start) * 1e3
+        await _settle(pilot)
+
+        async def timed(action, count: int) -> float:
+            """Median time from calling `action` to the refresh that shows its effect."""
+            samples = []
+            for _ in range(count):
+                t = clock()
+                action()
+                await _painted(app)
+                samples.append(clock() - t)
+                await _settle(pilot)
+            return statistics.median(samples) * 1e3
+
+        # Task edits, through the same handlers the keys and the input call
+        panel = app.query_one(TodoPanel)
+        todo_input = app.query_one("#todo-input", Input)
+        counter = iter(range(EDIT_OPS))
+        results["add"] = await timed(
+            lambda: panel.on_input_submitted(Input.Submitted(todo_input, f"bench task {next(counter)} [dev]")),
+            EDIT_OPS,
+        )
+        app.query_one("#todo-list", TodoListView).focus()
+        await _settle(pilot)
+        results["toggle"] = await timed(panel.key_space, EDIT_OPS)
+        results["delete"] = await timed(panel.key_delete, EDIT_OPS)
+
+        # Flow view
+        enter: List[float] = []
+        leave: List[float] = []
+        for _ in range(FLOW_OPS):
+            enter.append(await timed(app.action_enter_flow, 1))
+            leave.append(await timed(app.action_exit_flow, 1))
+        results["flow_enter"] = statistics.median(enter)
+        results["flow_exit"] = statistics.median(leave)
+
+        # Calls made while in flow
+        app.action_enter_flow()
+        app.buddy_enabled = True
+        await _settle(pilot)
+
+        t = clock()
+        for _ in range(CALL_OPS):
+            app.load_next_flow_task()
+        results["next_flow_task"] = (clock() - t) / CALL_OPS * 1e3
+
+        buddy = app.query_one("#focus-buddy")
+        t = clock()
+        for _ in range(CALL_OPS):
+            buddy.advance()
+        results["buddy_frame"] = (clock() - t) / CALL_OPS * 1e3
+
+        app.action_exit_flow()
+        await _settle(pilot)
+
+        # Command palette search
+        provider = TodoSearchProvider(app.screen)
+        await provider.startup()
+        # startup only starts building the index; time searches against a built one
+        await asyncio.to_thread(get_todo_store().search_index)
+        samples = []
+        for query in SEARCH_QUERIES:
+            t = clock()
+            [hit async for hit in provider.search(query)]
+            samples.append(clock() - t)
+        results["palette_search"] = statistics.median(samples) * 1e3
+
+    return results
+
+
+def run_size(size: int) -> Dict[str, float]:
+    """Measures one size in a fresh interpreter and data dir."""
+    with tempfile.TemporaryDirectory(prefix="termflow-bench-") as tmp:
+        data_home = Path(tmp)
+        seed(data_home, size)
+        env = dict(os.environ, XDG_DATA_HOME=str(data_home), PYTHONPATH=str(ROOT))
+        proc = subprocess.run(
+            [sys.executable, __file__, "--child", str(size)],
+            env=env,
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+        )
+    if proc.returncode != 0:
+        raise RuntimeError(f"benchmark run for {size} tasks failed:\n{proc.stderr}")
+    # the app may print (e.g. storage errors); the results are the last line
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def collect(sizes: List[int], repeat: int) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    for size in sizes:
+        runs = []
+        for n in range(repeat):
+            print(f"  {size:>7} tasks, run {n + 1}/{repeat}", file=sys.stderr)
+            runs.append(run_size(size))
+        results[str(size)] = {
+            metric: round(statistics.median(run[metric] for run in runs), 3)
+            for metric in runs[0]
+        }
+    return results
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float, floor_ms: float) -> List[str]:
+    """Prints current vs baseline for every metric; returns the regressed ones."""
+    regressions = []
+    print(f"{'tasks':>7}  {'metric':<16}{'baseline ms':>12}{'current ms':>12}{'change':>9}")
+    for size, metrics in results.items():
+        for metric, current in metrics.items():
+            before = baseline.get(size, {}).get(metric)
+            if before is None:
+                print(f"{size:>7}  {metric:<16}{'-':>12}{current:>12.3f}{'new':>9}")
+                continue
+            change = (current - before) / before if before else 0.0
+            slower = current > before * (1 + tolerance) and current - before > floor_ms
+            flag = "  REGRESSION" if slower else ""
+            print(f"{size:>7}  {metric:<16}{before:>12.3f}{current:>12.3f}{change:>+9.0%}{flag}")
+            if slower:
+                regressions.append(f"{metric} @ {size} tasks: {before:.3f} -> {current:.3f} ms")
+    return regressions
+
+
+def check_budgets(results: Dict, budgets: Dict[str, float]) -> List[str]:
+    over = []
+    for size, metrics in results.items():
+        for metric, limit in budgets.items():
+            if metrics.get(metric, 0.0) > limit:
+                over.append(f"{metric} @ {size} tasks: {metrics[metric]:.3f} ms, budget {limit:.0f} ms")
+    return over
+
+
+def environment() -> Dict[str, str]:
+    try:
+        from importlib.metadata import version
+        textual = version("textual")
+    except Exception:
+        textual = "unknown"
+    return {
+        "python": platform.python_version(),
+        "textual": textual,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Headless TermFlow benchmarks.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="task counts to run")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per size (the median is kept)")
+    parser.add_argument("--out", type=Path, default=DEFAULT_RESULTS, help="where to write the results")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="baseline to compare with")
+    parser.add_argument("--update-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="allowed slowdown (0.5 = 50%%)")
+    parser.add_argument("--floor-ms", type=float, default=FLOOR_MS, help="ignore slowdowns smaller than this")
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        print(json.dumps(asyncio.run(measure(args.child))))
+        return 0
+
+    payload = {"environment": environment(), "results": collect(args.sizes, args.repeat)}
+    args.out.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+    print(f"Results written to {args.out}", file=sys.stderr)
+
+    over_budget = check_budgets(payload["results"], BUDGETS)
+    if over_budget:
+        print("Over budget:\n  " + "\n  ".join(over_budget), file=sys.stderr)
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+        print(f"Baseline updated: {args.baseline}", file=sys.stderr)
+        return 1 if over_budget else 0
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one.", file=sys.stderr)
+        return 1 if over_budget else 0
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    regressions = compare(payload["results"], baseline["results"], args.tolerance, args.floor_ms)
+    if regressions:
+        print("\nRegressions:\n  " + "\n  ".join(regressions), file=sys.stderr)
+        return 1
+    if over_budget:
+        return 1
+    print("\nNo regressions.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+"""
+Non-interactive subcommands (`termflow add|list|done|rm|import|export`,
+plus `daemon` and `status`).
+
+They work on the same TodoStore as the dashboard (through the daemon, when
+one is running) but never import Textual, so a call returns in
+milliseconds. A running dashboard picks the changes up through its file
+watcher.
+"""
+
+import sys
+from typing import Dict, List, Optional
+
+from termflow.utils.todos import TodoStore, get_todo_store
+
+
+def _resolve(store: TodoStore, refs: List[str]) -> List[Dict]:
+    """
+    Maps task references (list numbers as shown by `list`, or IDs) to tasks.
+    All are resolved before anything changes, so `rm 2 3` removes the
+    tasks numbered 2 and 3 rather than 2 and the one after 3.
+    """
+    todos = []
+    for ref in refs:
+        todo = store.get(ref)
+        if todo is None and ref.isdigit() and 1 <= int(ref) <= len(store):
+            todo = store[int(ref) - 1]
+        if todo is None:
+            raise SystemExit(f"termflow: no task {ref!r}")
+        todos.append(todo)
+    return todos
+
+
+def cmd_add(args) -> int:
+    store = get_todo_store()
+    todo = store.add(" ".join(args.text))
+    print(f"{len(store)}. {todo['text']}  ({todo['id']})")
+    return 0
+
+
+def cmd_list(args) -> int:
+    store = get_todo_store()
+    if args.tag:
+        tag = args.tag.strip("[]").lower()
+        ids = {todo["id"] for todo in store.tagged(tag)}
+    else:
+        ids = None
+    out = sys.stdout
+    for number, todo in enumerate(store.todos(), 1):
+        if ids is not None and todo["id"] not in ids:
+            continue
+        if todo["done"] and not args.all:
+            continue
+        out.write(f"{number:>4}. [{'x' if todo['done'] else ' '}] {todo['text']}")
+        out.write(f"  ({todo['id']})\n" if args.ids else "\n")
+    return 0
+
+
+def cmd_done(args) -> int:
+    store = get_todo_store()
+    for todo in _resolve(store, args.tasks):
+        store.set_done(todo["id"], not args.undo)
+    return 0
+
+
+def cmd_rm(args) -> int:
+    store = get_todo_store()
+    for todo in _resolve(store, args.tasks):
+        store.delete(todo["id"])
+    return 0
+
+
+def _open(path: Optional[str], mode: str):
+    if not path or path == "-":
+        return sys.stdin if mode == "r" else sys.stdout
+    # newline="" lets the csv module handle line endings inside quoted fields
+    return open(path, mode, encoding="utf-8", newline="")
+
+
+def cmd_import(args) -> int:
+    from termflow.utils.transfer import guess_format, read_records
+    fmt = args.format or guess_format(args.path)
+    store = get_todo_store()
+    stream = _open(args.path, "r")
+    try:
+        added, skipped = store.add_many(read_records(stream, fmt))
+    except (ValueError, OSError) as e:
+        raise SystemExit(f"termflow: import failed: {e}")
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+    print(f"Imported {added} tasks" + (f" ({skipped} already present)" if skipped else ""), file=sys.stderr)
+    return 0
+
+
+def cmd_export(args) -> int:
+    from termflow.utils.transfer import guess_format, write_records
+    fmt = args.format or guess_format(args.path)
+    store = get_todo_store()
+    todos = store.todos() if args.all else (todo for todo in store.todos() if not todo["done"])
+    stream = _open(args.path, "w")
+    try:
+        count = write_records(stream, todos, fmt)
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+    if stream is not sys.stdout:
+        print(f"Exported {count} tasks to {args.path}", file=sys.stderr)
+    return 0
+
+
+def cmd_daemon(args) -> int:
+    from termflow.core.daemon import StateDaemon
+    StateDaemon().serve()
+    return 0
+
+
+def cmd_status(args) -> int:
+    from termflow.utils.ipc import DaemonClient
+    client = DaemonClient.connect()
+    if client is None:
+        raise SystemExit("termflow: no daemon running (start one with `termflow daemon`)")
+    try:
+        if args.json:
+            import json
+            print(json.dumps(client.request("status")))
+        else:
+            print(client.request("prompt"))
+    finally:
+        client.close()
+    return 0
+
+
+def add_subcommands(parser) -> None:
+    """Registers the subcommands on the `termflow` argument parser."""
+    from termflow.utils.transfer import FORMATS
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+
+    add = commands.add_parser("add", help="add a task")
+    add.add_argument("text", nargs="+", help="task text ([tags] included)")
+    add.set_defaults(handler=cmd_add)
+
+    list_ = commands.add_parser("list", aliases=["ls"], help="list unfinished tasks")
+    list_.add_argument("-a", "--all", action="store_true", help="include finished tasks")
+    list_.add_argument("-t", "--tag", help="only tasks with this [tag]")
+    list_.add_argument("--ids", action="store_true", help="show task IDs")
+    list_.set_defaults(handler=cmd_list)
+
+    done = commands.add_parser("done", help="mark tasks finished")
+    done.add_argument("tasks", nargs="+", metavar="TASK", help="list number or ID")
+    done.add_argument("-u", "--undo", action="store_true", help="mark them unfinished instead")
+    done.set_defaults(handler=cmd_done)
+
+    rm = commands.add_parser("rm", help="delete tasks")
+    rm.add_argument("tasks", nargs="+", metavar="TASK", help="list number or ID")
+    rm.set_defaults(handler=cmd_rm)
+
+    import_ = commands.add_parser("import", help="append tasks from a file (- for stdin)")
+    import_.add_argument("path", help="file to read")
+    import_.add_argument("-f", "--format", choices=FORMATS, help="default: from the file extension, else jsonl")
+    import_.set_defaults(handler=cmd_import)
+
+    export = commands.add_parser("export", help="write tasks to a file (stdout by default)")
+    export.add_argument("path", nargs="?", help="file to write")
+    export.add_argument("-f", "--format", choices=FORMATS, help="default: from the file extension, else jsonl")
+    export.add_argument("--pending", dest="all", action="store_false", help="only unfinished tasks")
+    export.set_defaults(handler=cmd_export)
+
+    daemon = commands.add_parser("daemon", help="keep state in memory and answer queries on a Unix socket")
+    daemon.set_defaults(handler=cmd_daemon)
+
+    status = commands.add_parser("status", help="print the Pomodoro time and current task (needs the daemon)")
+    status.add_argument("--json", action="store_true", help="print the full status as JSON")
+    status.set_defaults(handler=cmd_status)
+
+
+# Subcommands that never touch the todo list
+STORELESS = {cmd_daemon, cmd_status}
+
+
+def run_command(args) -> int:
+    """Runs a parsed subcommand and writes its changes before returning."""
+    try:
+        return args.handler(args)
+    except BrokenPipeError:
+        # `termflow list | head`
+        sys.stderr.close()
+        return 0
+    finally:
+        if args.handler not in STORELESS:
+            get_todo_store().flush()
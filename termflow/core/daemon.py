@@ -0,0 +1,191 @@
+"""`termflow daemon`: answers status queries and serves the todo list over a Unix socket."""
+
+import json
+import os
+import signal
+import socketserver
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+from termflow.core.history import get_session_history
+from termflow.core.pomodoro import PomodoroEngine
+from termflow.utils.ipc import DaemonClient, get_socket_path
+from termflow.utils.storage import get_config_store
+from termflow.utils.todos import get_todo_store
+from termflow.utils.watch import FileWatcher
+
+
+def format_seconds(seconds: int) -> str:
+    minutes, seconds = divmod(max(0, seconds), 60)
+    return f"{minutes:02}:{seconds:02}"
+
+
+class StateDaemon:
+    """
+    Keeps the todo list, config, Pomodoro state and session rollups in
+    memory and answers queries about them over a Unix socket.
+
+    Two kinds of request, one per line:
+
+    - A bare word (`prompt`, `pomodoro`, `task`, `ping`) is answered with
+      one line of plain text, for statuslines (`echo prompt | nc -U ...`).
+    - A JSON object {"op": ...} is answered with one JSON line; see
+      termflow.utils.ipc. Clients that attach their TodoStore (through
+      DaemonBackend) use `todos`, `apply`, `replace`, `revision` and `paths`.
+
+    Answers come straight from memory. The daemon owns the todo files;
+    config.toml, pomodoro.json and the session log are still written by
+    whoever changes them (the dashboard, the CLI) and are re-read when the
+    file watcher sees them change. The daemon never finishes or resets a
+    Pomodoro itself, so a session is recorded exactly once.
+    """
+
+    def __init__(self, socket_path: Optional[Path] = None) -> None:
+        self.socket_path = Path(socket_path) if socket_path is not None else get_socket_path()
+        # the daemon is what clients attach to, so it must own the files itself
+        self.todos = get_todo_store(attach=False)
+        self.config = get_config_store()
+        self.history = get_session_history()
+        self.pomodoro = PomodoroEngine(config=self.config, history=self.history, follow_config=False)
+        self._revision = 0
+        self._revision_lock = threading.Lock()
+        self.todos.subscribe(self._bump)
+        self.watcher = FileWatcher(self._on_file_changed)
+        self.server: Optional[socketserver.BaseServer] = None
+        self.queries: Dict[str, Callable[[], str]] = {
+            "ping": lambda: "pong",
+            "prompt": self.prompt,
+            "pomodoro": self.pomodoro_text,
+            "task": lambda: (self.current_task() or {}).get("text", ""),
+        }
+        self.ops: Dict[str, Callable[..., Any]] = {
+            "ping": lambda: "pong",
+            "status": self.status,
+            "prompt": self.prompt,
+            "revision": lambda: self._revision,
+            "paths": lambda: [str(path) for path in self.todos.backend.paths()],
+            "todos": self.todos.todos,
+            "apply": self._apply,
+            "replace": self._replace,
+            "add": lambda text: self.todos.add(text),
+            "config": lambda key=None: self.config.data() if key is None else self.config.get(key),
+        }
+
+    def _bump(self) -> None:
+        with self._revision_lock:
+            self._revision += 1
+
+    def _apply(self, ops) -> int:
+        self.todos.apply(ops)
+        return self._revision
+
+    def _replace(self, todos) -> int:
+        self.todos.replace(todos)
+        return self._revision
+
+    def _on_file_changed(self, path) -> None:
+        # each of these is one stat when its own file did not change
+        self.todos.reload_if_changed()
+        self.config.reload_if_changed()
+        self.pomodoro.reload_if_changed()
+        self.history.catch_up()
+
+    # -- answers ----------------------------------------------------------
+
+    def current_task(self) -> Optional[Dict]:
+        """The task of the session in progress, else the next unfinished one."""
+        if self.pomodoro.session_task:
+            return self.pomodoro.session_task
+        todo = self.todos.next_pending()
+        return {"id": todo["id"], "text": todo["text"]} if todo else None
+
+    def pomodoro_text(self) -> str:
+        """MM:SS while a session is running or paused part-way, else empty."""
+        engine = self.pomodoro
+        if not engine.running and engine.started_at is None:
+            return ""
+        text = format_seconds(engine.display_seconds())
+        return text if engine.running else f"{text} paused"
+
+    def prompt(self) -> str:
+        task = self.current_task()
+        return " ".join(part for part in (self.pomodoro_text(), task["text"] if task else "") if part)
+
+    def status(self) -> Dict:
+        engine = self.pomodoro
+        return {
+            "pomodoro": {
+                "seconds": engine.display_seconds(),
+                "running": engine.running,
+                "deadline": engine.deadline,
+                "sessions_today": self.history.day().sessions,
+            },
+            "task": self.current_task(),
+            "pending": len(self.todos.pending),
+            "total": len(self.todos),
+            "revision": self._revision,
+        }
+
+    def handle(self, line: bytes) -> bytes:
+        """The reply (one line) to one request line."""
+        line = line.strip()
+        if not line.startswith(b"{"):
+            query = self.queries.get(line.decode("utf-8", errors="replace"))
+            text = query() if query is not None else "error: unknown query"
+            return text.encode("utf-8") + b"\n"
+        try:
+            request = json.loads(line)
+            op = self.ops.get(request.pop("op", None))
+            if op is None:
+                response = {"ok": False, "error": "unknown op"}
+            else:
+                response = {"ok": True, "result": op(**request)}
+        except Exception as e:
+            response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        return json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n"
+
+    # -- serving ----------------------------------------------------------
+
+    def serve(self) -> None:
+        """Listens until interrupted (Ctrl+C or SIGTERM), then writes everything out."""
+        client = DaemonClient.connect(self.socket_path)
+        if client is not None:
+            client.close()
+            raise SystemExit(f"termflow: a daemon is already listening on {self.socket_path}")
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    self.wfile.write(daemon.handle(line))
+                    self.wfile.flush()
+
+        self.server = socketserver.ThreadingUnixStreamServer(str(self.socket_path), Handler)
+        self.server.daemon_threads = True
+        os.chmod(self.socket_path, 0o600)
+        for path in (*self.todos.backend.paths(), self.config.path, self.pomodoro.path, self.history.path):
+            self.watcher.watch(path)
+        self.watcher.start()
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+        print(f"termflow daemon listening on {self.socket_path} (pid {os.getpid()})", file=sys.stderr)
+        try:
+            self.server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        self.watcher.stop()
+        if self.server is not None:
+            self.server.server_close()
+            self.server = None
+            try:
+                self.socket_path.unlink()
+            except FileNotFoundError:
+                pass
+        self.todos.close()
+        self.config.flush()
@@ -0,0 +1,227 @@
+"""Pomodoro session log with rollups by day, ISO week and task."""
+
+import json
+import os
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from termflow.utils.fileio import atomic_write
+from termflow.utils.resources import get_user_data_file
+
+
+class Rollup(NamedTuple):
+    """Totals for one day, week or task."""
+
+    sessions: int = 0
+    interrupted: int = 0
+    seconds: float = 0.0
+
+    @property
+    def minutes(self) -> int:
+        return int(self.seconds // 60)
+
+    def plus(self, seconds: float, interrupted: bool) -> "Rollup":
+        if interrupted:
+            return Rollup(self.sessions, self.interrupted + 1, self.seconds + seconds)
+        return Rollup(self.sessions + 1, self.interrupted, self.seconds + seconds)
+
+
+def day_key(when: date) -> str:
+    return when.isoformat()
+
+
+def week_key(when: date) -> str:
+    year, week, _ = when.isocalendar()
+    return f"{year}-W{week:02}"
+
+
+class SessionHistory:
+    """
+    An append-only log of Pomodoro sessions (sessions.jsonl) and rollups
+    kept next to it (sessions.rollup.json).
+
+    Every recorded session is appended to the log and added to the
+    per-day, per-ISO-week and per-task totals in memory, so "this week's
+    focused minutes" is a dict lookup. The rollup file remembers how many
+    bytes of the log it covers; on load only the part of the log written
+    after that is replayed, so startup never rescans years of history. If
+    the log is shorter than that (it was truncated or replaced), the
+    rollups are rebuilt from scratch.
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = Path(path) if path is not None else get_user_data_file("sessions.jsonl")
+        self.rollup_path = self.path.with_name(self.path.stem + ".rollup.json")
+        self._lock = threading.Lock()
+        self._offset = 0
+        self._days: Dict[str, Rollup] = {}
+        self._weeks: Dict[str, Rollup] = {}
+        self._tasks: Dict[str, Rollup] = {}
+        self._task_text: Dict[str, str] = {}
+        self._listeners: List[Callable[[], None]] = []
+        self._read()
+
+    def _read(self) -> None:
+        try:
+            with open(self.rollup_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            offset = int(state["offset"])
+            days = {k: Rollup(*v) for k, v in state["days"].items()}
+            weeks = {k: Rollup(*v) for k, v in state["weeks"].items()}
+            tasks = {k: Rollup(*v) for k, v in state["tasks"].items()}
+            task_text = dict(state.get("task_text", {}))
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, TypeError, ValueError):
+            offset, days, weeks, tasks, task_text = 0, {}, {}, {}, {}
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        if size < offset:
+            offset, days, weeks, tasks, task_text = 0, {}, {}, {}, {}
+        self._offset = offset
+        self._days, self._weeks, self._tasks, self._task_text = days, weeks, tasks, task_text
+        if size > offset:
+            self._replay()
+            self._write_rollups()
+
+    def _replay(self) -> None:
+        """Folds the records after `_offset` into the rollups."""
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # A torn final line from a crash mid-append
+                    break
+                try:
+                    self._fold(json.loads(line))
+                except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+                    pass
+                self._offset += len(line)
+
+    def _fold(self, record: Dict) -> None:
+        started = datetime.fromtimestamp(float(record["start"])).date()
+        seconds = float(record["seconds"])
+        interrupted = bool(record.get("interrupted", False))
+        day, week = day_key(started), week_key(started)
+        self._days[day] = self._days.get(day, Rollup()).plus(seconds, interrupted)
+        self._weeks[week] = self._weeks.get(week, Rollup()).plus(seconds, interrupted)
+        task = record.get("task")
+        if task:
+            self._tasks[task] = self._tasks.get(task, Rollup()).plus(seconds, interrupted)
+            if record.get("text"):
+                self._task_text[task] = record["text"]
+
+    def _write_rollups(self) -> None:
+        state = {
+            "offset": self._offset,
+            "days": self._days,
+            "weeks": self._weeks,
+            "tasks": self._tasks,
+            "task_text": self._task_text,
+        }
+        try:
+            atomic_write(self.rollup_path, json.dumps(state).encode("utf-8"))
+        except OSError as e:
+            print(f"Error saving session rollups: {e}")
+
+    def catch_up(self) -> bool:
+        """
+        Folds in sessions another process appended to the log since it was
+        read; True if there were any. The rollup file is left to the
+        process that records sessions.
+        """
+        with self._lock:
+            try:
+                size = self.path.stat().st_size
+            except FileNotFoundError:
+                size = 0
+            if size == self._offset:
+                return False
+            if size < self._offset:
+                self._offset = 0
+                self._days, self._weeks, self._tasks, self._task_text = {}, {}, {}, {}
+            if size:
+                self._replay()
+        for listener in list(self._listeners):
+            listener()
+        return True
+
+    def subscribe(self, listener: Callable[[], None]) -> None:
+        """Registers a callback invoked after every recorded session."""
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[], None]) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def record(
+        self,
+        start: float,
+        end: float,
+        seconds: float,
+        task: Optional[Dict] = None,
+        interrupted: bool = False,
+    ) -> None:
+        """
+        Logs one session and adds it to the rollups.
+
+        Args:
+            start: Wall-clock time the session was started
+            end: Wall-clock time it finished or was abandoned
+            seconds: Time actually spent focused (pauses excluded)
+            task: The task worked on ({'id', 'text'}), if any
+            interrupted: True if the session was reset before finishing
+        """
+        record = {
+            "start": round(start, 3),
+            "end": round(end, 3),
+            "seconds": round(seconds, 3),
+            "task": task["id"] if task else None,
+            "text": task["text"] if task else None,
+            "interrupted": interrupted,
+        }
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            try:
+                with open(self.path, "ab") as f:
+                    f.write(line)
+                    f.flush()
+                    os.fsync(f.fileno())
+            except OSError as e:
+                print(f"Error saving session: {e}")
+                return
+            self._fold(record)
+            self._offset += len(line)
+            self._write_rollups()
+        for listener in list(self._listeners):
+            listener()
+
+    def day(self, when: Optional[date] = None) -> Rollup:
+        return self._days.get(day_key(when or date.today()), Rollup())
+
+    def week(self, when: Optional[date] = None) -> Rollup:
+        """Totals for the ISO week containing `when` (this week by default)."""
+        return self._weeks.get(week_key(when or date.today()), Rollup())
+
+    def task(self, todo_id: str) -> Rollup:
+        return self._tasks.get(todo_id, Rollup())
+
+    def top_tasks(self, n: int = 5) -> List[Tuple[str, str, Rollup]]:
+        """Returns (id, text, rollup) for the `n` tasks with the most focused time."""
+        ranked = sorted(self._tasks.items(), key=lambda item: item[1].seconds, reverse=True)
+        return [(todo_id, self._task_text.get(todo_id, todo_id), rollup) for todo_id, rollup in ranked[:n]]
+
+
+_history: Optional[SessionHistory] = None
+_history_lock = threading.Lock()
+
+
+def get_session_history() -> SessionHistory:
+    """Returns the process-wide SessionHistory, catching up its rollups on first use."""
+    global _history
+    if _history is None:
+        with _history_lock:
+            if _history is None:
+                _history = SessionHistory()
+    return _history
@@ -0,0 +1,201 @@
+"""The Pomodoro timer shared by every panel that shows it."""
+
+import json
+import math
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from termflow.core.history import SessionHistory, get_session_history
+from termflow.utils.fileio import atomic_write
+from termflow.utils.resources import get_user_data_file
+from termflow.utils.storage import ConfigStore, get_config_store
+from termflow.utils.watch import FileSignature, file_signature
+
+
+class PomodoroEngine:
+    """
+    A Pomodoro countdown defined by a deadline instead of a tick counter.
+
+    While running, only the wall-clock deadline is stored and the time left
+    is computed from it on demand, so event-loop lag or a suspended laptop
+    cannot make the session drift. The state (deadline, or the time left
+    while paused) is written to pomodoro.json on every start, pause, reset
+    and finish, so a restart resumes the session in progress. Nothing is
+    written while the timer simply runs.
+
+    The engine does not tick by itself: call `check()` once the deadline
+    has passed to finish the session (the app arms a one-shot timer for
+    it). Listeners are called with no arguments after every state change.
+    Finished sessions, and sessions reset part-way through, are recorded
+    in the session history together with `task`.
+
+    With `follow_config=False` the engine does not reset itself when the
+    configured duration changes; use that for a read-only view of a timer
+    another process runs, kept current with `reload_if_changed`.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        config: Optional[ConfigStore] = None,
+        history: Optional[SessionHistory] = None,
+        follow_config: bool = True,
+    ) -> None:
+        self.path = Path(path) if path is not None else get_user_data_file("pomodoro.json")
+        self.config = config if config is not None else get_config_store()
+        self.history = history if history is not None else get_session_history()
+        self.duration = self.config.pomodoro_duration * 60
+        # Wall-clock time the session ends at; None while paused or stopped
+        self.deadline: Optional[float] = None
+        self._remaining: float = self.duration
+        # The task the next session is for; set by whoever shows the timer
+        self.task: Optional[Dict] = None
+        # When the session in progress was started, and for which task
+        self.started_at: Optional[float] = None
+        self.session_task: Optional[Dict] = None
+        self._listeners: List[Callable[[], None]] = []
+        self._signature: Optional[FileSignature] = None
+        self._read()
+        if follow_config:
+            self.config.subscribe(self._on_config_changed, ("pomodoro_duration",))
+
+    def _read(self) -> None:
+        self._signature = file_signature(self.path)
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            duration = float(state["duration"])
+            deadline = state.get("deadline")
+            remaining = float(state.get("remaining", duration))
+            started_at = state.get("started_at")
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, TypeError, ValueError):
+            return
+        self.duration = duration
+        self.deadline = float(deadline) if deadline is not None else None
+        self._remaining = remaining
+        self.started_at = float(started_at) if started_at is not None else None
+        self.session_task = state.get("task")
+
+    def _write(self) -> None:
+        state = {
+            "duration": self.duration,
+            "deadline": self.deadline,
+            "remaining": self._remaining,
+            "started_at": self.started_at,
+            "task": self.session_task,
+        }
+        try:
+            atomic_write(self.path, json.dumps(state).encode("utf-8"))
+        except OSError as e:
+            print(f"Error saving pomodoro state: {e}")
+        self._signature = file_signature(self.path)
+
+    def reload_if_changed(self) -> bool:
+        """Re-reads pomodoro.json if another process changed it, and notifies listeners."""
+        if file_signature(self.path) == self._signature:
+            return False
+        self._read()
+        for listener in list(self._listeners):
+            listener()
+        return True
+
+    def _changed(self) -> None:
+        self._write()
+        for listener in list(self._listeners):
+            listener()
+
+    def subscribe(self, listener: Callable[[], None]) -> None:
+        """Registers a callback invoked after every state change."""
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[], None]) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    @property
+    def running(self) -> bool:
+        return self.deadline is not None
+
+    def remaining(self, now: Optional[float] = None) -> float:
+        """Seconds left in the session."""
+        if self.deadline is None:
+            return self._remaining
+        return max(0.0, self.deadline - (time.time() if now is None else now))
+
+    def display_seconds(self, now: Optional[float] = None) -> int:
+        """Whole seconds to show (rounded up, so 00:00 means done)."""
+        return math.ceil(self.remaining(now))
+
+    @property
+    def phase(self) -> float:
+        """Offset within each second at which the displayed value changes."""
+        return (self.deadline or 0.0) % 1.0
+
+    def start(self) -> None:
+        if self.running:
+            return
+        if self._remaining <= 0:
+            self._remaining = self.duration
+        now = time.time()
+        if self.started_at is None:
+            self.started_at = now
+            self.session_task = {"id": self.task["id"], "text": self.task["text"]} if self.task else None
+        self.deadline = now + self._remaining
+        self._changed()
+
+    def pause(self) -> None:
+        if not self.running:
+            return
+        self._remaining = self.remaining()
+        self.deadline = None
+        self._changed()
+
+    def toggle(self) -> None:
+        if self.running:
+            self.pause()
+        else:
+            self.start()
+
+    def reset(self) -> None:
+        """Stops the timer and rewinds it to the configured duration."""
+        focused = self.duration - self.remaining()
+        if self.started_at is not None and focused > 0:
+            self.history.record(self.started_at, time.time(), focused, self.session_task, interrupted=True)
+        self.started_at = self.session_task = None
+        self.deadline = None
+        self.duration = self.config.pomodoro_duration * 60
+        self._remaining = self.duration
+        self._changed()
+
+    def check(self, now: Optional[float] = None) -> bool:
+        """Finishes the session if its deadline has passed; True if it did."""
+        if not self.running or self.remaining(now) > 0:
+            return False
+        end = self.deadline
+        self.deadline = None
+        self._remaining = 0
+        self.history.record(self.started_at or end - self.duration, end, self.duration, self.session_task)
+        self.started_at = self.session_task = None
+        # lifetime total, kept for older configs
+        self.config.increment_pomodoro_session()
+        self._changed()
+        return True
+
+    def _on_config_changed(self, key: str, value) -> None:
+        if not self.running:
+            self.reset()
+
+
+_engine: Optional[PomodoroEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_pomodoro_engine() -> PomodoroEngine:
+    """Returns the process-wide PomodoroEngine, restoring its saved state on first use."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = PomodoroEngine()
+    return _engine
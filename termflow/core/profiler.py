@@ -0,0 +1,211 @@
+"""Opt-in instrumentation: timings for storage, ticks, listeners and rendering."""
+
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+# Trace events kept for the JSON dump (the oldest are dropped first).
+TRACE_LIMIT = 100_000
+
+
+class Stat(NamedTuple):
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    last: float = 0.0
+
+    @property
+    def avg(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class Profiler:
+    """
+    Times selected functions by patching timing wrappers over them.
+
+    Nothing is instrumented until `enable()` runs: it replaces the targets
+    (storage reads and writes, store listeners such as refresh_todos,
+    scheduler ticks, compose, on_mount handlers, widget and frame
+    rendering) with wrappers, and `disable()` puts the originals back, so
+    the hooks cost nothing while profiling is off.
+
+    Each call updates a running Stat per name and is kept as a Chrome
+    trace event ("X" phase), so `dump()` output opens in chrome://tracing
+    or Perfetto.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.stats: Dict[str, Stat] = {}
+        self.events: deque = deque(maxlen=TRACE_LIMIT)
+        self._lock = threading.Lock()
+        self._patches: List[Tuple[Any, str, Any]] = []
+        self._origin = time.perf_counter()
+
+    def record(self, name: str, start: float, end: float) -> None:
+        duration = end - start
+        with self._lock:
+            stat = self.stats.get(name, Stat())
+            self.stats[name] = Stat(stat.count + 1, stat.total + duration, max(stat.max, duration), duration)
+            self.events.append({
+                "name": name,
+                "ph": "X",
+                "ts": round((start - self._origin) * 1e6, 1),
+                "dur": round(duration * 1e6, 1),
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+            })
+
+    def reset(self) -> None:
+        with self._lock:
+            self.stats.clear()
+            self.events.clear()
+
+    def summary(self, n: int = 10) -> List[Tuple[str, Stat]]:
+        """The `n` names with the most total time."""
+        with self._lock:
+            return sorted(self.stats.items(), key=lambda item: item[1].total, reverse=True)[:n]
+
+    def wrap(self, fn: Callable, name: Any) -> Callable:
+        """
+        Returns `fn` wrapped to record its duration under `name` (a string,
+        or a callable computing it from the call's arguments).
+        """
+        record = self.record
+        clock = time.perf_counter
+        label = name if callable(name) else (lambda *args, **kwargs: name)
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                start = clock()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    record(label(*args, **kwargs), start, clock())
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(label(*args, **kwargs), start, clock())
+        return wrapper
+
+    def patch(self, owner: Any, attr: str, name: Any) -> None:
+        """Replaces `owner.attr` with a timed wrapper until `disable()`."""
+        original = owner.__dict__[attr] if isinstance(owner, type) else getattr(owner, attr)
+        self._patches.append((owner, attr, original))
+        setattr(owner, attr, self.wrap(getattr(owner, attr), name))
+
+    def enable(self) -> None:
+        if self.enabled:
+            return
+        self.enabled = True
+        self._install()
+
+    def disable(self) -> None:
+        while self._patches:
+            owner, attr, original = self._patches.pop()
+            setattr(owner, attr, original)
+        self.enabled = False
+
+    def toggle(self) -> bool:
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable()
+        return self.enabled
+
+    def _install(self) -> None:
+        # Imported here: the profiler must not pull the UI in just by existing
+        import textual.widget
+        from textual._compositor import Compositor
+        from textual.widget import Widget
+        from termflow.core.scheduler import TickScheduler
+        from termflow.panels.clock import ClockPanel
+        from termflow.panels.info import InfoPanel
+        from termflow.panels.pomodoro import PomodoroPanel
+        from termflow.panels.todo_list import TodoListView, TodoPanel
+        from termflow.ui.app import TermFlowApp
+        from termflow.utils import storage, todos
+        from termflow.utils.fileio import DebouncedFlush
+
+        # Storage I/O
+        for module in (storage, todos):
+            for attr in ("load_todos", "save_todos", "load_config", "save_config"):
+                if hasattr(module, attr):
+                    self.patch(module, attr, f"io {attr}")
+        self.patch(todos.TodoStore, "_read", "io TodoStore.read")
+        self.patch(storage.ConfigStore, "_parse", "io ConfigStore.read")
+        self.patch(DebouncedFlush, "_run", lambda flusher: f"io {flusher.callback.__qualname__}")
+
+        # Store listeners (refresh_todos and friends), one entry per listener
+        profiler = self
+
+        def notify(store) -> None:
+            for listener in list(store._listeners):
+                start = time.perf_counter()
+                listener()
+                profiler.record(f"listener {listener.__qualname__}", start, time.perf_counter())
+
+        self._patches.append((todos.TodoStore, "_notify", todos.TodoStore.__dict__["_notify"]))
+        todos.TodoStore._notify = notify
+
+        # Interval callbacks
+        self.patch(TickScheduler, "_call", lambda scheduler, job: f"tick {job.callback.__qualname__}")
+
+        # Compose and mount
+        self.patch(textual.widget, "compose", lambda node: f"compose {_owner_name(node)}")
+        for cls in (TermFlowApp, TodoPanel, TodoListView, ClockPanel, PomodoroPanel, InfoPanel):
+            if "on_mount" in cls.__dict__:
+                self.patch(cls, "on_mount", f"mount {cls.__name__}")
+
+        # Rendering: per panel, and whole frames
+        self.patch(Widget, "render_lines", lambda widget, crop: f"render {_owner_name(widget)}")
+        self.patch(Compositor, "render_update", "frame")
+
+    def dump(self, path: Optional[Path] = None) -> Path:
+        """Writes the trace (and a per-name summary) as JSON; returns the path."""
+        if path is None:
+            from termflow.utils.resources import get_user_data_file
+            path = get_user_data_file(time.strftime("trace-%Y%m%d-%H%M%S.json"))
+        with self._lock:
+            payload = {
+                "traceEvents": list(self.events),
+                "displayTimeUnit": "ms",
+                "stats": {
+                    name: {"count": s.count, "total_ms": s.total * 1e3, "avg_ms": s.avg * 1e3, "max_ms": s.max * 1e3}
+                    for name, s in self.stats.items()
+                },
+            }
+        path = Path(path)
+        path.write_text(json.dumps(payload), encoding="utf-8")
+        return path
+
+
+def _owner_name(node) -> str:
+    """Names the nearest TermFlow widget at or above `node` (the panel it belongs to)."""
+    for ancestor in node.ancestors_with_self:
+        if type(ancestor).__module__.startswith("termflow.") and getattr(ancestor, "id", None):
+            return f"{type(ancestor).__name__}#{ancestor.id}"
+    return type(node).__name__
+
+
+_profiler: Optional[Profiler] = None
+
+
+def get_profiler() -> Profiler:
+    """Returns the process-wide Profiler (disabled until enabled)."""
+    global _profiler
+    if _profiler is None:
+        _profiler = Profiler()
+    return _profiler
@@ -0,0 +1,220 @@
+"""One timer that drives every periodic widget update in the app."""
+
+import math
+import time
+from typing import Callable, List, Optional
+
+# Jobs due within this many seconds of each other run in the same wake-up.
+COALESCE = 0.25
+# Seconds without keyboard or mouse input after which the app counts as idle.
+IDLE_AFTER = 60.0
+
+_SAME = object()
+
+
+class TickJob:
+    """A periodic callback registered with the TickScheduler."""
+
+    def __init__(
+        self,
+        widget,
+        callback: Callable[[], None],
+        interval: float,
+        low_power_interval: Optional[float],
+        run_hidden: bool,
+        phase: Optional[float],
+    ) -> None:
+        self.widget = widget
+        self.callback = callback
+        self.interval = interval
+        # None pauses the job entirely while in low-power mode
+        self.low_power_interval = low_power_interval
+        self.run_hidden = run_hidden
+        # Offset of the due times within the interval; jobs with a phase are
+        # never run early to coalesce with others
+        self.phase = phase
+        self.enabled = True
+        # Wall-clock time of the next run; inf while parked
+        self.due = 0.0
+        # Skipped while hidden; runs as soon as the widget is visible again
+        self.stale = False
+
+
+class TickScheduler:
+    """
+    Drives every registered job from a single one-shot timer.
+
+    Due times are aligned to multiples of each job's interval on the wall
+    clock, so jobs with the same (or a dividing) interval fire in the same
+    wake-up, and jobs due within COALESCE of each other are run together.
+    The timer is re-armed for the next due job only, so nothing wakes the
+    app in between.
+
+    Jobs whose widget is not displayed are skipped and parked until it is
+    shown again (call `kick()` after changing visibility). When the
+    terminal loses focus or no input has arrived for `idle_after` seconds,
+    the scheduler switches to low-power mode and every job runs at its
+    `low_power_interval` instead (or not at all if that is None).
+    """
+
+    def __init__(self, app, idle_after: float = IDLE_AFTER) -> None:
+        self.app = app
+        self.idle_after = idle_after
+        self.low_power = False
+        # Number of timer wake-ups so far (to measure the effect of all this)
+        self.wakeups = 0
+        self._jobs: List[TickJob] = []
+        self._timer = None
+        self._timer_due = math.inf
+        self._focused = True
+        self._last_input = time.time()
+        self._power_listeners: List[Callable[[bool], None]] = []
+
+    def register(
+        self,
+        widget,
+        callback: Callable[[], None],
+        interval: float,
+        low_power_interval=_SAME,
+        run_hidden: bool = False,
+        phase: Optional[float] = None,
+    ) -> TickJob:
+        """
+        Calls `callback` every `interval` seconds while `widget` is displayed.
+
+        Args:
+            widget: The widget the job updates, or a list of widgets (kept
+                by the caller); its visibility gates the job
+            callback: Called with no arguments on the UI thread
+            interval: Seconds between runs
+            low_power_interval: Seconds between runs in low-power mode (same
+                as `interval` when omitted, paused when None)
+            run_hidden: Keep running while the widget is hidden
+            phase: Run at `phase + k * interval` exactly instead of on
+                (coalesced) multiples of `interval`
+        """
+        if low_power_interval is _SAME:
+            low_power_interval = interval
+        job = TickJob(widget, callback, interval, low_power_interval, run_hidden, phase)
+        job.due = self._next_due(job, time.time())
+        self._jobs.append(job)
+        self._arm()
+        return job
+
+    def unregister(self, job: Optional[TickJob]) -> None:
+        if job in self._jobs:
+            self._jobs.remove(job)
+            self._arm()
+
+    def set_enabled(self, job: TickJob, enabled: bool) -> None:
+        """Pauses or resumes a job without unregistering it."""
+        if job.enabled == enabled:
+            return
+        job.enabled = enabled
+        job.stale = False
+        if enabled:
+            job.due = self._next_due(job, time.time())
+        self._arm()
+
+    def set_phase(self, job: TickJob, phase: Optional[float]) -> None:
+        """Moves a job's due times (see `register`)."""
+        job.phase = phase
+        if job.enabled and not math.isinf(job.due):
+            job.due = math.inf
+            job.due = self._next_due(job, time.time())
+            self._arm()
+
+    def subscribe_power(self, listener: Callable[[bool], None]) -> None:
+        """Calls `listener(low_power)` whenever low-power mode is entered or left."""
+        self._power_listeners.append(listener)
+
+    def touch(self) -> None:
+        """Records user input; leaves low-power mode if idleness caused it."""
+        self._last_input = time.time()
+        if self.low_power and self._focused:
+            self._set_low_power(False)
+
+    def set_focused(self, focused: bool) -> None:
+        """Records whether the terminal has focus."""
+        self._focused = focused
+        if focused:
+            self._last_input = time.time()
+        self._set_low_power(not focused)
+
+    def kick(self) -> None:
+        """Runs jobs that were skipped while hidden, if they are visible now."""
+        self._run(time.time())
+        self._arm()
+
+    def _interval(self, job: TickJob) -> Optional[float]:
+        return job.low_power_interval if self.low_power else job.interval
+
+    def _next_due(self, job: TickJob, now: float) -> float:
+        interval = self._interval(job)
+        if interval is None:
+            return math.inf
+        phase = job.phase or 0.0
+        base = now if math.isinf(job.due) else max(now, job.due)
+        return (math.floor((base - phase) / interval) + 1) * interval + phase
+
+    @staticmethod
+    def _visible(widget) -> bool:
+        if isinstance(widget, list):
+            # a job shared by several widgets runs while any of them shows
+            return any(TickScheduler._visible(w) for w in widget)
+        # Widgets under a display: none container have no region on screen
+        return widget.is_attached and widget.region.area > 0
+
+    def _set_low_power(self, low_power: bool) -> None:
+        if low_power == self.low_power:
+            return
+        self.low_power = low_power
+        now = time.time()
+        for job in self._jobs:
+            # Everything runs once now, at the new cadence from then on
+            job.due = now if self._interval(job) is not None else math.inf
+        for listener in list(self._power_listeners):
+            listener(low_power)
+        self._run(now)
+        self._arm()
+
+    def _run(self, now: float) -> None:
+        for job in list(self._jobs):
+            if not job.enabled:
+                continue
+            early = COALESCE if job.phase is None else 0.0
+            if job.due > now + early and not job.stale:
+                continue
+            if not job.run_hidden and not self._visible(job.widget):
+                job.stale, job.due = True, math.inf
+                continue
+            job.stale = False
+            job.due = self._next_due(job, now)
+            self._call(job)
+
+    def _call(self, job: TickJob) -> None:
+        # Separate so the profiler can time each job
+        job.callback()
+
+    def _arm(self) -> None:
+        due = min((job.due for job in self._jobs if job.enabled), default=math.inf)
+        if not self.low_power:
+            # Wake up once more to notice the app going idle
+            due = min(due, self._last_input + self.idle_after)
+        if due == self._timer_due and self._timer is not None:
+            return
+        if self._timer is not None:
+            self._timer.stop()
+            self._timer = None
+        self._timer_due = due
+        if not math.isinf(due):
+            self._timer = self.app.set_timer(max(0.0, due - time.time()), self._wake, name="ticks")
+
+    def _wake(self) -> None:
+        self._timer = None
+        self._timer_due = math.inf
+        self.wakeups += 1
+        if not self.low_power and time.time() - self._last_input >= self.idle_after:
+            self._set_low_power(True)
+        self._run(time.time())
+        self._arm()
@@ -0,0 +1,205 @@
+"""App-wide publish/subscribe for the values several panels show."""
+
+import asyncio
+from typing import Any, Callable, Dict, List, NamedTuple, Tuple
+
+# Topics
+POMODORO = "pomodoro"
+REFLECTION = "reflection"
+WEATHER = "weather"
+CONFIG_PREFIX = "config:"
+
+# Seconds between reflection (and weather) refreshes
+INFO_INTERVAL = 300
+
+_MISSING = object()
+
+
+class PomodoroState(NamedTuple):
+    """What a Pomodoro panel shows."""
+
+    seconds: int
+    running: bool
+    sessions_today: int
+
+
+def config_topic(key: str) -> str:
+    return CONFIG_PREFIX + key
+
+
+class DataService:
+    """
+    Computes each shared value once and pushes it to every subscriber.
+
+    Panels that appear more than once (the dashboard and flow-mode copies
+    of the Pomodoro and info panels) subscribe here instead of reading the
+    stores and running timers themselves. Each topic has one producer,
+    started with its first subscriber: a single scheduler job (which runs
+    while any subscriber is displayed), or a store listener. `publish`
+    drops values equal to the last one, so subscribers only hear about
+    real changes.
+
+    Topics:
+        "pomodoro": PomodoroState, once per displayed second while running
+        "reflection": the current quote (str)
+        "weather": (city, Reading or None)
+        "config:<key>": the value of a config key
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+        self._values: Dict[str, Any] = {}
+        self._subscribers: Dict[str, List[Tuple[Any, Callable[[Any], None]]]] = {}
+        # Widgets of each topic's subscribers; scheduler jobs run while any is displayed
+        self._widgets: Dict[str, List[Any]] = {}
+        self._started: set = set()
+        self._pomodoro_job = None
+        self._info_job = None
+        self._config_listening = False
+
+    # -- subscriptions ----------------------------------------------------
+
+    def subscribe(self, topic: str, widget, callback: Callable[[Any], None], replay: bool = True) -> None:
+        """
+        Calls `callback(value)` with every new value of `topic`.
+
+        Args:
+            topic: What to receive (see the class docstring)
+            widget: The subscribing widget (gates the topic's timer, if any)
+            callback: Called on the UI thread
+            replay: Also call it right away with the current value, if any
+        """
+        self._subscribers.setdefault(topic, []).append((widget, callback))
+        if widget is not None:
+            self._widgets.setdefault(topic, []).append(widget)
+        if topic not in self._started:
+            self._started.add(topic)
+            self._start(topic)
+        if replay and topic in self._values:
+            callback(self._values[topic])
+
+    def unsubscribe(self, topic: str, callback: Callable[[Any], None]) -> None:
+        entries = self._subscribers.get(topic, [])
+        for entry in [e for e in entries if e[1] == callback]:
+            entries.remove(entry)
+            if entry[0] is not None and entry[0] in self._widgets.get(topic, []):
+                self._widgets[topic].remove(entry[0])
+
+    def get(self, topic: str, default: Any = None) -> Any:
+        """The last value published on `topic`."""
+        return self._values.get(topic, default)
+
+    def publish(self, topic: str, value: Any) -> None:
+        if self._values.get(topic, _MISSING) == value:
+            return
+        self._values[topic] = value
+        for _, callback in list(self._subscribers.get(topic, [])):
+            callback(value)
+
+    # -- producers --------------------------------------------------------
+
+    def _start(self, topic: str) -> None:
+        if topic == POMODORO:
+            self._start_pomodoro()
+        elif topic in (REFLECTION, WEATHER):
+            self._start_info()
+        elif topic.startswith(CONFIG_PREFIX):
+            self._start_config(topic[len(CONFIG_PREFIX):])
+
+    def _start_config(self, key: str) -> None:
+        self._listen_config()
+        self._values[config_topic(key)] = self._config_value(key)
+
+    def _listen_config(self) -> None:
+        # one store listener feeds every config topic (and the weather)
+        if not self._config_listening:
+            from termflow.utils.storage import get_config_store
+            get_config_store().subscribe(self._on_config_changed)
+            self._config_listening = True
+
+    @staticmethod
+    def _config_value(key: str) -> Any:
+        from termflow.utils.storage import ConfigStore, get_config_store
+        config = get_config_store()
+        # typed properties carry the defaults; plain keys come straight from the file
+        if isinstance(getattr(ConfigStore, key, None), property):
+            return getattr(config, key)
+        return config.get(key)
+
+    def _on_config_changed(self, key: str, value: Any) -> None:
+        topic = config_topic(key)
+        if topic in self._started:
+            self.publish(topic, self._config_value(key))
+        if key in ("city", "weather_url") and self._info_job is not None:
+            self.refresh_weather()
+
+    def _start_pomodoro(self) -> None:
+        from termflow.core.pomodoro import get_pomodoro_engine
+        self.pomodoro = get_pomodoro_engine()
+        self.pomodoro.subscribe(self._on_pomodoro_changed)
+        self.pomodoro.history.subscribe(self._publish_pomodoro)
+        # redraws exactly when the shown second changes, and only while running
+        self._pomodoro_job = self.app.ticks.register(
+            self._widgets.setdefault(POMODORO, []), self._tick_pomodoro, 1, phase=self.pomodoro.phase
+        )
+        self._on_pomodoro_changed()
+
+    def _on_pomodoro_changed(self) -> None:
+        self.app.ticks.set_phase(self._pomodoro_job, self.pomodoro.phase)
+        self.app.ticks.set_enabled(self._pomodoro_job, self.pomodoro.running)
+        self._publish_pomodoro()
+
+    def _tick_pomodoro(self) -> None:
+        if self.pomodoro.display_seconds() == 0:
+            # also covers waking from suspend before the app's finish timer
+            self.pomodoro.check()
+        self._publish_pomodoro()
+
+    def _publish_pomodoro(self) -> None:
+        engine = self.pomodoro
+        self.publish(POMODORO, PomodoroState(engine.display_seconds(), engine.running, engine.history.day().sessions))
+
+    def _start_info(self) -> None:
+        if self._info_job is not None:
+            return
+        # reflection and weather subscribers share one list, so one job serves both
+        widgets = self._widgets.setdefault(REFLECTION, [])
+        widgets.extend(self._widgets.get(WEATHER, []))
+        self._widgets[WEATHER] = widgets
+        self._info_job = self.app.ticks.register(widgets, self.refresh_info, INFO_INTERVAL)
+        self._listen_config()
+        self.refresh_info()
+
+    def refresh_info(self) -> None:
+        self.app.run_worker(self._fetch_reflection(), group="reflection", exclusive=True)
+        self.refresh_weather()
+
+    def refresh_weather(self) -> None:
+        self.app.run_worker(self._fetch_weather(), group="weather", exclusive=True)
+
+    async def _fetch_reflection(self) -> None:
+        from termflow.utils.quotes import get_quote
+        try:
+            # the first draw from a new corpus indexes it, keep that off the loop
+            quote = await asyncio.to_thread(get_quote)
+        except Exception:
+            quote = "Stay focused."
+        self.publish(REFLECTION, quote)
+
+    async def _fetch_weather(self) -> None:
+        from termflow.utils.weather import get_weather_provider
+        city = self._config_value("city")
+        provider = get_weather_provider()
+        cached = provider.cached(city) if city else None
+        # whatever is on disk first, then a fresh reading if that one is old
+        self.publish(WEATHER, (city, cached))
+        if city and not provider.is_fresh(cached):
+            self.publish(WEATHER, (city, await provider.get(city)))
+
+    def close(self) -> None:
+        if self._pomodoro_job is not None:
+            self.pomodoro.unsubscribe(self._on_pomodoro_changed)
+            self.pomodoro.history.unsubscribe(self._publish_pomodoro)
+        if self._config_listening:
+            from termflow.utils.storage import get_config_store
+            get_config_store().unsubscribe(self._on_config_changed)
@@ -1,7 +1,27 @@
+import argparse
+
+
 def run():
+    parser = argparse.ArgumentParser(prog="termflow", description="A minimalist terminal productivity hub")
+    parser.add_argument("--profile", action="store_true", help="time storage, ticks and rendering (HUD + trace)")
+    parser.add_argument("--trace", metavar="PATH", help="where --profile writes its JSON trace on exit")
+    # Subcommands run headless; only the dashboard below imports Textual
+    from termflow.cli import add_subcommands, run_command
+    add_subcommands(parser)
+    args = parser.parse_args()
+    if args.command:
+        raise SystemExit(run_command(args))
+
     from termflow.ui.app import TermFlowApp
+    profiler = None
+    if args.profile:
+        from termflow.core.profiler import get_profiler
+        profiler = get_profiler()
+        profiler.enable()
     app = TermFlowApp()
     app.run()
+    if profiler is not None:
+        print(f"Trace written to {profiler.dump(args.trace)}")
 
 if __name__ == "__main__":
     run()
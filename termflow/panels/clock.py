@@ -4,7 +4,11 @@ from textual.widgets import Static
 class ClockPanel(Static):
     can_focus = False
     def on_mount(self):
-        self.set_interval(1, self.update_time)
+        # minute granularity (and no seconds shown) while the app is idle
+        self.tick_job = self.app.ticks.register(self, self.update_time, 1, low_power_interval=60)
+
+    def on_unmount(self):
+        self.app.ticks.unregister(self.tick_job)
 
     def update_time(self):
         self.update(self.render_content())
@@ -14,7 +18,8 @@ class ClockPanel(Static):
         # but datetime.now() already uses system local time by default.
         # To be explicitly sure and safe as per instructions:
         now = datetime.now().astimezone()
-        return f"[bold cyan]{now.strftime('%H:%M:%S')}[/]\n[dim]{now.strftime('%Y-%m-%d')}[/]"
+        time_format = "%H:%M" if self.app.ticks.low_power else "%H:%M:%S"
+        return f"[bold cyan]{now.strftime(time_format)}[/]\n[dim]{now.strftime('%Y-%m-%d')}[/]"
 
     def render(self):
         return self.render_content()
@@ -1,29 +1,39 @@
+import time
 from textual.widgets import Static, Label
-from termflow.utils.weather import get_weather
-from termflow.utils.quotes import get_quote
+from rich.markup import escape
+from termflow.core.service import REFLECTION, WEATHER
+from termflow.utils.weather import get_weather_provider
 
 class InfoPanel(Static):
     can_focus = False
     def compose(self):
         yield Label("[bold yellow]Reflection[/]", classes="panel-header")
+        yield Label("", id="weather", classes="hidden")
         yield Label("Loading...", id="reflection")
 
     def on_mount(self):
-        self.update_info()
-        self.set_interval(300, self.update_info)
+        # quote and weather are fetched once by the app's data service, for every info panel
+        self.app.data.subscribe(REFLECTION, self, self.show_reflection)
+        self.app.data.subscribe(WEATHER, self, self.show_weather)
 
-    def update_info(self):
-        # Pass the coroutine object, not the result of calling it if it expects a coroutine
-        # Actually in textual, run_worker can take the coroutine directly
-        self.run_worker(self.fetch_data())
+    def on_unmount(self):
+        self.app.data.unsubscribe(REFLECTION, self.show_reflection)
+        self.app.data.unsubscribe(WEATHER, self.show_weather)
 
-    async def fetch_data(self):
-        try:
-            q = get_quote()
-        except:
-            q = "Stay focused."
-        
-        try:
-            self.query_one("#reflection", Label).update(q)
-        except:
-            pass
+    def show_reflection(self, quote):
+        # quotes come from a user-supplied corpus, so brackets in them are text, not markup
+        self.query_one("#reflection", Label).update(escape(quote))
+
+    def show_weather(self, payload):
+        city, reading = payload
+        label = self.query_one("#weather", Label)
+        label.set_class(not city, "hidden")
+        if not city:
+            return
+        if reading is None:
+            label.update(f"[bold]{escape(city)}[/]: [dim]N/A[/]")
+            return
+        text = f"[bold]{escape(city)}[/]: {escape(reading.text)}"
+        if not get_weather_provider().is_fresh(reading):
+            text += f" [dim](as of {time.strftime('%H:%M', time.localtime(reading.fetched_at))})[/]"
+        label.update(text)
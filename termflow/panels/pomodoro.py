@@ -1,60 +1,58 @@
 from textual.widgets import Static, Button, Label
 from textual.containers import Horizontal
 from textual.reactive import reactive
-from typing import TYPE_CHECKING, Any
-from termflow.utils.storage import load_config, increment_pomodoro_session
+from typing import TYPE_CHECKING
+from termflow.core.pomodoro import get_pomodoro_engine
+from termflow.core.service import POMODORO, PomodoroState
 
 if TYPE_CHECKING:
     from textual.app import ComposeResult
 
 class PomodoroPanel(Static):
     can_focus = False
-    time_left: reactive[int] = reactive(25 * 60)
-    timer_active: reactive[bool] = reactive(False)
     sessions: reactive[int] = reactive(0)
 
     def compose(self) -> "ComposeResult":
-        config = load_config()
-        self.time_left = config.get("pomodoro_duration", 25) * 60
-        self.sessions = config.get("pomodoro_sessions_completed", 0)
-        
+        self.engine = get_pomodoro_engine()
+        self.sessions = self.engine.history.day().sessions
+        self._shown = self.engine.display_seconds()
+
         yield Label("[bold red]POMODORO[/]", classes="panel-header")
-        yield Label(f"{config.get('pomodoro_duration', 25)}:00", id="timer")
+        yield Label(self.format_time(self._shown), id="timer")
         yield Label(f"Sessions today: {self.sessions}", id="sessions-count")
         with Horizontal(classes="button-row"):
             yield Button("Start/Pause", id="toggle", variant="success")
             yield Button("Reset", id="reset", variant="primary")
 
     def on_mount(self) -> None:
-        self.set_interval(1, self.tick)
-
-    def tick(self) -> None:
-        if self.timer_active:
-            if self.time_left > 0:
-                self.time_left -= 1
-                self.update_timer()
-            else:
-                self.timer_active = False
-                self.sessions = increment_pomodoro_session()
-                self.query_one("#sessions-count", Label).update(f"Sessions today: {self.sessions}")
-                self.update_timer()
-
-    def update_timer(self) -> None:
-        m, s = divmod(self.time_left, 60)
-        try:
-            timer_label = self.query_one("#timer", Label)
-            timer_label.update(f"{m:02}:{s:02}")
-        except:
-            pass
+        # the app's data service ticks once for every Pomodoro panel
+        self.app.data.subscribe(POMODORO, self, self.on_state)
+
+    def on_unmount(self) -> None:
+        self.app.data.unsubscribe(POMODORO, self.on_state)
+
+    @property
+    def timer_active(self) -> bool:
+        return self.engine.running
+
+    def on_state(self, state: PomodoroState) -> None:
+        if state.sessions_today != self.sessions:
+            self.sessions = state.sessions_today
+            self.query_one("#sessions-count", Label).update(f"Sessions today: {self.sessions}")
+        if state.seconds != self._shown:
+            self._shown = state.seconds
+            self.query_one("#timer", Label).update(self.format_time(state.seconds))
+
+    @staticmethod
+    def format_time(seconds: int) -> str:
+        m, s = divmod(seconds, 60)
+        return f"{m:02}:{s:02}"
 
     def handle_toggle(self) -> None:
-        self.timer_active = not self.timer_active
+        self.engine.toggle()
 
     def handle_reset(self) -> None:
-        self.timer_active = False
-        config = load_config()
-        self.time_left = config.get("pomodoro_duration", 25) * 60
-        self.update_timer()
+        self.engine.reset()
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         if event.button.id == "toggle":
@@ -1,5 +1,6 @@
 from textual.widgets import Static, ListView, ListItem, Label, Input
-from termflow.utils.storage import load_todos, save_todos
+from termflow.utils.storage import load_todos
+from termflow.utils.todos import get_todo_store
 import re
 
 class TodoPanel(Static):
@@ -35,40 +36,37 @@ class TodoPanel(Static):
         if self.app.flow_state == "DEEP":
             return
         if event.value.strip():
-            todos = load_todos()
-            todos.append({"text": event.value, "done": False})
-            save_todos(todos)
+            # through the store (not save_todos, which would clear the undo history)
+            get_todo_store().add(event.value)
             event.input.value = ""
             self.refresh_list()
 
-    def on_list_view_selected(self, event: ListView.Selected):
-        if self.app.flow_state == "DEEP":
-            return
+    def selected_todo(self):
         todos = load_todos()
         idx = self.query_one("#todo-list", ListView).index
         if idx is not None and 0 <= idx < len(todos):
-            todos[idx]['done'] = not todos[idx].get('done', False)
-            save_todos(todos)
+            return todos[idx]
+        return None
+
+    def on_list_view_selected(self, event: ListView.Selected):
+        if self.app.flow_state == "DEEP":
+            return
+        todo = self.selected_todo()
+        if todo is not None:
+            get_todo_store().toggle(todo["id"])
             self.refresh_list()
 
     def on_key(self, event):
         if self.app.flow_state == "DEEP":
             return
+        if event.key not in ("space", "d"):
+            return
+        todo = self.selected_todo()
+        if todo is None:
+            return
         if event.key == "space":
-            todos = load_todos()
-            lv = self.query_one("#todo-list", ListView)
-            idx = lv.index
-            if idx is not None and 0 <= idx < len(todos):
-                todos[idx]['done'] = not todos[idx].get('done', False)
-                save_todos(todos)
-                self.refresh_list()
-                event.stop()
-        elif event.key == "d":
-            todos = load_todos()
-            lv = self.query_one("#todo-list", ListView)
-            idx = lv.index
-            if idx is not None and 0 <= idx < len(todos):
-                todos.pop(idx)
-                save_todos(todos)
-                self.refresh_list()
-                event.stop()
+            get_todo_store().toggle(todo["id"])
+        else:
+            get_todo_store().delete(todo["id"])
+        self.refresh_list()
+        event.stop()
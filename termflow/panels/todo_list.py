@@ -1,24 +1,203 @@
 from textual.app import ComposeResult
-from textual.widgets import Static, ListView, ListItem, Label, Input, Button
-from textual.containers import Vertical, Horizontal
+from textual.binding import Binding
+from textual.cache import LRUCache
+from textual.geometry import Region, Size
 from textual.message import Message
-from termflow.utils.todos import add_todo, toggle_todo, delete_todo
+from textual.reactive import reactive
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+from textual.widgets import Static, Label, Input
+from rich.text import Text
+from rich.markup import escape
+from typing import Dict, List, Optional, Sequence
+from termflow.utils.todos import TAG_PATTERN, get_todo_store
 
-class TodoItem(ListItem):
-    """A single todo item widget."""
+# Rendered rows kept around beyond the visible window (scrolling back and forth
+# a little is served from the cache without re-rendering).
+OVERSCAN = 32
 
-    def __init__(self, text: str, completed: bool, index: int) -> None:
-        super().__init__()
-        self.todo_text = text
-        self.completed = completed
-        self.index = index
+# Colors for the tags the README advertises; anything else gets TAG_DEFAULT_COLOR.
+TAG_COLORS = {"dev": "cyan", "school": "yellow", "life": "green"}
+TAG_DEFAULT_COLOR = "magenta"
+
+
+def tag_color(tag: str) -> str:
+    return TAG_COLORS.get(tag, TAG_DEFAULT_COLOR)
+
+
+class TodoListView(ScrollView, can_focus=True):
+    """
+    A virtualized todo list.
+
+    Only the rows inside the viewport are rendered, straight from the
+    in-memory list, so memory use and layout cost stay flat no matter how
+    many tasks there are. Rendered rows are cached by task ID and state, so
+    a change to one task re-renders exactly one row.
+    """
+
+    COMPONENT_CLASSES = {"todo-list--cursor", "todo-list--completed", "todo-list--pending"}
+
+    DEFAULT_CSS = """
+    TodoListView {
+        height: 1fr;
+        overflow-x: hidden;
+    }
+    TodoListView > .todo-list--pending {
+        text-style: bold;
+    }
+    TodoListView > .todo-list--completed {
+        text-style: dim strike;
+    }
+    TodoListView > .todo-list--cursor {
+        background: $block-cursor-blurred-background;
+    }
+    TodoListView:focus > .todo-list--cursor {
+        background: $block-cursor-background;
+        color: $block-cursor-foreground;
+    }
+    """
+
+    BINDINGS = [
+        Binding("enter", "select_cursor", "Select", show=False),
+        Binding("up", "cursor_up", "Cursor up", show=False),
+        Binding("down", "cursor_down", "Cursor down", show=False),
+        Binding("pageup", "page_up", "Page up", show=False),
+        Binding("pagedown", "page_down", "Page down", show=False),
+        Binding("home", "first", "First", show=False),
+        Binding("end", "last", "Last", show=False),
+    ]
+
+    cursor: reactive[int] = reactive(0, always_update=True)
+
+    class Selected(Message):
+        """Posted when Enter is pressed (or a row is clicked)."""
+
+        def __init__(self, index: int, todo: Dict) -> None:
+            super().__init__()
+            self.index = index
+            self.todo = todo
+
+    def __init__(self, *, id: Optional[str] = None, classes: Optional[str] = None) -> None:
+        super().__init__(id=id, classes=classes)
+        self._todos: Sequence[Dict] = []
+        # The cursor's task, so it can be found again after the rows change
+        self._cursor_id: Optional[str] = None
+        self._row_cache: LRUCache[tuple, Strip] = LRUCache(128)
+
+    def __len__(self) -> int:
+        return len(self._todos)
+
+    @property
+    def cursor_todo(self) -> Optional[Dict]:
+        if 0 <= self.cursor < len(self._todos):
+            return self._todos[self.cursor]
+        return None
+
+    def index_of(self, todo_id: str) -> int:
+        """Returns the row showing `todo_id`, or -1."""
+        index_of = getattr(self._todos, "index_of", None)
+        if index_of is not None:
+            # a TodoRows view asks the store's indexes instead of scanning
+            return index_of(todo_id)
+        return next((i for i, todo in enumerate(self._todos) if todo["id"] == todo_id), -1)
+
+    def set_rows(self, todos: Sequence[Dict]) -> None:
+        """
+        Points the view at a list of tasks, or at a live TodoRows view that
+        may have changed in place since the last call, keeping the cursor
+        on the same task.
+        """
+        cursor = self.cursor
+        self._todos = todos
+        if self._cursor_id is not None:
+            # Follow the task wherever rows above it came or went; if it is
+            # gone itself, the next row takes its place
+            index = self.index_of(self._cursor_id)
+            if index >= 0:
+                cursor = index
+        self.virtual_size = Size(0, len(todos))
+        self._row_cache.grow(max(128, self.size.height + 2 * OVERSCAN))
+        self.set_reactive(TodoListView.cursor, self.validate_cursor(cursor))
+        self._remember_cursor()
+        self.refresh()
+
+    def validate_cursor(self, cursor: int) -> int:
+        return max(0, min(cursor, len(self._todos) - 1))
+
+    def _remember_cursor(self) -> None:
+        todo = self.cursor_todo
+        self._cursor_id = todo["id"] if todo is not None else None
+
+    def watch_cursor(self, old: int, new: int) -> None:
+        self._remember_cursor()
+        self.scroll_to_region(Region(0, new, max(1, self.size.width), 1), animate=False, force=True)
+        self.refresh()
+
+    def render_line(self, y: int) -> Strip:
+        scroll_x, scroll_y = self.scroll_offset
+        index = scroll_y + y
+        width = self.size.width
+        if index >= len(self._todos):
+            return Strip.blank(width, self.rich_style)
+        todo = self._todos[index]
+        is_cursor = index == self.cursor
+        key = (todo["id"], todo["text"], todo["done"], is_cursor, self.has_focus, width)
+        strip = self._row_cache.get(key)
+        if strip is None:
+            strip = self._render_row(todo, is_cursor, width)
+            self._row_cache[key] = strip
+        return strip.apply_offsets(scroll_x, index)
+
+    def _render_row(self, todo: Dict, is_cursor: bool, width: int) -> Strip:
+        done = todo["done"]
+        state = "todo-list--completed" if done else "todo-list--pending"
+        style = self.rich_style + self.get_component_rich_style(state)
+        if is_cursor:
+            style += self.get_component_rich_style("todo-list--cursor")
+        icon = "✅" if done else "⬜"
+        text = Text(f"{icon} {todo['text']}", style=style, no_wrap=True, overflow="ellipsis", end="")
+        offset = len(icon) + 1
+        for match in TAG_PATTERN.finditer(todo["text"]):
+            text.stylize(tag_color(match.group(1).lower()), offset + match.start(), offset + match.end())
+        text.truncate(width, overflow="ellipsis")
+        strip = Strip(text.render(self.app.console), text.cell_len)
+        return strip.extend_cell_length(width, style)
+
+    def on_focus(self) -> None:
+        self.refresh()
+
+    def on_blur(self) -> None:
+        self.refresh()
+
+    def on_click(self, event) -> None:
+        index = self.scroll_offset.y + event.y
+        if 0 <= index < len(self._todos):
+            self.cursor = index
+            self.action_select_cursor()
+
+    def action_select_cursor(self) -> None:
+        todo = self.cursor_todo
+        if todo is not None:
+            self.post_message(self.Selected(self.cursor, todo))
+
+    def action_cursor_up(self) -> None:
+        self.cursor -= 1
+
+    def action_cursor_down(self) -> None:
+        self.cursor += 1
+
+    def action_page_up(self) -> None:
+        self.cursor -= max(1, self.size.height - 1)
+
+    def action_page_down(self) -> None:
+        self.cursor += max(1, self.size.height - 1)
+
+    def action_first(self) -> None:
+        self.cursor = 0
+
+    def action_last(self) -> None:
+        self.cursor = len(self._todos) - 1
 
-    def compose(self) -> ComposeResult:
-        icon = "✅" if self.completed else "⬜"
-        if self.completed:
-            yield Label(f"[dim strike]{icon} {self.todo_text}[/]")
-        else:
-            yield Label(f"[bold]{icon} {self.todo_text}[/]")
 
 class TodoPanel(Static):
     """A panel to manage To-Do items."""
@@ -27,8 +206,9 @@ class TodoPanel(Static):
     def compose(self) -> ComposeResult:
         yield Label("[bold]My Tasks[/bold]", classes="panel-header")
         yield Input(placeholder="Add a task...", id="todo-input")
-        yield ListView(id="todo-list")
-        yield Label("Enter: Add | Space: Toggle | Del: Remove", classes="help-text")
+        yield Label("", id="todo-filter")
+        yield TodoListView(id="todo-list")
+        yield Label("Enter: Add | Space: Toggle | Del: Remove | [ ]: Filter", classes="help-text")
 
     def focus_input(self) -> None:
         """Focus the input field for adding new tasks."""
@@ -39,63 +219,97 @@ class TodoPanel(Static):
             pass
 
     def on_mount(self) -> None:
+        self.filter_tag: Optional[str] = None
+        self.store = get_todo_store()
+        # Any mutation, including ones made from Flow Mode, refreshes the list
+        self.store.subscribe(self.refresh_todos)
         self.refresh_todos()
 
+    def on_unmount(self) -> None:
+        self.store.unsubscribe(self.refresh_todos)
+
     def refresh_todos(self) -> None:
-        """Reloads todos from file and updates the list."""
-        list_view = self.query_one("#todo-list", ListView)
-        list_view.clear()
-        
-        from termflow.utils.todos import load_todos
-        todos = load_todos()
-        for idx, todo in enumerate(todos):
-            # Safe access with multi-key support and graceful fallback
-            if not isinstance(todo, dict):
-                continue
-                
-            text = todo.get("text", todo.get("task", "Untitled"))
-            # Standardize on 'done' internally while supporting 'completed'
-            done = todo.get("done", todo.get("completed", False))
-            
-            list_view.append(TodoItem(text, done, idx))
+        """Points the list at the current contents of the todo store."""
+        if self.filter_tag is not None and self.filter_tag not in self.store.tags():
+            self.filter_tag = None
+        # a live view, not a copy: refreshing costs the same for any list size
+        self.query_one("#todo-list", TodoListView).set_rows(self.store.rows(self.filter_tag))
+        self.refresh_filter_bar()
+
+    def refresh_filter_bar(self) -> None:
+        """Shows the tag filters with their live (open/total) counts."""
+        counts = self.store.tag_counts()
+        if not counts:
+            self.query_one("#todo-filter", Label).update("")
+            return
+        total, pending = len(self.store), len(self.store.pending)
+        chips = [self._chip("All", None, pending, total)]
+        for tag, (tag_total, tag_pending) in counts.items():
+            chips.append(self._chip(tag, tag, tag_pending, tag_total))
+        self.query_one("#todo-filter", Label).update(" ".join(chips))
+
+    def _chip(self, label: str, tag: Optional[str], pending: int, total: int) -> str:
+        color = tag_color(tag) if tag else "white"
+        text = f"{escape(label)} {pending}/{total}"
+        if tag == self.filter_tag:
+            return f"[bold reverse {color}] {text} [/]"
+        return f"[{color}] {text} [/]"
+
+    def set_filter(self, tag: Optional[str]) -> None:
+        """Shows only tasks carrying `tag` (all tasks for None)."""
+        self.filter_tag = tag
+        self.refresh_todos()
+
+    def cycle_filter(self, step: int) -> None:
+        options: List[Optional[str]] = [None, *self.store.tags()]
+        current = options.index(self.filter_tag) if self.filter_tag in options else 0
+        self.set_filter(options[(current + step) % len(options)])
+
+    def key_left_square_bracket(self) -> None:
+        """Previous tag filter."""
+        self.cycle_filter(-1)
+
+    def key_right_square_bracket(self) -> None:
+        """Next tag filter."""
+        self.cycle_filter(1)
+
+    def focus_task(self, todo_id: str) -> None:
+        """Moves the cursor to `todo_id` and focuses the list."""
+        if self.filter_tag is not None and self.filter_tag not in self.store.tags_of(todo_id):
+            self.set_filter(None)
+        list_view = self.query_one("#todo-list", TodoListView)
+        index = list_view.index_of(todo_id)
+        if index < 0:
+            return
+        list_view.cursor = index
+        list_view.focus()
 
     def on_input_submitted(self, event: Input.Submitted) -> None:
         """Handle adding a new task."""
         if event.value.strip():
-            add_todo(event.value.strip())
+            self.store.add(event.value.strip())
             event.input.value = ""
-            self.refresh_todos()
 
-    # Note: Textual's ListView doesn't inherently support key bindings on items 
-    # easily without focus handling. We'll use the ListView's events.
-    
-    def on_list_view_selected(self, event: ListView.Selected) -> None:
-        """Toggle todo on selection (Enter key by default in ListView)."""
+    def on_todo_list_view_selected(self, event: TodoListView.Selected) -> None:
+        """Toggle todo on selection (Enter key)."""
         if self.app.flow_state == "DEEP":
             return
-        item = event.item
-        if isinstance(item, TodoItem):
-            toggle_todo(item.index)
-            self.refresh_todos()
-            
+        self.store.toggle(event.todo["id"])
+
     def key_space(self) -> None:
         """Toggle selected item."""
         if self.app.flow_state == "DEEP":
             return
-        list_view = self.query_one("#todo-list", ListView)
-        if list_view.highlighted_child:
-            item = list_view.highlighted_child
-            if isinstance(item, TodoItem):
-                toggle_todo(item.index)
-                self.refresh_todos()
+        list_view = self.query_one("#todo-list", TodoListView)
+        todo = list_view.cursor_todo
+        if todo is not None:
+            self.store.toggle(todo["id"])
 
     def key_delete(self) -> None:
         """Delete selected item."""
         if self.app.flow_state == "DEEP":
             return
-        list_view = self.query_one("#todo-list", ListView)
-        if list_view.highlighted_child:
-            item = list_view.highlighted_child
-            if isinstance(item, TodoItem):
-                delete_todo(item.index)
-                self.refresh_todos()
+        list_view = self.query_one("#todo-list", TodoListView)
+        todo = list_view.cursor_todo
+        if todo is not None:
+            self.store.delete(todo["id"])
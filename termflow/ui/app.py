@@ -1,109 +1,39 @@
+import asyncio
+from functools import partial
+from textual import events
 from textual.app import App, ComposeResult
 from textual.widgets import Header, Footer, Static
 from textual.containers import Grid, VerticalScroll, Horizontal, Container
 from textual.binding import Binding
 from textual.reactive import reactive
 from textual.command import Hit, Hits, Provider
-from rich.text import Text as Art
+from textual.content import Content
+from textual.fuzzy import Matcher
+from rich.markup import escape
 from termflow.panels.clock import ClockPanel
 from termflow.panels.todo_list import TodoPanel
 from termflow.panels.pomodoro import PomodoroPanel
 from termflow.panels.info import InfoPanel
-from termflow.utils.storage import load_config, save_config, load_todos, save_todos
+from termflow.ui.buddy import FocusBuddy
+from termflow.core.pomodoro import get_pomodoro_engine
+from termflow.core.profiler import get_profiler
+from termflow.core.scheduler import TickScheduler
+from termflow.core.service import DataService, config_topic
+from termflow.utils.storage import get_config_store
+from termflow.utils.todos import get_todo_store
 from termflow.utils.resources import get_ui_resource_path
-
-CAT_IDLE_A = r'''
-         _     _
-        /\`-"-`/\
-        )` _ _ `(
-    (`\ |=  Y  =|
-     ) )_\  ^  /_
-    ( (/ ;`-u-`; \
-     \| /       \ |
-      \ \_ \ / _/ /
- jgs  (,(,,)~(,,),)
-'''
-
-CAT_IDLE_B = r'''
-         _     _
-        /\`-"-`/\
-        )` _ _ `(
-       {=   Y   =}
-        \   ^   /
-       /`;'-u-';`\
-      | /       \ |
-     /\ ;__\ / _/ /
- jgs \___, )~(,,),)
-        (_(
-'''
-
-CAT_STAND = r'''
-                      ,
-                    _/((
-           _.---. .'   `\
-         .'      `     ^ T=
-        /     \       .--'
-       |      /       )'-.
-       ; ,   <__..-(   '-.)
-        \ \-.__)    ``--._)
-     jgs '.'-.__.-.
-           '-...-'
-'''
-
-CAT_WALK_A = r'''
-        _
-       //
-      ||              |\_/|
-       \\  .-""""-._,' e e(
-        \\/         \  =_Y/=
-         \    \       /`"`
-          \   | /    |
-          /  / -\   /
-          `\ \\  | ||
-            \_)) |_))
-'''
-
-CAT_WALK_B = r'''
-           _ 
-          ((
-           \\
-            ))       
-           //.--.     |\_/|
-          |      `'..' a a(
-           \  \      \ =_Y/=
-           /   |   /  /`"`
-           > /` --< <<
-           \__))   \_))
-'''
-
-CAT_PLAY_A = r'''
-                      __     __,
-                      \,`~"~` /
-      .-=-.           /    . .\
-     / .-. \          {  =    Y}=
-    (_/   \ \          \      / 
-           \ \        _/`'`'`b
-            \ `.__.-'`        \-._
-             |            '.__ `'-;_
-             |            _.' `'-.__)
-              \    ;_..--'/     //  \
-              |   /  /   |     //    |
-              \  \ \__)   \   //    /
-               \__)        './/   .'
-                             `'-'`
-'''
-
-CAT_PLAY_B = r'''
-                   .-o=o-.
-               ,  /=o=o=o=\ .--.
-              _|\|=o=O=o=O=|    \
-          __.'  a`\=o=o=o=(`\   /
-          '.   a 4/`|.-""'`\ \ ;'`)   .---.
-            \   .'  /   .--'  |_.'   / .-._)
-             `)  _.'   /     /`-.__.' /
-              `'-.____;     /'-.___.-'
-                       `"""`
-'''
+from termflow.utils.watch import FileWatcher
+from termflow.utils.weather import get_weather_provider
+
+# how many upcoming tasks Flow Mode previews under the current one
+FLOW_LOOKAHEAD = 3
+# how many tasks the command palette lists per query
+TODO_SEARCH_LIMIT = 10
+# config keys the app itself applies (the panels subscribe to their own)
+APP_CONFIG_KEYS = (
+    "theme", "buddy_enabled", "buddy_motion", "buddy_anim_mode",
+    "buddy_position", "pomo_visible", "reflection_visible",
+)
 
 ASCII_LOGO = r'''
  [bold blue]
@@ -142,15 +72,19 @@ class FlowModeProvider(Provider):
             (f"Flow Mode: Pomodoro [{pomo_status}]", getattr(app, 'action_toggle_pomo_visibility', lambda: None), "Toggle timer visibility"),
             (f"Flow Mode: Reflection [{reflection_status}]", getattr(app, 'action_toggle_reflection_visibility', lambda: None), "Toggle reflection panel"),
             (f"Flow Mode: Focus Buddy [{buddy_status}]", getattr(app, 'action_toggle_buddy', lambda: None), "Toggle buddy companion"),
+            ("Flow Mode: Complete Task", getattr(app, 'action_complete_task', lambda: None), "Mark the current task done and advance"),
+            ("Flow Mode: Queue [all]", partial(app.action_set_flow_tag, None), "Work through every tag"),
         ]
+        for tag in get_todo_store().tags():
+            commands.append((f"Flow Mode: Queue [{tag}]", partial(app.action_set_flow_tag, tag), f"Only work on [{tag}] tasks"))
         
         if getattr(app, 'buddy_enabled', False):
             commands.extend([
                 (f"  Buddy Motion [{motion_status}]", getattr(app, 'action_toggle_buddy_motion', lambda: None), "Toggle animation"),
                 (f"  Buddy Animation Mode [{anim_status}]", getattr(app, 'action_toggle_buddy_anim_mode', lambda: None), "Switch Idle/Full"),
-                (f"  Buddy Position: Left", getattr(app, 'action_set_buddy_left', lambda: None), "Dock left"),
-                (f"  Buddy Position: Right", getattr(app, 'action_set_buddy_right', lambda: None), "Dock right"),
-                (f"  Buddy Position: Inline", getattr(app, 'action_set_buddy_inline', lambda: None), "Use empty space"),
+                ("  Buddy Position: Left", getattr(app, 'action_set_buddy_left', lambda: None), "Dock left"),
+                ("  Buddy Position: Right", getattr(app, 'action_set_buddy_right', lambda: None), "Dock right"),
+                ("  Buddy Position: Inline", getattr(app, 'action_set_buddy_inline', lambda: None), "Use empty space"),
             ])
         
         for name, callback, help_text in commands:
@@ -158,6 +92,53 @@ class FlowModeProvider(Provider):
             if not query or score > 0:
                 yield Hit(score if score > 0 else 100, matcher.highlight(name) if query else name, callback, help=help_text)
 
+def highlight_plain(matcher: Matcher, text: str) -> Content:
+    """
+    Like matcher.highlight, but `text` is shown verbatim: task text is not
+    markup ("[dev]" is a tag, "[/]" is not a closing tag). Skipping the
+    markup parse also makes it far cheaper.
+    """
+    content = Content(text)
+    score, offsets = matcher.fuzzy_search.match(matcher.query, text)
+    if score:
+        for offset in offsets:
+            if not text[offset].isspace():
+                content = content.stylize(matcher.match_style, offset, offset + 1)
+    return content
+
+
+class TodoSearchProvider(Provider):
+    """Finds tasks by text through the todo store's trigram index."""
+
+    async def startup(self) -> None:
+        # Warm the index (built once per session) off the event loop without
+        # waiting: the palette cancels a pending search on every keystroke,
+        # and a cancelled startup would disable this provider until reopened
+        asyncio.get_running_loop().run_in_executor(None, get_todo_store().search_index)
+
+    async def search(self, query: str) -> Hits:
+        if not query.strip():
+            return
+        app = self.app
+        matcher = self.matcher(query)
+        actions = [
+            ("Toggle", app.action_toggle_task, "Mark done / not done"),
+            ("Focus", app.action_focus_task, "Show in task list"),
+            ("Delete", app.action_delete_task, "Remove task"),
+        ]
+        # the index ranks candidates (typos included); searching runs off the event loop
+        todos = await asyncio.to_thread(get_todo_store().search, query, TODO_SEARCH_LIMIT)
+        for rank, todo in enumerate(todos):
+            todo_id = todo["id"]
+            icon = "✅" if todo["done"] else "⬜"
+            # scored and highlighted once per task, shared by its three actions;
+            # the index's ranking breaks ties between equal fuzzy scores
+            score = max(matcher.match(todo["text"]), 0.1) - rank * 1e-6
+            highlighted = highlight_plain(matcher, todo["text"])
+            for verb, action, help_text in actions:
+                prefix = f"{verb} task: {icon} "
+                yield Hit(score, prefix + highlighted, partial(action, todo_id), text=prefix + todo["text"], help=help_text)
+
 class GeneralProvider(Provider):
     """Provides general commands available in all modes."""
     
@@ -175,7 +156,16 @@ class GeneralProvider(Provider):
             ("Help: View Guide (External)", getattr(app, 'action_open_help', lambda: None), "View HELP.md"),
             ("Info: About (External)", getattr(app, 'action_open_info', lambda: None), "View INFO.md"),
             ("Quit Application", getattr(app, 'action_quit', lambda: None), "Exit TermFlow"),
+            ("Tasks: Show [all]", partial(app.action_filter_tasks, None), "Clear the tag filter"),
+            ("Tasks: Undo", app.action_undo, "Reverse the last add, toggle or delete"),
+            ("Tasks: Redo", app.action_redo, "Repeat the last undone change"),
+            ("Stats: Focus History", app.action_open_stats, "Focused time by day, week and task"),
+            (f"Profiler: {'Stop' if get_profiler().enabled else 'Start'}", app.action_toggle_profiler, "Time storage, ticks and rendering"),
+            ("Profiler: Toggle HUD", app.action_toggle_hud, "Show live timings"),
+            ("Profiler: Dump Trace", app.action_dump_trace, "Write timings to a JSON trace file"),
         ]
+        for tag in get_todo_store().tags():
+            commands.append((f"Tasks: Show [{tag}]", partial(app.action_filter_tasks, tag), f"Only list [{tag}] tasks"))
         
         for name, callback, help_text in commands:
             score = matcher.match(name)
@@ -189,7 +179,7 @@ class TermFlowApp(App):
         outline: none;
     }
     """
-    COMMANDS = App.COMMANDS | {FlowModeProvider, GeneralProvider}
+    COMMANDS = App.COMMANDS | {FlowModeProvider, GeneralProvider, TodoSearchProvider}
     BINDINGS = [
         Binding("f", "enter_flow", "Flow", show=True),
         Binding("escape", "escape_handler", "Exit", show=False, priority=True),
@@ -198,6 +188,9 @@ class TermFlowApp(App):
         Binding("q", "quit", "Quit", show=True),
         Binding("colon", "open_command_palette", "Command Palette", show=False),
         Binding("b", "toggle_buddy", "Toggle Buddy", show=True),
+        Binding("s", "open_stats", "Stats", show=True),
+        Binding("u", "undo", "Undo", show=True),
+        Binding("ctrl+r", "redo", "Redo", show=False),
     ]
 
     flow_state = reactive("IDLE")
@@ -205,14 +198,23 @@ class TermFlowApp(App):
     buddy_enabled = reactive(False)
     buddy_motion = reactive(True)
     buddy_anim_mode = reactive("IDLE_ACTIVE")
-    buddy_state = reactive("IDLE")
-    buddy_frame = reactive(0)
     buddy_position = reactive("left")
     pomo_visible = reactive(True)
     reflection_visible = reactive(True)
     current_task = reactive(None)
+    flow_tag = reactive(None)
     _palette_open = reactive(False)
 
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        # every periodic update in the app goes through this one timer
+        self.ticks = TickScheduler(self)
+        # values shown by more than one panel are computed once, here
+        self.data = DataService(self)
+        # the flow view is only built the first time flow mode is entered
+        self._flow_view_ready = False
+        self._flow_view_building = False
+
     def on_mount(self) -> None:
         self.set_focus(None)
         # textual is picky, we gotta register the theme first
@@ -235,59 +237,105 @@ class TermFlowApp(App):
         self.register_theme(atom_one_dark)
         self.theme = "atom-one-dark"
         
-        config = load_config()
-        if "theme" in config:
-            self.theme = config["theme"]
-        self.buddy_enabled = config.get("buddy_enabled", False)
-        self.buddy_motion = config.get("buddy_motion", True)
-        self.buddy_anim_mode = config.get("buddy_anim_mode", "IDLE_ACTIVE")
-        self.buddy_position = config.get("buddy_position", "left")
-        self.pomo_visible = config.get("pomo_visible", True)
-        self.reflection_visible = config.get("reflection_visible", True)
-        self.set_interval(2.5, self.tick_buddy)
-
-    def tick_buddy(self) -> None:
-        if self.flow_state == "DEEP" and self.buddy_enabled:
-            if self.buddy_motion:
-                if self.buddy_anim_mode == "IDLE_ONLY":
-                    self.buddy_frame = (self.buddy_frame + 1) % 2
-                    self.buddy_state = "IDLE"
-                else:
-                    self.buddy_frame = (self.buddy_frame + 1) % 10
-                    if self.buddy_frame < 2:
-                        self.buddy_state = "IDLE"
-                    elif self.buddy_frame == 2:
-                        self.buddy_state = "STAND"
-                    elif self.buddy_frame in [3, 4]:
-                        self.buddy_state = "WALK"
-                    elif self.buddy_frame in [5, 6]:
-                        self.buddy_state = "PLAY_A"
-                    elif self.buddy_frame in [7, 8]:
-                        self.buddy_state = "PLAY_B"
-                    else:
-                        self.buddy_state = "IDLE"
-            else:
-                self.buddy_state = "IDLE"
-                self.buddy_frame = 0
-            self.update_buddy_art()
+        config = get_config_store()
+        if config.theme:
+            self.theme = config.theme
+        self.buddy_enabled = config.buddy_enabled
+        self.buddy_motion = config.buddy_motion
+        self.buddy_anim_mode = config.buddy_anim_mode
+        self.buddy_position = config.buddy_position
+        self.pomo_visible = config.pomo_visible
+        self.reflection_visible = config.reflection_visible
+        for key in APP_CONFIG_KEYS:
+            self.data.subscribe(config_topic(key), None, partial(self.on_config_changed, key), replay=False)
+        get_todo_store().subscribe(self.on_todos_changed)
+        # one-shot timer for the end of the pomodoro, whichever panel is showing
+        self._pomodoro_timer = None
+        self.pomodoro = get_pomodoro_engine()
+        self.pomodoro.subscribe(self.on_pomodoro_changed)
+        # a session that ran out while the app was closed still counts
+        if not self.pomodoro.check():
+            self.on_pomodoro_changed()
+        if get_profiler().enabled:
+            self.action_toggle_hud()
+        # pick up edits to todos/config made by scripts or another terminal
+        self.file_watcher = FileWatcher(self.on_file_changed)
+        for path in get_todo_store().backend.paths():
+            self.file_watcher.watch(path)
+        self.file_watcher.watch(config.path)
+        self.file_watcher.start()
+
+    def on_unmount(self) -> None:
+        self.file_watcher.stop()
+        get_weather_provider().close()
+        self.data.close()
+        self.pomodoro.unsubscribe(self.on_pomodoro_changed)
+        # write-behind stores may still hold changes, persist them before exit
+        get_todo_store().close()
+        get_config_store().flush()
+
+    async def on_event(self, event: events.Event) -> None:
+        if isinstance(event, events.InputEvent):
+            self.ticks.touch()
+        await super().on_event(event)
+
+    def on_app_focus(self) -> None:
+        self.ticks.set_focused(True)
+
+    def on_app_blur(self) -> None:
+        self.ticks.set_focused(False)
+
+    def on_pomodoro_changed(self) -> None:
+        if self._pomodoro_timer is not None:
+            self._pomodoro_timer.stop()
+            self._pomodoro_timer = None
+        if self.pomodoro.running:
+            self._pomodoro_timer = self.set_timer(self.pomodoro.remaining(), self.finish_pomodoro)
+
+    def finish_pomodoro(self) -> None:
+        self._pomodoro_timer = None
+        if not self.pomodoro.check():
+            # woke up a hair early, try again
+            self.on_pomodoro_changed()
+
+    def on_file_changed(self, path) -> None:
+        # called on the watcher thread; the stores notify listeners on the UI thread
+        try:
+            self.call_from_thread(self.reload_changed_files)
+        except RuntimeError:
+            pass  # app is shutting down
+
+    def reload_changed_files(self) -> None:
+        get_todo_store().reload_if_changed()
+        get_config_store().reload_if_changed()
+
+    def on_config_changed(self, key: str, value) -> None:
+        # our own save_current_config lands here too, with values we already have
+        config = get_config_store()
+        if key == "theme":
+            if config.theme and config.theme != self.theme:
+                try:
+                    self.theme = config.theme
+                except Exception:
+                    pass
+            return
+        setattr(self, key, getattr(config, key))
+        if key in ("buddy_enabled", "buddy_position"):
+            self.update_buddy_layout()
+        elif key in ("pomo_visible", "reflection_visible"):
+            self.apply_flow_visibility()
+        self.call_after_refresh(self.ticks.kick)
+
+    def watch_buddy_motion(self) -> None:
+        self.configure_buddy()
 
-    def update_buddy_art(self) -> None:
-        if self.flow_state != "DEEP" or not self.buddy_enabled:
+    def watch_buddy_anim_mode(self) -> None:
+        self.configure_buddy()
+
+    def configure_buddy(self) -> None:
+        if not self._flow_view_ready:
             return
-        try:
-            buddy_widget = self.query_one("#focus-buddy", Static)
-            frames = {
-                "IDLE": CAT_IDLE_A if self.buddy_frame % 2 == 0 else CAT_IDLE_B,
-                "STAND": CAT_STAND,
-                "WALK": CAT_WALK_A if self.buddy_frame == 3 else CAT_WALK_B,
-                "PLAY_A": CAT_PLAY_A,
-                "PLAY_B": CAT_PLAY_B
-            }
-            art = frames.get(self.buddy_state, CAT_IDLE_A)
-            status_text = " [italic]Begin.[/]" if self.buddy_frame == 0 else " [italic]Focus.[/]"
-            buddy_widget.update(Art(art + status_text))
-        except Exception:
-            pass
+        self.query_one(FocusBuddy).configure(self.buddy_anim_mode, self.buddy_motion, self.buddy_enabled)
 
     def action_escape_handler(self) -> None:
         """Global ESC handler - always works."""
@@ -327,44 +375,47 @@ class TermFlowApp(App):
     def action_toggle_pomo_visibility(self) -> None:
         self.pomo_visible = not self.pomo_visible
         self.save_current_config()
-        try:
-            self.query_one("#flow-pomo").set_class(not self.pomo_visible, "hidden")
-        except Exception:
-            pass
+        self.apply_flow_visibility()
+        self.call_after_refresh(self.ticks.kick)
 
     def action_toggle_reflection_visibility(self) -> None:
         self.reflection_visible = not self.reflection_visible
         self.save_current_config()
-        try:
-            self.query_one("#flow-reflection").set_class(not self.reflection_visible, "hidden")
-        except Exception:
-            pass
+        self.apply_flow_visibility()
+        self.call_after_refresh(self.ticks.kick)
 
     def save_current_config(self) -> None:
-        from typing import Any
-        config: dict[str, Any] = load_config()
-        config["buddy_enabled"] = bool(self.buddy_enabled)
-        config["buddy_motion"] = bool(self.buddy_motion)
-        config["buddy_anim_mode"] = str(self.buddy_anim_mode)
-        config["buddy_position"] = str(self.buddy_position)
-        config["pomo_visible"] = bool(self.pomo_visible)
-        config["reflection_visible"] = bool(self.reflection_visible)
-        save_config(config)
+        # in-memory update; the store coalesces bursts into a single write
+        get_config_store().update({
+            "buddy_enabled": bool(self.buddy_enabled),
+            "buddy_motion": bool(self.buddy_motion),
+            "buddy_anim_mode": str(self.buddy_anim_mode),
+            "buddy_position": str(self.buddy_position),
+            "pomo_visible": bool(self.pomo_visible),
+            "reflection_visible": bool(self.reflection_visible),
+        })
+
+    def apply_flow_visibility(self) -> None:
+        if not self._flow_view_ready:
+            return
+        self.query_one("#flow-pomo").set_class(not self.pomo_visible, "hidden")
+        self.query_one("#flow-reflection").set_class(not self.reflection_visible, "hidden")
 
     def update_buddy_layout(self) -> None:
         if self.flow_state == "DEEP":
             try:
                 container = self.query_one("#flow-container", Horizontal)
-                buddy_widget = self.query_one("#focus-buddy", Static)
+                buddy_widget = self.query_one(FocusBuddy)
                 container.remove_class("pos-left", "pos-right", "pos-inline")
                 if self.buddy_enabled:
                     container.add_class(f"pos-{self.buddy_position}")
                     buddy_widget.remove_class("hidden")
-                    self.update_buddy_art()
                 else:
                     buddy_widget.add_class("hidden")
+                self.configure_buddy()
             except Exception:
                 pass
+            self.call_after_refresh(self.ticks.kick)
 
     def compose(self) -> ComposeResult:
         yield Header()
@@ -378,67 +429,84 @@ class TermFlowApp(App):
                     InfoPanel(id="info"),
                     id="dashboard-grid"
                 )
-            with Horizontal(id="flow-container", classes="hidden"):
-                yield Static("", id="focus-buddy", classes="hidden")
-                with VerticalScroll(id="flow-content"):
-                    yield PomodoroPanel(id="flow-pomo")
-                    yield Static("", id="flow-task")
-                    yield InfoPanel(id="flow-reflection")
+            # filled in by build_flow_view on first use
+            yield Horizontal(id="flow-container", classes="hidden")
         yield Footer()
 
+    async def build_flow_view(self) -> None:
+        """Mounts the flow view's widgets, then shows it if flow mode is still on."""
+        await self.query_one("#flow-container", Horizontal).mount(
+            FocusBuddy(id="focus-buddy", classes="hidden"),
+            VerticalScroll(
+                PomodoroPanel(id="flow-pomo"),
+                Static("", id="flow-task"),
+                Static("", id="flow-upnext", classes="hidden"),
+                InfoPanel(id="flow-reflection"),
+                id="flow-content",
+            ),
+        )
+        self._flow_view_ready = True
+        self.configure_buddy()
+        if self.flow_state == "DEEP":
+            self.show_flow_view()
+
     def watch_flow_state(self, state: str) -> None:
         try:
             dashboard = self.query_one("#dashboard-view")
             flow_view = self.query_one("#flow-container")
         except Exception:
             return
-            
+
         if state == "DEEP":
-            dashboard.add_class("hidden")
-            flow_view.remove_class("hidden")
-            self.load_next_flow_task()
-            self.update_buddy_layout()
-            try:
-                self.query_one("#flow-pomo").set_class(not self.pomo_visible, "hidden")
-                self.query_one("#flow-reflection").set_class(not self.reflection_visible, "hidden")
-            except Exception:
-                pass
-            try:
-                pomo = self.query_one("#flow-pomo", PomodoroPanel)
-                if not pomo.timer_active:
-                    pomo.handle_toggle()
-            except Exception:
-                pass
+            if self._flow_view_ready:
+                self.show_flow_view()
+            elif not self._flow_view_building:
+                # the dashboard stays up until the flow view is ready to replace it
+                self._flow_view_building = True
+                self.call_next(self.build_flow_view)
         else:
             dashboard.remove_class("hidden")
             flow_view.add_class("hidden")
+            self.pomodoro.task = None
+            # panels that were skipped while hidden catch up once they are shown
+            self.call_after_refresh(self.ticks.kick)
+
+    def show_flow_view(self) -> None:
+        self.query_one("#dashboard-view").add_class("hidden")
+        self.query_one("#flow-container").remove_class("hidden")
+        self.load_next_flow_task()
+        self.update_buddy_layout()
+        self.apply_flow_visibility()
+        if not self.pomodoro.running:
+            self.pomodoro.start()
+        self.call_after_refresh(self.ticks.kick)
 
     def load_next_flow_task(self) -> None:
         """Loads the next pending task for Flow Mode."""
-        # fresh reload so we don't show ghost tasks
-        from termflow.utils.todos import load_todos
-        todos = load_todos()
-        
-        # look for anything not explicitly marked as done
-        # we check both 'completed' and 'done' keys because we're flexible like that
-        active = []
-        for t in todos:
-            is_completed = t.get("done", t.get("completed", False))
-            if not is_completed:
-                active.append(t)
+        # the store keeps pending tasks queued in order, so this is just a peek
+        upcoming = get_todo_store().pending_head(FLOW_LOOKAHEAD + 1, tag=self.flow_tag)
         
         try:
             # check if widget is actually there
             flow_task_widget = self.query_one("#flow-task", Static)
-            if active:
-                self.current_task = active[0]
+            up_next_widget = self.query_one("#flow-upnext", Static)
+            # the pomodoro started in flow mode is logged against this task
+            self.pomodoro.task = upcoming[0] if upcoming else None
+            if upcoming:
+                self.current_task = upcoming[0]
                 # update the UI with the first pending task
-                task_name = active[0].get('text', active[0].get('task', 'Unnamed Task'))
-                flow_task_widget.update(f"[bold cyan]Task:[/] {task_name}")
+                flow_task_widget.update(f"[bold cyan]Task:[/] {escape(upcoming[0]['text'])}")
             else:
                 self.current_task = None
                 # only show this if the list is actually empty or all done
-                flow_task_widget.update("[italic]All tasks completed. Add more in dashboard.[/]")
+                scope = f" [{escape(self.flow_tag)}]" if self.flow_tag else ""
+                flow_task_widget.update(f"[italic]All{escape(scope)} tasks completed. Add more in dashboard.[/]")
+            if len(upcoming) > 1:
+                lines = "\n".join(f"[dim]· {escape(t['text'])}[/]" for t in upcoming[1:])
+                up_next_widget.update(f"[dim italic]Up next[/]\n{lines}")
+                up_next_widget.remove_class("hidden")
+            else:
+                up_next_widget.add_class("hidden")
             
             # force a refresh of the widget just in case
             flow_task_widget.refresh()
@@ -446,22 +514,15 @@ class TermFlowApp(App):
             # widget might not be mounted yet, nbd
             pass
 
+    def on_todos_changed(self) -> None:
+        # keep the focused task in sync with edits made elsewhere
+        if self.flow_state == "DEEP":
+            self.load_next_flow_task()
+
     def action_complete_task(self) -> None:
         if self.flow_state == "DEEP" and self.current_task:
-            from termflow.utils.todos import load_todos, save_todos
-            todos = load_todos()
-            for t in todos:
-                # check both potential keys for identifying the task
-                task_text = t.get('text') or t.get('task')
-                current_task_text = self.current_task.get('text') or self.current_task.get('task')
-                
-                if task_text == current_task_text:
-                    # sync both keys for maximum compatibility
-                    t['completed'] = True
-                    t['done'] = True
-                    break
-            save_todos(todos)
-            self.load_next_flow_task()
+            # the store notifies on_todos_changed, which advances to the next task
+            get_todo_store().set_done(self.current_task["id"])
 
     def action_open_command_palette(self) -> None:
         """Open command palette with proper state management."""
@@ -471,8 +532,23 @@ class TermFlowApp(App):
 
     def action_enter_flow(self) -> None:
         if self.flow_state == "IDLE":
+            # flow follows whatever tag the task list is filtered on
+            try:
+                self.flow_tag = self.query_one(TodoPanel).filter_tag
+            except Exception:
+                self.flow_tag = None
             self.flow_state = "DEEP"
 
+    def action_set_flow_tag(self, tag) -> None:
+        self.flow_tag = tag
+        self.load_next_flow_task()
+
+    def action_filter_tasks(self, tag) -> None:
+        try:
+            self.query_one(TodoPanel).set_filter(tag)
+        except Exception:
+            pass
+
     def action_exit_flow(self) -> None:
         self.flow_state = "IDLE"
 
@@ -490,6 +566,54 @@ class TermFlowApp(App):
             except Exception:
                 pass
 
+    def action_toggle_task(self, todo_id: str) -> None:
+        get_todo_store().toggle(todo_id)
+
+    def action_delete_task(self, todo_id: str) -> None:
+        get_todo_store().delete(todo_id)
+
+    def action_undo(self) -> None:
+        # covers flow mode's complete task too; on_todos_changed brings the task back
+        todo = get_todo_store().undo()
+        self.notify(f"Undone: {escape(todo['text'])}" if todo else "Nothing to undo", timeout=2)
+
+    def action_redo(self) -> None:
+        todo = get_todo_store().redo()
+        self.notify(f"Redone: {escape(todo['text'])}" if todo else "Nothing to redo", timeout=2)
+
+    def action_focus_task(self, todo_id: str) -> None:
+        if self.flow_state == "DEEP":
+            self.action_exit_flow()
+        try:
+            self.query_one(TodoPanel).focus_task(todo_id)
+        except Exception:
+            pass
+
+    def action_open_stats(self) -> None:
+        from termflow.ui.stats import StatsScreen
+        if isinstance(self.screen, StatsScreen):
+            return
+        # installed screens survive being popped, so reopening is instant
+        if not self.is_screen_installed("stats"):
+            self.install_screen(StatsScreen(), "stats")
+        self.push_screen("stats")
+
+    def action_toggle_profiler(self) -> None:
+        enabled = get_profiler().toggle()
+        self.notify(f"Profiler {'on' if enabled else 'off'}")
+
+    def action_toggle_hud(self) -> None:
+        from termflow.ui.hud import ProfilerHUD
+        huds = self.screen.query(ProfilerHUD)
+        if huds:
+            huds.remove()
+        else:
+            self.screen.mount(ProfilerHUD())
+
+    def action_dump_trace(self) -> None:
+        path = get_profiler().dump()
+        self.notify(f"Trace written to {path}")
+
     def action_open_help(self) -> None:
         from termflow.utils.open_docs import open_file
         open_file("HELP.md")
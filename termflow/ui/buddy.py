@@ -0,0 +1,228 @@
+"""The flow-mode focus buddy: companions as data, played by a small frame engine."""
+
+from typing import Dict, NamedTuple, Optional, Tuple
+from rich.text import Text
+from textual.widgets import Static
+
+# Seconds between animation steps
+FRAME_INTERVAL = 2.5
+
+CAT_IDLE_A = r'''
+         _     _
+        /\`-"-`/\
+        )` _ _ `(
+    (`\ |=  Y  =|
+     ) )_\  ^  /_
+    ( (/ ;`-u-`; \
+     \| /       \ |
+      \ \_ \ / _/ /
+ jgs  (,(,,)~(,,),)
+'''
+
+CAT_IDLE_B = r'''
+         _     _
+        /\`-"-`/\
+        )` _ _ `(
+       {=   Y   =}
+        \   ^   /
+       /`;'-u-';`\
+      | /       \ |
+     /\ ;__\ / _/ /
+ jgs \___, )~(,,),)
+        (_(
+'''
+
+CAT_STAND = r'''
+                      ,
+                    _/((
+           _.---. .'   `\
+         .'      `     ^ T=
+        /     \       .--'
+       |      /       )'-.
+       ; ,   <__..-(   '-.)
+        \ \-.__)    ``--._)
+     jgs '.'-.__.-.
+           '-...-'
+'''
+
+CAT_WALK_A = r'''
+        _
+       //
+      ||              |\_/|
+       \\  .-""""-._,' e e(
+        \\/         \  =_Y/=
+         \    \       /`"`
+          \   | /    |
+          /  / -\   /
+          `\ \\  | ||
+            \_)) |_))
+'''
+
+CAT_WALK_B = r'''
+           _ 
+          ((
+           \\
+            ))       
+           //.--.     |\_/|
+          |      `'..' a a(
+           \  \      \ =_Y/=
+           /   |   /  /`"`
+           > /` --< <<
+           \__))   \_))
+'''
+
+CAT_PLAY_A = r'''
+                      __     __,
+                      \,`~"~` /
+      .-=-.           /    . .\
+     / .-. \          {  =    Y}=
+    (_/   \ \          \      / 
+           \ \        _/`'`'`b
+            \ `.__.-'`        \-._
+             |            '.__ `'-;_
+             |            _.' `'-.__)
+              \    ;_..--'/     //  \
+              |   /  /   |     //    |
+              \  \ \__)   \   //    /
+               \__)        './/   .'
+                             `'-'`
+'''
+
+CAT_PLAY_B = r'''
+                   .-o=o-.
+               ,  /=o=o=o=\ .--.
+              _|\|=o=O=o=O=|    \
+          __.'  a`\=o=o=o=(`\   /
+          '.   a 4/`|.-""'`\ \ ;'`)   .---.
+            \   .'  /   .--'  |_.'   / .-._)
+             `)  _.'   /     /`-.__.' /
+              `'-.____;     /'-.___.-'
+                       `"""`
+'''
+
+
+class Companion(NamedTuple):
+    """
+    A buddy, described entirely as data.
+
+    `frames` maps frame names to ASCII art; `animations` maps each
+    animation mode to the sequence of frames it loops through (one step per
+    tick); `rest` is the frame shown while motion is off. `captions` are
+    the markup shown under the art on the first step of a loop and on
+    every other step.
+    """
+
+    frames: Dict[str, str]
+    animations: Dict[str, Tuple[str, ...]]
+    rest: str
+    captions: Tuple[str, str] = (" [italic]Begin.[/]", " [italic]Focus.[/]")
+
+
+COMPANIONS: Dict[str, Companion] = {
+    "cat": Companion(
+        frames={
+            "idle_a": CAT_IDLE_A,
+            "idle_b": CAT_IDLE_B,
+            "stand": CAT_STAND,
+            "walk_a": CAT_WALK_A,
+            "walk_b": CAT_WALK_B,
+            "play_a": CAT_PLAY_A,
+            "play_b": CAT_PLAY_B,
+        },
+        animations={
+            "IDLE_ACTIVE": (
+                "idle_a", "idle_b", "stand", "walk_a", "walk_b",
+                "play_a", "play_a", "play_b", "play_b", "idle_b",
+            ),
+            "IDLE_ONLY": ("idle_a", "idle_b"),
+        },
+        rest="idle_a",
+    ),
+}
+DEFAULT_COMPANION = "cat"
+
+
+class BuddyAnimator:
+    """
+    Steps through a companion's animation tables.
+
+    Every (frame, caption) pair is compiled into a Text once, up front;
+    `frame()` just returns the cached one, so a tick costs an index bump.
+    """
+
+    def __init__(self, companion: Companion) -> None:
+        self.companion = companion
+        self._compiled = {
+            (name, first): Text(art) + Text.from_markup(companion.captions[0 if first else 1])
+            for name, art in companion.frames.items()
+            for first in (True, False)
+        }
+        self.mode = next(iter(companion.animations))
+        self.motion = True
+        self.step = 0
+
+    @property
+    def sequence(self) -> Tuple[str, ...]:
+        if not self.motion:
+            return (self.companion.rest,)
+        return self.companion.animations.get(self.mode) or next(iter(self.companion.animations.values()))
+
+    @property
+    def animated(self) -> bool:
+        """True if advancing can change the frame at all."""
+        return len(self.sequence) > 1
+
+    def configure(self, mode: str, motion: bool) -> None:
+        if (mode, motion) != (self.mode, self.motion):
+            self.mode, self.motion = mode, motion
+            self.step = 0
+
+    def advance(self) -> None:
+        self.step = (self.step + 1) % len(self.sequence)
+
+    def frame(self) -> Text:
+        return self._compiled[(self.sequence[self.step], self.step == 0)]
+
+
+class FocusBuddy(Static):
+    """
+    The companion shown next to the flow view.
+
+    Ticks through the app scheduler only while it can change anything:
+    the job is parked while the buddy is hidden, paused in low-power mode
+    and disabled while motion is off or the animation has a single frame.
+    A step that lands on the frame already shown does not repaint.
+    """
+
+    can_focus = False
+
+    def __init__(self, companion: str = DEFAULT_COMPANION, **kwargs) -> None:
+        super().__init__("", **kwargs)
+        self.animator = BuddyAnimator(COMPANIONS.get(companion, COMPANIONS[DEFAULT_COMPANION]))
+        self._shown: Optional[Text] = None
+        self._active = False
+
+    def on_mount(self) -> None:
+        self.tick_job = self.app.ticks.register(self, self.advance, FRAME_INTERVAL, low_power_interval=None)
+        self.app.ticks.set_enabled(self.tick_job, False)
+
+    def on_unmount(self) -> None:
+        self.app.ticks.unregister(self.tick_job)
+
+    def configure(self, mode: str, motion: bool, active: bool) -> None:
+        """Applies the animation settings; `active` is False while the buddy is turned off."""
+        self.animator.configure(mode, motion)
+        self._active = active
+        self.app.ticks.set_enabled(self.tick_job, active and self.animator.animated)
+        if active:
+            self.show()
+
+    def advance(self) -> None:
+        self.animator.advance()
+        self.show()
+
+    def show(self) -> None:
+        frame = self.animator.frame()
+        if frame is not self._shown:
+            self._shown = frame
+            self.update(frame)
@@ -0,0 +1,57 @@
+from textual.widgets import Static
+from rich.markup import escape
+from termflow.core.profiler import get_profiler
+
+# Rows shown in the HUD, by total time spent.
+HUD_ROWS = 12
+
+
+class ProfilerHUD(Static):
+    """Overlay listing the slowest instrumented calls, refreshed once a second."""
+
+    can_focus = False
+
+    DEFAULT_CSS = """
+    ProfilerHUD {
+        overlay: screen;
+        position: absolute;
+        width: 64;
+        height: auto;
+        max-height: 20;
+        padding: 0 1;
+        background: $panel 85%;
+        color: $text;
+    }
+    """
+
+    def on_mount(self) -> None:
+        self.place()
+        self.tick_job = self.app.ticks.register(self, self.refresh_stats, 1)
+        self.refresh_stats()
+
+    def on_unmount(self) -> None:
+        self.app.ticks.unregister(self.tick_job)
+
+    def place(self) -> None:
+        # top right corner, over whatever is there (re-checked every refresh
+        # so it follows terminal resizes)
+        x = max(0, self.screen.size.width - 64)
+        if self.styles.offset.x.value != x:
+            self.styles.offset = (x, 1)
+
+    def refresh_stats(self) -> None:
+        self.place()
+        profiler = get_profiler()
+        if not profiler.enabled:
+            self.update("[bold]Profiler[/] [dim]off (palette: Profiler: Start)[/]")
+            return
+        frames = profiler.stats.get("frame")
+        lines = [
+            f"[bold]Profiler[/]  wake-ups {self.app.ticks.wakeups}"
+            + (f"  frames {frames.count} (avg {frames.avg * 1e3:.2f} ms)" if frames else ""),
+            f"[dim]{'name':<34}{'calls':>7}{'avg ms':>9}{'max ms':>9}[/]",
+        ]
+        for name, stat in profiler.summary(HUD_ROWS):
+            label = name if len(name) <= 33 else name[:32] + "…"
+            lines.append(f"{escape(label):<34}{stat.count:>7}{stat.avg * 1e3:>9.2f}{stat.max * 1e3:>9.2f}")
+        self.update("\n".join(lines))
@@ -0,0 +1,73 @@
+from datetime import date, timedelta
+from textual.app import ComposeResult
+from textual.binding import Binding
+from textual.containers import Vertical
+from textual.screen import ModalScreen
+from textual.widgets import Label, Static
+from rich.markup import escape
+from termflow.core.history import get_session_history
+
+# Days shown in the bar chart.
+STATS_DAYS = 7
+BAR_WIDTH = 30
+
+
+class StatsScreen(ModalScreen):
+    """Focus statistics, read straight from the session rollups (installed once, reused)."""
+
+    BINDINGS = [Binding("s", "app.pop_screen", "Close", show=False)]
+
+    DEFAULT_CSS = """
+    StatsScreen {
+        align: center middle;
+    }
+    #stats {
+        width: 64;
+        height: auto;
+        padding: 1 2;
+        border: round $primary;
+        background: $surface;
+    }
+    """
+
+    def compose(self) -> ComposeResult:
+        with Vertical(id="stats"):
+            yield Label("[bold]Focus Stats[/bold]", classes="panel-header")
+            yield Static(self.render_stats(), id="stats-body")
+            yield Label("Esc: Close", classes="help-text")
+
+    def on_mount(self) -> None:
+        self.history = get_session_history()
+        self.history.subscribe(self.refresh_stats)
+
+    def on_unmount(self) -> None:
+        self.history.unsubscribe(self.refresh_stats)
+
+    def on_screen_resume(self) -> None:
+        # the app keeps this screen around between visits; "today" may have moved on
+        self.refresh_stats()
+
+    def refresh_stats(self) -> None:
+        self.query_one("#stats-body", Static).update(self.render_stats())
+
+    def render_stats(self) -> str:
+        history = get_session_history()
+        today = date.today()
+        day, week = history.day(today), history.week(today)
+        lines = [
+            f"Today      [bold]{day.minutes} min[/]  ({day.sessions} done, {day.interrupted} interrupted)",
+            f"This week  [bold]{week.minutes} min[/]  ({week.sessions} done, {week.interrupted} interrupted)",
+            "",
+        ]
+        days = [today - timedelta(days=n) for n in range(STATS_DAYS - 1, -1, -1)]
+        rollups = [history.day(d) for d in days]
+        longest = max((r.seconds for r in rollups), default=0) or 1
+        for d, rollup in zip(days, rollups):
+            bar = "█" * round(BAR_WIDTH * rollup.seconds / longest)
+            lines.append(f"{d:%a %d}  [cyan]{bar}[/] {rollup.minutes}m")
+        top = history.top_tasks(5)
+        if top:
+            lines += ["", "[bold]Top tasks[/]"]
+            for _, text, rollup in top:
+                lines.append(f"  {rollup.minutes:>4}m  {escape(text)}")
+        return "\n".join(lines)
@@ -0,0 +1,480 @@
+"""Storage backends the TodoStore persists through."""
+
+import json
+import os
+import secrets
+import threading
+import zlib
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from termflow.utils.fileio import atomic_write
+from termflow.utils.watch import FileSignature, file_signature
+
+# Once the journal grows past this many bytes it is folded into todos.json.
+COMPACT_THRESHOLD = 256 * 1024
+
+
+def new_todo_id() -> str:
+    """Returns a fresh random task ID."""
+    return secrets.token_hex(8)
+
+
+def normalize_todo(todo: Dict) -> Dict:
+    """Returns a clean {'id', 'text', 'done'} record, accepting legacy keys."""
+    done = todo.get("done", todo.get("completed", False))
+    text = todo.get("text", todo.get("task", "Untitled"))
+    if not isinstance(text, str):
+        # null or a number from a hand edit
+        text = "Untitled" if text is None else str(text)
+    todo_id = todo.get("id")
+    if not isinstance(todo_id, str) or not todo_id:
+        todo_id = new_todo_id()
+    return {"id": todo_id, "text": text, "done": bool(done)}
+
+
+def _is_clean(todo: Dict) -> bool:
+    return (
+        len(todo) == 3 and type(todo.get("done")) is bool and isinstance(todo.get("text"), str)
+        and type(todo.get("id")) is str and todo["id"] != ""
+    )
+
+
+def dump_snapshot(todos: List[Dict]) -> bytes:
+    """
+    Serializes the snapshot with one task per line: still easy to read and
+    edit by hand, but every record goes through the C JSON encoder, which
+    indent= would disable.
+    """
+    if not todos:
+        return b"[]\n"
+    body = ",\n  ".join(json.dumps(todo, ensure_ascii=False) for todo in todos)
+    return f"[\n  {body}\n]\n".encode("utf-8")
+
+
+class TodoBackend:
+    """
+    Persistence interface for the TodoStore.
+
+    The store owns the list in memory and hands the backend a batch of
+    journal records ({'op': 'add'|'set'|'del', ...}) on every flush, or the
+    whole list when a rewrite is due. An 'add' normally appends; one with
+    'at' (an undone delete) goes back to that list index. Backends only
+    deal with durability.
+    """
+
+    name = "base"
+    # Set by a load that had to give tasks new IDs; the store saves them right away
+    assigned_ids = False
+
+    def paths(self) -> List[Path]:
+        """The files this backend owns (watched for external edits)."""
+        return []
+
+    def signature(self) -> Tuple[Optional[FileSignature], ...]:
+        """Changes whenever any file the backend owns changes on disk."""
+        return tuple(file_signature(path) for path in self.paths())
+
+    def load(self) -> List[Dict]:
+        """Returns the persisted tasks in list order."""
+        raise NotImplementedError
+
+    @property
+    def needs_rewrite(self) -> bool:
+        """True if the next flush should rewrite everything instead of appending."""
+        return False
+
+    @property
+    def journaled(self) -> bool:
+        """True if records wait in a journal that a rewrite would fold into the main file."""
+        return False
+
+    def append(self, ops: List[Dict]) -> None:
+        """Persists a batch of journal records."""
+        raise NotImplementedError
+
+    def rewrite(self, todos: List[Dict]) -> None:
+        """Replaces everything persisted with `todos`."""
+        raise NotImplementedError
+
+    def fallback(self) -> Optional["TodoBackend"]:
+        """What to continue with if this backend stops working for good, if anything."""
+        return None
+
+    def close(self) -> None:
+        pass
+
+
+class JsonBackend(TodoBackend):
+    """
+    todos.json snapshot plus an append-only todos.journal.jsonl.
+
+    Each flush appends its records to the journal, so the cost of a change
+    does not depend on the size of the list. When the journal passes
+    `compact_threshold` the store rewrites the snapshot (atomically) and
+    the journal starts over.
+
+    The journal starts with a header holding the CRC of the snapshot it
+    applies to. If a compaction is interrupted after the snapshot was
+    replaced (or the snapshot was edited by hand), the journal no longer
+    matches. Its records are keyed by task ID and idempotent, so they are
+    still replayed on top of the new snapshot, skipping tasks it no longer
+    has; only positional records from before IDs existed are dropped. The
+    next write then starts a fresh journal.
+    """
+
+    name = "json"
+
+    def __init__(self, path: Path, compact_threshold: int = COMPACT_THRESHOLD) -> None:
+        self.path = Path(path)
+        self.journal_path = self.path.with_name(self.path.stem + ".journal.jsonl")
+        self.compact_threshold = compact_threshold
+        self._snapshot_crc = 0
+        self._header_size = 0
+        self._stale = False
+
+    def paths(self) -> List[Path]:
+        return [self.path, self.journal_path]
+
+    @property
+    def needs_rewrite(self) -> bool:
+        if self._stale:
+            return True
+        try:
+            size = self.journal_path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        return size == 0 or size >= self.compact_threshold
+
+    @property
+    def journaled(self) -> bool:
+        try:
+            size = self.journal_path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        return self._stale or size > self._header_size
+
+    def load(self) -> List[Dict]:
+        try:
+            raw = self.path.read_bytes()
+        except (FileNotFoundError, IOError):
+            raw = b""
+        self._snapshot_crc = zlib.crc32(raw)
+        self._header_size = 0
+        self._stale = False
+        self.assigned_ids = False
+        todos: List[Dict] = []
+        if raw:
+            try:
+                data = json.loads(raw)
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                # Whatever gets saved next replaces it with a clean snapshot
+                self._stale = True
+                raise ValueError(f"{self.path.name} is not valid JSON: {e}") from e
+            # Ensure data is a list of dicts
+            if isinstance(data, list):
+                # Records the store wrote itself are already clean; freshly
+                # parsed, they can be kept as they are instead of copied
+                todos = [
+                    todo if _is_clean(todo) else normalize_todo(todo)
+                    for todo in data if isinstance(todo, dict)
+                ]
+                if any(isinstance(todo, dict) and "id" not in todo for todo in data):
+                    # Tasks written before IDs existed; the store writes their new
+                    # IDs out at once, or they would change on every load
+                    self._stale = True
+                    self.assigned_ids = True
+        self._replay(todos)
+        return todos
+
+    def _replay(self, todos: List[Dict]) -> None:
+        """Applies the journal on top of the snapshot."""
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                header = f.readline()
+                self._header_size = len(header.encode("utf-8"))
+                try:
+                    base = json.loads(header).get("base")
+                except (json.JSONDecodeError, AttributeError):
+                    base = None
+                matches = base == self._snapshot_crc
+                if not matches:
+                    # Left over from an interrupted compaction (or the snapshot
+                    # was edited by hand); start a fresh journal on next write.
+                    self._stale = True
+                index = {todo["id"]: todo for todo in todos}
+                for line in f:
+                    try:
+                        op = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn final line from a crash mid-append
+                        break
+                    if matches or "i" not in op:
+                        self._apply(todos, index, op)
+        except FileNotFoundError:
+            pass
+
+    def _apply(self, todos: List[Dict], index: Dict[str, Dict], op: Dict) -> None:
+        kind = op.get("op")
+        if "i" in op:
+            # Positional record from before task IDs existed
+            i = op["i"]
+            if not 0 <= i < len(todos):
+                return
+            todo = todos[i]
+            self._stale = True
+        else:
+            todo = index.get(op.get("id"))
+        if kind == "add":
+            todo = normalize_todo(op)
+            if todo["id"] not in index:
+                # "at": a task put back where it was by an undo
+                todos.insert(op.get("at", len(todos)), todo)
+                index[todo["id"]] = todo
+        elif todo is None:
+            return
+        elif kind == "set":
+            todo["done"] = bool(op["done"])
+        elif kind == "del":
+            del index[todo["id"]]
+            todos.remove(todo)
+
+    def append(self, ops: List[Dict]) -> None:
+        if not ops:
+            return
+        lines = "".join(json.dumps(op, ensure_ascii=False) + "\n" for op in ops)
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def rewrite(self, todos: List[Dict]) -> None:
+        """Writes a new snapshot, then starts an empty journal on top of it."""
+        snapshot = dump_snapshot(todos)
+        atomic_write(self.path, snapshot)
+        self._snapshot_crc = zlib.crc32(snapshot)
+        header = (json.dumps({"base": self._snapshot_crc}) + "\n").encode("utf-8")
+        atomic_write(self.journal_path, header)
+        self._header_size = len(header)
+        self._stale = False
+
+
+class SQLiteBackend(TodoBackend):
+    """
+    A SQLite database in WAL mode.
+
+    Adds, toggles and deletes become single-row statements, and the
+    status, tag and order columns are indexed so other tools (and the
+    headless commands) can query a large shared task list without loading
+    it. On first use an existing todos.json is imported once.
+    """
+
+    name = "sqlite"
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS todos (
+        id TEXT PRIMARY KEY,
+        text TEXT NOT NULL,
+        done INTEGER NOT NULL DEFAULT 0,
+        position INTEGER NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS todos_done ON todos (done, position);
+    CREATE INDEX IF NOT EXISTS todos_position ON todos (position);
+    CREATE TABLE IF NOT EXISTS todo_tags (
+        todo_id TEXT NOT NULL REFERENCES todos (id) ON DELETE CASCADE,
+        tag TEXT NOT NULL,
+        PRIMARY KEY (todo_id, tag)
+    );
+    CREATE INDEX IF NOT EXISTS todo_tags_tag ON todo_tags (tag);
+    CREATE TABLE IF NOT EXISTS meta (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    );
+    """
+
+    def __init__(self, path: Path, import_from: Optional[Path] = None) -> None:
+        self.path = Path(path)
+        self.import_from = Path(import_from) if import_from is not None else None
+        self._lock = threading.Lock()
+        # Imported here so the default JSON backend never loads sqlite
+        import sqlite3
+        # The store flushes from a background thread; all access goes through _lock
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(self.SCHEMA)
+
+    def paths(self) -> List[Path]:
+        return [self.path, self.path.with_name(self.path.name + "-wal")]
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _import_json(self) -> None:
+        """One-shot import of an existing todos.json (and its journal)."""
+        if self._meta("imported_json") is not None:
+            return
+        todos: List[Dict] = []
+        if self.import_from is not None and self.import_from.exists():
+            try:
+                todos = JsonBackend(self.import_from).load()
+            except ValueError as e:
+                # Leave the import pending so a repaired file is picked up later
+                print(f"Error importing todos: {e}")
+                return
+        with self._transaction():
+            if todos and self.conn.execute("SELECT COUNT(*) FROM todos").fetchone()[0] == 0:
+                self._insert(todos, start=0)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('imported_json', ?)",
+                (str(self.import_from or ""),),
+            )
+
+    def _transaction(self):
+        backend = self
+
+        class _Tx:
+            def __enter__(self):
+                backend.conn.execute("BEGIN IMMEDIATE")
+
+            def __exit__(self, exc_type, exc, tb):
+                backend.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+                return False
+
+        return _Tx()
+
+    def _insert(self, todos: Iterable[Dict], start: int) -> None:
+        # Imported here to avoid a cycle: todos.py builds on this module
+        from termflow.utils.todos import parse_tags
+        rows, tags = [], []
+        for position, todo in enumerate(todos, start):
+            rows.append((todo["id"], todo["text"], int(todo["done"]), position))
+            tags.extend((todo["id"], tag) for tag in parse_tags(todo["text"]))
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO todos (id, text, done, position) VALUES (?, ?, ?, ?)", rows
+        )
+        self.conn.executemany("INSERT OR IGNORE INTO todo_tags (todo_id, tag) VALUES (?, ?)", tags)
+
+    def _next_position(self) -> int:
+        row = self.conn.execute("SELECT COALESCE(MAX(position), -1) + 1 FROM todos").fetchone()
+        return row[0]
+
+    def _position_at(self, index: Optional[int]) -> int:
+        """Frees the position of the task at list index `index` (the end for None) and returns it."""
+        if index is None:
+            return self._next_position()
+        row = self.conn.execute("SELECT position FROM todos ORDER BY position LIMIT 1 OFFSET ?", (index,)).fetchone()
+        if row is None:
+            return self._next_position()
+        self.conn.execute("UPDATE todos SET position = position + 1 WHERE position >= ?", (row[0],))
+        return row[0]
+
+    def load(self) -> List[Dict]:
+        with self._lock:
+            self._import_json()
+            rows = self.conn.execute("SELECT id, text, done FROM todos ORDER BY position")
+            return [{"id": i, "text": t, "done": bool(d)} for i, t, d in rows]
+
+    def append(self, ops: List[Dict]) -> None:
+        if not ops:
+            return
+        with self._lock, self._transaction():
+            for op in ops:
+                kind = op.get("op")
+                if kind == "add":
+                    self._insert([normalize_todo(op)], start=self._position_at(op.get("at")))
+                elif kind == "set":
+                    self.conn.execute(
+                        "UPDATE todos SET done = ? WHERE id = ?", (int(op["done"]), op["id"])
+                    )
+                elif kind == "del":
+                    self.conn.execute("DELETE FROM todos WHERE id = ?", (op["id"],))
+
+    def rewrite(self, todos: List[Dict]) -> None:
+        with self._lock, self._transaction():
+            self.conn.execute("DELETE FROM todos")
+            self._insert(todos, start=0)
+
+    def pending(self, limit: int = 10, tag: Optional[str] = None) -> List[Dict]:
+        """Indexed query for the first unfinished tasks, without loading the list."""
+        with self._lock:
+            if tag is None:
+                rows = self.conn.execute(
+                    "SELECT id, text, done FROM todos WHERE done = 0 ORDER BY position LIMIT ?",
+                    (limit,),
+                )
+            else:
+                rows = self.conn.execute(
+                    "SELECT t.id, t.text, t.done FROM todos t JOIN todo_tags g ON g.todo_id = t.id "
+                    "WHERE g.tag = ? AND t.done = 0 ORDER BY t.position LIMIT ?",
+                    (tag, limit),
+                )
+            return [{"id": i, "text": t, "done": bool(d)} for i, t, d in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
+
+
+class DaemonBackend(TodoBackend):
+    """
+    Hands everything to a running `termflow daemon`, which owns the files.
+
+    Journal records are sent to the daemon as they are flushed and applied
+    to its copy of the list. The signature is the daemon's revision counter
+    and `paths()` are the files it writes, so a client's file watcher still
+    notices changes other clients make (once the daemon has written them).
+
+    If the daemon goes away, requests raise OSError or DaemonError and the
+    store switches to `fallback()`: the file backend the daemon was using.
+    """
+
+    name = "daemon"
+
+    def __init__(self, client, fallback: Optional[Callable[[], TodoBackend]] = None) -> None:
+        self.client = client
+        self._fallback = fallback
+        self._paths = [Path(p) for p in client.request("paths")]
+
+    def paths(self) -> List[Path]:
+        return list(self._paths)
+
+    def signature(self) -> Tuple:
+        return (self.client.request("revision"),)
+
+    def load(self) -> List[Dict]:
+        return [normalize_todo(todo) for todo in self.client.request("todos")]
+
+    def append(self, ops: List[Dict]) -> None:
+        if ops:
+            self.client.request("apply", ops=ops)
+
+    def rewrite(self, todos: List[Dict]) -> None:
+        self.client.request("replace", todos=todos)
+
+    def fallback(self) -> Optional[TodoBackend]:
+        return self._fallback() if self._fallback is not None else None
+
+    def close(self) -> None:
+        try:
+            self.client.close()
+        except OSError:
+            pass
+
+
+BACKENDS = {JsonBackend.name: JsonBackend, SQLiteBackend.name: SQLiteBackend}
+
+
+def make_backend(name: str, data_dir: Path) -> TodoBackend:
+    """
+    Builds the backend called `name` ("json" or "sqlite") in `data_dir`.
+
+    Raises:
+        ValueError: If `name` is not a known backend
+    """
+    if name == JsonBackend.name:
+        return JsonBackend(data_dir / "todos.json")
+    if name == SQLiteBackend.name:
+        return SQLiteBackend(data_dir / "todos.db", import_from=data_dir / "todos.json")
+    raise ValueError(f"Unknown storage backend: {name!r} (expected one of {sorted(BACKENDS)})")
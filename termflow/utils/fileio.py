@@ -0,0 +1,108 @@
+"""Small file helpers shared by the persistent stores."""
+
+import os
+import stat
+import tempfile
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+
+# os.umask can only be read by setting it, which is not thread-safe; read
+# it once at import, before the stores start their flush threads
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def atomic_write(path: Path, data: bytes) -> None:
+    """
+    Replace `path` with `data` without ever leaving a truncated file behind.
+
+    The bytes go to a temporary file in the same directory, are fsynced and
+    then moved over the target with os.replace (atomic on POSIX and Windows).
+    The result keeps the permissions of the file it replaces; a new file
+    gets the usual mode for the process umask rather than mkstemp's 0600.
+    """
+    path = Path(path)
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            if hasattr(os, "fchmod"):
+                os.fchmod(f.fileno(), mode)
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class DebouncedFlush:
+    """
+    Runs `callback` on a background thread once no new `schedule()` call
+    has arrived for `delay` seconds. `flush()` runs it immediately.
+    """
+
+    def __init__(self, callback: Callable[[], None], delay: float = 0.5) -> None:
+        self.callback = callback
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._run_lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._dirty = False
+
+    @property
+    def pending(self) -> bool:
+        return self._dirty
+
+    def schedule(self) -> None:
+        """Mark the owner dirty and (re)start the countdown."""
+        with self._lock:
+            self._dirty = True
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.delay, self._fire)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self) -> None:
+        """Run the callback now if anything is pending, or wait for a running one."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        self._run()
+
+    def mark_dirty(self) -> None:
+        """Flags work as pending without starting the countdown; the next schedule() or flush() runs it."""
+        with self._lock:
+            self._dirty = True
+
+    def cancel(self) -> None:
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._dirty = False
+
+    def _fire(self) -> None:
+        with self._lock:
+            if self._timer is threading.current_thread():
+                self._timer = None
+        self._run()
+
+    def _run(self) -> None:
+        # Serializes callbacks, so flush() returns only once data is on disk
+        with self._run_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                self._dirty = False
+            self.callback()
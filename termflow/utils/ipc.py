@@ -0,0 +1,76 @@
+"""Client side of the `termflow daemon` Unix-socket protocol."""
+
+import json
+import os
+import socket
+import threading
+from pathlib import Path
+from typing import Any, Optional
+
+# How long a client waits for the daemon before giving up, in seconds.
+CLIENT_TIMEOUT = 5.0
+
+
+def get_socket_path() -> Path:
+    """Where the daemon listens: $TERMFLOW_SOCKET, else daemon.sock in the data directory."""
+    override = os.environ.get("TERMFLOW_SOCKET")
+    if override:
+        return Path(override).expanduser()
+    from termflow.utils.resources import get_user_data_file
+    return get_user_data_file("daemon.sock")
+
+
+class DaemonError(Exception):
+    """The daemon answered a request with an error."""
+
+
+class DaemonClient:
+    """
+    One connection to the daemon.
+
+    The protocol is one JSON object per line each way: a request
+    {"op": name, ...arguments} is answered with {"ok": true, "result": ...}
+    or {"ok": false, "error": message}. Requests on one client are
+    serialized, so it can be shared between threads.
+    """
+
+    def __init__(self, path: Optional[Path] = None, timeout: float = CLIENT_TIMEOUT) -> None:
+        self.path = Path(path) if path is not None else get_socket_path()
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        try:
+            self._sock.connect(str(self.path))
+        except OSError:
+            self._sock.close()
+            raise
+        self._reader = self._sock.makefile("rb")
+        self._lock = threading.Lock()
+
+    @classmethod
+    def connect(cls, path: Optional[Path] = None) -> Optional["DaemonClient"]:
+        """A client for the running daemon, or None if there is none."""
+        path = Path(path) if path is not None else get_socket_path()
+        if not path.exists():
+            return None
+        try:
+            return cls(path)
+        except OSError:
+            # a socket left behind by a daemon that did not exit cleanly
+            return None
+
+    def request(self, op: str, **args: Any) -> Any:
+        """Sends one request and returns its result; raises DaemonError on failure."""
+        line = json.dumps({"op": op, **args}, ensure_ascii=False).encode("utf-8") + b"\n"
+        with self._lock:
+            self._sock.sendall(line)
+            reply = self._reader.readline()
+        if not reply:
+            raise DaemonError("daemon closed the connection")
+        response = json.loads(reply)
+        if not response.get("ok"):
+            raise DaemonError(response.get("error", "request failed"))
+        return response.get("result")
+
+    def close(self) -> None:
+        self._reader.close()
+        self._sock.close()
@@ -1,16 +1,262 @@
+"""Reflections for the info panel, drawn without repeats from a quote corpus."""
+
+import hashlib
+import json
+import mmap
+import os
 import random
+import struct
+import sys
+import threading
+from array import array
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from termflow.utils.fileio import atomic_write
+
+# Used when there is no corpus file (or it has no quotes in it)
+BUILTIN_REFLECTIONS = (
+    "Focus on being productive instead of busy.",
+    "Simplicity is the soul of efficiency.",
+    "The secret of getting ahead is getting started.",
+    "Your mind is for having ideas, not holding them.",
+    "We are what we repeatedly do. Excellence is a habit.",
+    "The best way to predict the future is to invent it.",
+    "Science is organized knowledge. Wisdom is organized life.",
+    "Deep work is the superpower of the 21st century.",
+    "The obstacle is the way.",
+    "Stay in the flow.",
+)
+
+# Index file layout: header, then one little-endian uint64 line offset per quote
+INDEX_MAGIC = b"TFQIDX01"
+INDEX_HEADER = struct.Struct("<8sQqQ")  # magic, corpus size, corpus mtime_ns, count
+OFFSET = struct.Struct("<Q")
+# Longest line shown; anything after it is cut
+MAX_QUOTE = 500
+FEISTEL_ROUNDS = 4
+
+
+def default_index_path(corpus_path: Path) -> Path:
+    """Where the index of `corpus_path` is kept: one file per corpus in the user data directory."""
+    from termflow.utils.resources import get_user_data_file
+    key = hashlib.sha1(str(Path(corpus_path).expanduser().resolve()).encode("utf-8")).hexdigest()[:16]
+    return get_user_data_file(f"quotes-{key}.idx")
+
+
+class QuoteCorpus:
+    """
+    A text file of quotes, one per line, read through mmap.
+
+    Line start offsets live in a sidecar index, by default in the app's
+    data directory and named after a hash of the corpus path, since the
+    corpus may sit somewhere read-only. The index is built once by
+    scanning the file and rebuilt only when the file's size or mtime
+    change. Both files are memory-mapped, so opening a corpus and fetching
+    quote `i` cost the same for ten lines or a million, and memory use
+    does not grow with the corpus. Blank lines and lines starting with '#'
+    are not quotes.
+    """
+
+    def __init__(self, path: Path, index_path: Optional[Path] = None) -> None:
+        self.path = Path(path)
+        self.index_path = Path(index_path) if index_path is not None else default_index_path(self.path)
+        self._corpus: Optional[mmap.mmap] = None
+        self._index: Optional[mmap.mmap] = None
+        self.count = 0
+        self.signature: Tuple[int, int] = (0, 0)
+        self._open()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _open(self) -> None:
+        st = os.stat(self.path)
+        self.signature = (st.st_size, st.st_mtime_ns)
+        if st.st_size == 0:
+            return
+        if not self._index_matches():
+            self._build_index()
+        with open(self.path, "rb") as f:
+            self._corpus = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        with open(self.index_path, "rb") as f:
+            self._index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.count = INDEX_HEADER.unpack_from(self._index)[3]
+
+    def _index_matches(self) -> bool:
+        try:
+            with open(self.index_path, "rb") as f:
+                magic, size, mtime_ns, count = INDEX_HEADER.unpack(f.read(INDEX_HEADER.size))
+                expected = INDEX_HEADER.size + count * OFFSET.size
+                return (magic, size, mtime_ns) == (INDEX_MAGIC, *self.signature) and os.fstat(f.fileno()).st_size == expected
+        except (OSError, struct.error):
+            return False
+
+    def _build_index(self) -> None:
+        offsets = array("Q")
+        with open(self.path, "rb") as f:
+            pos = 0
+            for line in f:
+                body = line.strip()
+                if body and not body.startswith(b"#"):
+                    offsets.append(pos)
+                pos += len(line)
+        if sys.byteorder != "little":
+            offsets.byteswap()
+        header = INDEX_HEADER.pack(INDEX_MAGIC, *self.signature, len(offsets))
+        atomic_write(self.index_path, header + offsets.tobytes())
+
+    def line(self, i: int) -> str:
+        """Quote number `i` (0-based)."""
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        start = OFFSET.unpack_from(self._index, INDEX_HEADER.size + i * OFFSET.size)[0]
+        # bounded search, so one enormous line cannot make a draw slow
+        limit = min(start + MAX_QUOTE * 4, len(self._corpus))
+        end = self._corpus.find(b"\n", start, limit)
+        raw = self._corpus[start:end if end != -1 else limit]
+        return raw.decode("utf-8", errors="replace").strip()[:MAX_QUOTE]
+
+    def close(self) -> None:
+        for mapped in (self._corpus, self._index):
+            if mapped is not None:
+                mapped.close()
+        self._corpus = self._index = None
+
+
+def _mix(value: int, key: int) -> int:
+    """64-bit mixing function (splitmix64 finalizer) used as the Feistel round."""
+    z = (value + key + 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & 0xFFFFFFFFFFFFFFFF
+    return z ^ (z >> 31)
+
+
+def permute(position: int, count: int, seed: int) -> int:
+    """
+    Maps `position` in [0, count) to a unique index in [0, count).
+
+    A Feistel network over the next power-of-four domain is a bijection;
+    cycle-walking maps the few values that land outside [0, count) back
+    in. Each seed gives a different shuffle, with O(1) state.
+    """
+    if count <= 1:
+        return 0
+    half = max(1, ((count - 1).bit_length() + 1) // 2)
+    mask = (1 << half) - 1
+    x = position
+    while True:
+        left, right = x >> half, x & mask
+        for round_ in range(FEISTEL_ROUNDS):
+            left, right = right, left ^ (_mix(right, seed + round_) & mask)
+        x = (left << half) | right
+        if x < count:
+            return x
+
+
+class ShuffleBag:
+    """
+    Draws every index of a corpus once before any repeats.
+
+    The bag is a seeded permutation plus a position, so its state is three
+    numbers whatever the corpus size; it is saved after every draw, so the
+    order carries on across restarts. A new corpus (different size or
+    mtime) starts a new bag.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.state: Dict = self._read()
+
+    def _read(self) -> Dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            return {"source": state["source"], "count": int(state["count"]), "seed": int(state["seed"]), "position": int(state["position"])}
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, TypeError, ValueError):
+            return {}
+
+    def _write(self) -> None:
+        try:
+            atomic_write(self.path, json.dumps(self.state).encode("utf-8"))
+        except OSError as e:
+            print(f"Error saving quote bag: {e}")
+
+    def draw(self, source: str, count: int) -> int:
+        state = self.state
+        if state.get("source") != source or state.get("count") != count or state.get("position", count) >= count:
+            state = self.state = {"source": source, "count": count, "seed": random.getrandbits(62), "position": 0}
+        index = permute(state["position"], count, state["seed"])
+        state["position"] += 1
+        self._write()
+        return index
+
+
+class QuoteSource:
+    """The corpus (or the built-in reflections) plus its shuffle bag."""
+
+    def __init__(self, corpus_path: Path, bag_path: Path) -> None:
+        self.corpus_path = Path(corpus_path)
+        self.bag = ShuffleBag(bag_path)
+        self._lock = threading.Lock()
+        self._corpus: Optional[QuoteCorpus] = None
+
+    def _current_corpus(self) -> Optional[QuoteCorpus]:
+        try:
+            st = os.stat(self.corpus_path)
+        except OSError:
+            self._close()
+            return None
+        if self._corpus is None or self._corpus.signature != (st.st_size, st.st_mtime_ns):
+            self._close()
+            try:
+                self._corpus = QuoteCorpus(self.corpus_path)
+            except (OSError, ValueError) as e:
+                print(f"Error reading quotes: {e}")
+                return None
+        return self._corpus
+
+    def _close(self) -> None:
+        if self._corpus is not None:
+            self._corpus.close()
+            self._corpus = None
+
+    def close(self) -> None:
+        with self._lock:
+            self._close()
+
+    def next_quote(self) -> str:
+        with self._lock:
+            corpus = self._current_corpus()
+            if corpus is not None and len(corpus):
+                source = f"{self.corpus_path}:{corpus.signature[0]}:{corpus.signature[1]}"
+                return corpus.line(self.bag.draw(source, len(corpus)))
+            return BUILTIN_REFLECTIONS[self.bag.draw("builtin", len(BUILTIN_REFLECTIONS))]
+
+
+_source: Optional[QuoteSource] = None
+_source_lock = threading.Lock()
+
+
+def get_quote_source() -> QuoteSource:
+    """
+    Returns the process-wide QuoteSource for the configured corpus,
+    replacing it when the `quotes_file` config key names another file.
+    """
+    global _source
+    from termflow.utils.storage import get_config_store
+    corpus_path = get_config_store().quotes_file
+    source = _source
+    if source is None or source.corpus_path != corpus_path:
+        with _source_lock:
+            if _source is None or _source.corpus_path != corpus_path:
+                from termflow.utils.resources import get_user_data_file
+                if _source is not None:
+                    _source.close()
+                _source = QuoteSource(corpus_path, get_user_data_file("quotes.bag.json"))
+            source = _source
+    return source
+
 
 def get_quote():
-    reflections = [
-        "Focus on being productive instead of busy.",
-        "Simplicity is the soul of efficiency.",
-        "The secret of getting ahead is getting started.",
-        "Your mind is for having ideas, not holding them.",
-        "We are what we repeatedly do. Excellence is a habit.",
-        "The best way to predict the future is to invent it.",
-        "Science is organized knowledge. Wisdom is organized life.",
-        "Deep work is the superpower of the 21st century.",
-        "The obstacle is the way.",
-        "Stay in the flow."
-    ]
-    return random.choice(reflections)
+    # May build the corpus index on first use; call it off the event loop
+    return get_quote_source().next_quote()
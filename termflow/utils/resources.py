@@ -1,10 +1,13 @@
 """Resource path resolution using importlib.resources and platformdirs."""
 
+from functools import lru_cache
 from pathlib import Path
-from importlib.resources import files
-import platformdirs
 
+# Lookups below are memoized: the answers cannot change while the app runs,
+# and several of them probe the filesystem (or create directories).
 
+
+@lru_cache(maxsize=None)
 def get_resource_path(filename: str) -> Path:
     """
     Get the absolute path to a packaged resource file (e.g., HELP.md, INFO.md).
@@ -20,6 +23,7 @@ def get_resource_path(filename: str) -> Path:
         Path to the resource file
     """
     # Try importlib.resources for installed packages (files in termflow/data/)
+    from importlib.resources import files
     try:
         resource = files("termflow.data") / filename
         # Verify the resource exists by attempting to read it
@@ -51,6 +55,7 @@ def get_resource_path(filename: str) -> Path:
     return data_dir / filename
 
 
+@lru_cache(maxsize=None)
 def get_ui_resource_path(filename: str) -> Path:
     """
     Get the absolute path to a UI resource file (e.g., styles.tcss).
@@ -64,6 +69,7 @@ def get_ui_resource_path(filename: str) -> Path:
         Path to the resource file in the data package
     """
     # Try importlib.resources for installed packages (files in termflow/data/)
+    from importlib.resources import files
     try:
         resource = files("termflow.data") / filename
         if hasattr(resource, '__fspath__'):
@@ -93,6 +99,7 @@ def get_ui_resource_path(filename: str) -> Path:
     return Path(__file__).parent.parent / "data" / filename
 
 
+@lru_cache(maxsize=None)
 def get_user_data_dir() -> Path:
     """
     Get the platform-appropriate directory for user data (config, todos, etc.).
@@ -102,9 +109,12 @@ def get_user_data_dir() -> Path:
     On macOS: typically ~/Library/Application Support/termflow
     On Linux: typically ~/.local/share/termflow
     
+    Resolved (and created) once per process.
+
     Returns:
         Path object pointing to the user data directory (created if needed)
     """
+    import platformdirs
     data_dir = Path(platformdirs.user_data_dir("termflow", "termflow"))
     data_dir.mkdir(parents=True, exist_ok=True)
     return data_dir
@@ -124,6 +134,7 @@ def get_user_data_file(filename: str) -> Path:
     return data_dir / filename
 
 
+@lru_cache(maxsize=None)
 def get_package_data_dir() -> Path:
     """
     Get the path to the package data directory (for development mode).
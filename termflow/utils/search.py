@@ -0,0 +1,204 @@
+"""Trigram index for searching task text."""
+
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Set, Tuple
+
+# Word-start marker; padding every word with it makes one- and two-character
+# queries answerable from the same trigram table (as word prefixes).
+_PAD = "\x00"
+# Words are runs of letters and digits, so "[dev]" is the word "dev"
+_WORD = re.compile(r"\w+")
+
+
+def _words(text: str) -> List[str]:
+    return _WORD.findall(text.casefold())
+
+
+def _word_grams(word: str) -> Set[str]:
+    padded = _PAD + _PAD + word
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _query_grams(word: str) -> Set[str]:
+    if len(word) >= 3:
+        return {word[i:i + 3] for i in range(len(word) - 2)}
+    # Too short for a real trigram: match it as a word prefix instead
+    return {(_PAD * (3 - len(word))) + word}
+
+
+class TrigramIndex:
+    """
+    An inverted index from trigrams to task IDs.
+
+    Adding or removing a task only touches that task's trigrams, so the
+    index is maintained incrementally. A query counts, per task, how many
+    of its trigrams the task shares (reading only those trigrams' posting
+    lists, never the whole task list) and verifies the best-scoring
+    candidates against the real text.
+
+    Posting lists are dicts used as ordered sets: they keep tasks in the
+    order they were indexed (list order), so the common case, where tasks
+    containing the whole query fill the limit, is answered by walking the
+    rarest posting list from the front without ranking anything.
+    """
+
+    def __init__(self) -> None:
+        self._postings: Dict[str, Dict[str, None]] = {}
+        self._texts: Dict[str, str] = {}
+        # When each task was first indexed: list order, for breaking ties
+        self._order: Dict[str, int] = {}
+        self._next_order = 0
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def __contains__(self, todo_id: str) -> bool:
+        return todo_id in self._texts
+
+    def add(self, todo_id: str, text: str) -> None:
+        order = self._order.get(todo_id)
+        if order is not None:
+            self.remove(todo_id)
+        else:
+            order = self._next_order
+            self._next_order += 1
+        self._order[todo_id] = order
+        folded = text.casefold()
+        self._texts[todo_id] = folded
+        for gram in self._grams(folded):
+            self._postings.setdefault(gram, {})[todo_id] = None
+
+    def update(self, items: Iterable[Tuple[str, str]]) -> None:
+        """Adds many (id, text) pairs."""
+        for todo_id, text in items:
+            self.add(todo_id, text)
+
+    def sync(self, items: Iterable[Tuple[str, str]]) -> None:
+        """Makes the index hold exactly these (id, text) pairs, re-indexing only what changed."""
+        seen: Set[str] = set()
+        for todo_id, text in items:
+            seen.add(todo_id)
+            if self._texts.get(todo_id) != text.casefold():
+                self.add(todo_id, text)
+        for todo_id in [todo_id for todo_id in self._texts if todo_id not in seen]:
+            self.remove(todo_id)
+
+    def remove(self, todo_id: str) -> None:
+        folded = self._texts.pop(todo_id, None)
+        if folded is None:
+            return
+        del self._order[todo_id]
+        for gram in self._grams(folded):
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.pop(todo_id, None)
+                if not posting:
+                    del self._postings[gram]
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._texts.clear()
+        self._order.clear()
+
+    @staticmethod
+    def _grams(folded: str) -> Set[str]:
+        grams: Set[str] = set()
+        for word in _WORD.findall(folded):
+            grams |= _word_grams(word)
+        return grams
+
+    def search(self, query: str, limit: int = 20) -> List[str]:
+        """
+        Returns up to `limit` task IDs, best match first.
+
+        A task matches if each word of `query` occurs in its text, or
+        occurs spelled loosely: as a subsequence of one of its words with
+        the same first letter, so "revew" finds "review" and "tsk" finds
+        "task". Words shorter than three characters must start a word.
+        Matches are ranked by how many of the query's trigrams (word starts
+        included) their text shares, which puts exact matches ahead of loose
+        ones, then by list order. Only tasks sharing a trigram with every
+        query word are looked at.
+        """
+        words = _words(query)
+        if not words:
+            return []
+        per_word = [(word, [self._postings[gram] for gram in _word_grams(word) if gram in self._postings]) for word in words]
+        # A loose match shares at least the word-start trigram; a word too
+        # short for a real trigram must start a word, so it needs all of its
+        if not all(postings and (len(word) >= 3 or len(postings) == len(_word_grams(word)))
+                   for word, postings in per_word):
+            return []
+        order = self._order.__getitem__
+
+        # Tasks sharing every query trigram make up the top rank; when they
+        # alone fill `limit`, nothing else needs counting
+        postings = sorted((posting for _, word in per_word for posting in word), key=len)
+        if len(postings) == sum(len(_word_grams(word)) for word in words):
+            rarest, rest = postings[0], postings[1:]
+            results = []
+            for todo_id in rarest:
+                if all(todo_id in posting for posting in rest) and self._matches(todo_id, words):
+                    results.append(todo_id)
+                    if len(results) >= limit:
+                        return results
+
+        # Candidates, starting from the word that allows the fewest tasks
+        # (short words: their smallest posting list; others: the union of
+        # theirs); filter() keeps each membership test at C speed
+        def allowed(item):
+            word, postings = item
+            return min(map(len, postings)) if len(word) < 3 else sum(map(len, postings))
+
+        per_word.sort(key=allowed)
+        candidates = None
+        for word, postings in per_word:
+            if len(word) < 3:
+                postings = sorted(postings, key=len)
+                shared = set(postings[0] if candidates is None else candidates)
+                for posting in postings:
+                    shared = set(filter(posting.__contains__, shared))
+            elif candidates is None:
+                shared = set().union(*postings)
+            else:
+                shared = set()
+                for posting in postings:
+                    shared.update(filter(posting.__contains__, candidates))
+            candidates = shared
+        counts: Counter = Counter()
+        for _, postings in per_word:
+            for posting in postings:
+                counts.update(filter(posting.__contains__, candidates))
+        # Two stable sorts with C-level keys: by count, ties in list order
+        ranked = sorted(candidates, key=order)
+        ranked.sort(key=counts.__getitem__, reverse=True)
+        # Verified best-first, stopping once `limit` are confirmed
+        results = []
+        for todo_id in ranked:
+            if self._matches(todo_id, words):
+                results.append(todo_id)
+                if len(results) >= limit:
+                    break
+        return results
+
+    def _matches(self, todo_id: str, words: List[str]) -> bool:
+        folded = self._texts[todo_id]
+        return all(self._resembles(folded, word) for word in words)
+
+    @staticmethod
+    def _contains(folded: str, word: str) -> bool:
+        if len(word) >= 3:
+            return word in folded
+        return any(w.startswith(word) for w in _WORD.findall(folded))
+
+    @classmethod
+    def _resembles(cls, folded: str, word: str) -> bool:
+        if len(word) < 3 or word in folded:
+            return cls._contains(folded, word)
+        return any(w[0] == word[0] and _is_subsequence(word, w) for w in _WORD.findall(folded))
+
+
+def _is_subsequence(short: str, long: str) -> bool:
+    chars = iter(long)
+    return all(c in chars for c in short)
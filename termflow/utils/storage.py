@@ -1,58 +1,247 @@
-import json
+import atexit
+import threading
 from pathlib import Path
-from termflow.utils.resources import get_user_data_dir
-
-# Get user data directory
-DATA_DIR = get_user_data_dir()
-
-TODO_FILE = DATA_DIR / "todos.json"
-CONFIG_FILE = DATA_DIR / "config.toml"
-REFLECTIONS_FILE = DATA_DIR / "reflections.json"
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+import tomli_w
+from termflow.utils.fileio import DebouncedFlush, atomic_write
+from termflow.utils.resources import get_user_data_file
+from termflow.utils.todos import get_todo_store
+from termflow.utils.watch import FileSignature, file_signature
 
+try:
+    import tomllib
+except ModuleNotFoundError:  # Python 3.10
+    import tomli as tomllib
 
 def load_todos():
-    if not TODO_FILE.exists():
-        return []
-    try:
-        with open(TODO_FILE, "r") as f:
-            return json.load(f)
-    except:
-        return []
+    store = get_todo_store()
+    store.reload_if_changed()
+    return store.todos()
 
 
 def save_todos(todos):
-    with open(TODO_FILE, "w") as f:
-        json.dump(todos, f)
+    get_todo_store().replace(todos)
+
+
+DEFAULT_CONFIG: Dict[str, Any] = {"pomodoro_duration": 25, "pomodoro_sessions_completed": 0}
+
+# How long the config store waits after the last change before writing.
+CONFIG_FLUSH_DELAY = 0.3
+
+ConfigListener = Callable[[str, Any], None]
+
+
+class ConfigStore:
+    """
+    Holds config.toml in memory.
+
+    The file is parsed once; reads go through `get` or the typed properties.
+    `set`/`update` change the in-memory copy, notify subscribers and schedule
+    a debounced atomic write, so a burst of toggles ends up as one write.
+    `reload_if_changed` picks up edits made outside the app.
+    """
+
+    def __init__(self, path: Optional[Path] = None, delay: float = CONFIG_FLUSH_DELAY) -> None:
+        self.path = Path(path) if path is not None else get_user_data_file("config.toml")
+        self._lock = threading.RLock()
+        self._io_lock = threading.Lock()
+        self._signature: Optional[FileSignature] = None
+        # Keys changed in memory but not written yet; they win over a reload
+        self._dirty: Set[str] = set()
+        self._data: Dict[str, Any] = self._read()
+        self._flusher = DebouncedFlush(self._write, delay)
+        self._listeners: List[Tuple[Optional[frozenset], ConfigListener]] = []
+
+    def _read(self) -> Dict[str, Any]:
+        try:
+            return self._parse()
+        except (tomllib.TOMLDecodeError, OSError) as e:
+            print(f"Error reading config: {e}")
+            return dict(DEFAULT_CONFIG)
+
+    def _parse(self) -> Dict[str, Any]:
+        data = dict(DEFAULT_CONFIG)
+        self._signature = file_signature(self.path)
+        try:
+            with open(self.path, "rb") as f:
+                data.update(tomllib.load(f))
+        except FileNotFoundError:
+            pass
+        return data
+
+    def _write(self) -> None:
+        with self._io_lock:
+            with self._lock:
+                payload = tomli_w.dumps(self._data)
+                dirty, self._dirty = self._dirty, set()
+            try:
+                atomic_write(self.path, payload.encode("utf-8"))
+            except OSError as e:
+                print(f"Error saving config: {e}")
+                # Keep the unsaved keys winning over reloads and try again later
+                with self._lock:
+                    self._dirty |= dirty
+                self._flusher.schedule()
+                return
+            self._signature = file_signature(self.path)
+
+    def reload_if_changed(self) -> bool:
+        """
+        Re-reads config.toml if it changed on disk since the last read or
+        write, and notifies subscribers of the keys whose values changed.
+        Costs one stat when nothing changed.
+        """
+        with self._io_lock:
+            if file_signature(self.path) == self._signature:
+                return False
+            try:
+                data = self._parse()
+            except (tomllib.TOMLDecodeError, OSError) as e:
+                # Probably caught mid-save; keep the current values
+                print(f"Error reading config: {e}")
+                return False
+            with self._lock:
+                for key in self._dirty:
+                    data[key] = self._data[key]
+                changed = {k: v for k, v in data.items() if self._data.get(k, object()) != v}
+                self._data = data
+        if changed:
+            self._notify(changed)
+        return True
+
+    def subscribe(self, listener: ConfigListener, keys: Optional[Iterable[str]] = None) -> None:
+        """
+        Calls `listener(key, value)` whenever a key changes.
+
+        Args:
+            listener: Callback receiving the changed key and its new value
+            keys: Only notify for these keys (all keys when omitted)
+        """
+        self._listeners.append((frozenset(keys) if keys is not None else None, listener))
+
+    def unsubscribe(self, listener: ConfigListener) -> None:
+        self._listeners = [(k, l) for k, l in self._listeners if l != listener]
+
+    def _notify(self, changed: Dict[str, Any]) -> None:
+        for keys, listener in list(self._listeners):
+            for key, value in changed.items():
+                if keys is None or key in keys:
+                    listener(key, value)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._data.get(key, default)
+
+    def data(self) -> Dict[str, Any]:
+        """Returns a copy of the whole config."""
+        with self._lock:
+            return dict(self._data)
+
+    def set(self, key: str, value: Any) -> None:
+        self.update({key: value})
+
+    def update(self, values: Dict[str, Any]) -> None:
+        """Applies several keys at once; unchanged values are ignored."""
+        with self._lock:
+            changed = {k: v for k, v in values.items() if self._data.get(k, object()) != v}
+            self._data.update(changed)
+            self._dirty.update(changed)
+        if changed:
+            self._flusher.schedule()
+            self._notify(changed)
+
+    def flush(self) -> None:
+        """Writes pending changes to disk right away."""
+        self._flusher.flush()
+
+    @property
+    def pomodoro_duration(self) -> int:
+        """Pomodoro length in minutes."""
+        return int(self._data.get("pomodoro_duration", 25))
+
+    @property
+    def pomodoro_sessions_completed(self) -> int:
+        return int(self._data.get("pomodoro_sessions_completed", 0))
+
+    def increment_pomodoro_session(self) -> int:
+        with self._lock:
+            sessions = self.pomodoro_sessions_completed + 1
+        self.set("pomodoro_sessions_completed", sessions)
+        return sessions
+
+    @property
+    def theme(self) -> Optional[str]:
+        return self._data.get("theme")
+
+    @property
+    def buddy_enabled(self) -> bool:
+        return bool(self._data.get("buddy_enabled", False))
+
+    @property
+    def buddy_motion(self) -> bool:
+        return bool(self._data.get("buddy_motion", True))
+
+    @property
+    def buddy_anim_mode(self) -> str:
+        return str(self._data.get("buddy_anim_mode", "IDLE_ACTIVE"))
+
+    @property
+    def buddy_position(self) -> str:
+        return str(self._data.get("buddy_position", "left"))
+
+    @property
+    def pomo_visible(self) -> bool:
+        return bool(self._data.get("pomo_visible", True))
+
+    @property
+    def reflection_visible(self) -> bool:
+        return bool(self._data.get("reflection_visible", True))
+
+    @property
+    def city(self) -> str:
+        """City the info panel shows the weather for ("" turns weather off)."""
+        return str(self._data.get("city", ""))
+
+    @property
+    def weather_url(self) -> str:
+        from termflow.utils.weather import DEFAULT_WEATHER_URL
+        return str(self._data.get("weather_url", DEFAULT_WEATHER_URL))
+
+    @property
+    def quotes_file(self) -> Path:
+        """Quote corpus for the reflection panel, one quote per line."""
+        value = self._data.get("quotes_file")
+        return Path(value).expanduser() if value else get_user_data_file("reflections.txt")
+
+    @property
+    def storage_backend(self) -> str:
+        """Where tasks are kept: "json" (todos.json) or "sqlite" (todos.db)."""
+        return str(self._data.get("storage_backend", "json"))
+
+
+_config_store: Optional[ConfigStore] = None
+_config_lock = threading.Lock()
+
+
+def get_config_store() -> ConfigStore:
+    """Returns the process-wide ConfigStore, parsing config.toml on first use."""
+    global _config_store
+    if _config_store is None:
+        with _config_lock:
+            if _config_store is None:
+                _config_store = ConfigStore()
+                atexit.register(_config_store.flush)
+    return _config_store
 
 
 def load_config():
-    if not CONFIG_FILE.exists():
-        return {"pomodoro_duration": 25, "pomodoro_sessions_completed": 0}
-    try:
-        import tomllib
-        with open(CONFIG_FILE, "rb") as f:
-            return tomllib.load(f)
-    except:
-        return {"pomodoro_duration": 25, "pomodoro_sessions_completed": 0}
+    store = get_config_store()
+    store.reload_if_changed()
+    return store.data()
 
 
 def save_config(config):
-    try:
-        import tomli_w
-        with open(CONFIG_FILE, "wb") as f:
-            tomli_w.dump(config, f)
-    except:
-        pass
+    get_config_store().update(config)
 
 
 def increment_pomodoro_session():
-    config = load_config()
-    sessions = config.get("pomodoro_sessions_completed", 0) + 1
-    config["pomodoro_sessions_completed"] = sessions
-    try:
-        import tomli_w
-        with open(CONFIG_FILE, "wb") as f:
-            tomli_w.dump(config, f)
-    except:
-        pass
-    return sessions
+    return get_config_store().increment_pomodoro_session()
@@ -1,72 +1,781 @@
-import json
+import atexit
+import bisect
+import re
+import threading
+from collections.abc import Sequence
 from pathlib import Path
-from typing import List, Dict
-from termflow.utils.resources import get_user_data_file
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from termflow.utils.backends import (
+    COMPACT_THRESHOLD,
+    DaemonBackend,
+    JsonBackend,
+    TodoBackend,
+    make_backend,
+    new_todo_id,
+    normalize_todo,
+)
+from termflow.utils.fileio import DebouncedFlush
+from termflow.utils.resources import get_user_data_dir, get_user_data_file
+from termflow.utils.search import TrigramIndex
+from termflow.utils.undo import UNDO_LIMIT, UndoEntry, UndoHistory
 
+# How long the store waits after the last change before writing to disk.
+FLUSH_DELAY = 0.5
 
-def load_todos() -> List[Dict]:
-    """Loads todos from the user's data directory."""
-    todo_file = get_user_data_file("todos.json")
-    
-    if not todo_file.exists():
-        return []
-    
+TAG_PATTERN = re.compile(r"\[([A-Za-z0-9_-]+)\]")
+
+
+def parse_tags(text: str) -> Tuple[str, ...]:
+    """Returns the [tag] markers in `text`, lowercased, in order of appearance."""
+    if "[" not in text:
+        return ()
+    tags = TAG_PATTERN.findall(text)
+    if len(tags) < 2:
+        return (tags[0].lower(),) if tags else ()
+    return tuple(dict.fromkeys(tag.lower() for tag in tags))
+
+
+class OrderedIdSet:
+    """
+    Task IDs kept sorted by list position.
+
+    Positions are tracked as monotonically increasing sequence numbers, so
+    the head is a plain index, lookups are a binary search and the set
+    never needs a rescan of the todo list.
+    """
+
+    def __init__(self) -> None:
+        self._keys: List[tuple] = []
+
+    @classmethod
+    def from_sorted(cls, keys: List[tuple]) -> "OrderedIdSet":
+        """Builds a set from (seq, id) keys already in order, without re-sorting."""
+        ids = cls()
+        ids._keys = keys
+        return ids
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def clear(self) -> None:
+        self._keys = []
+
+    def add(self, seq: int, todo_id: str) -> None:
+        key = (seq, todo_id)
+        i = bisect.bisect_left(self._keys, key)
+        if i == len(self._keys) or self._keys[i] != key:
+            self._keys.insert(i, key)
+
+    def discard(self, seq: int, todo_id: str) -> None:
+        key = (seq, todo_id)
+        i = bisect.bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            del self._keys[i]
+
+    def __getitem__(self, i: int) -> str:
+        """The ID at position `i`."""
+        return self._keys[i][1]
+
+    def position(self, seq: float, todo_id: str) -> int:
+        """Where (seq, todo_id) sits in the set, or -1."""
+        key = (seq, todo_id)
+        i = bisect.bisect_left(self._keys, key)
+        return i if i < len(self._keys) and self._keys[i] == key else -1
+
+    def head(self, n: int = 1) -> List[str]:
+        """Returns the first `n` IDs."""
+        return [todo_id for _, todo_id in self._keys[:n]]
+
+    def ids(self) -> List[str]:
+        return [todo_id for _, todo_id in self._keys]
+
+
+class TodoRows(Sequence):
+    """
+    A live, read-only view of the store's tasks in list order: all of them,
+    or only those carrying `tag`. Reads go straight to the store, so the
+    UI can hold one instead of copying the list after every change.
+    Slicing is not supported.
+    """
+
+    def __init__(self, store: "TodoStore", tag: Optional[str] = None) -> None:
+        self.store = store
+        self.tag = tag
+
+    def _ids(self) -> OrderedIdSet:
+        return self.store._tagged.get(self.tag) or OrderedIdSet()
+
+    def __len__(self) -> int:
+        return len(self.store) if self.tag is None else len(self._ids())
+
+    def __getitem__(self, index: int) -> Dict:
+        if self.tag is None:
+            return self.store[index]
+        return self.store._index[self._ids()[index]]
+
+    def index_of(self, todo_id: str) -> int:
+        """Returns the row showing `todo_id`, or -1."""
+        return self.store.index_of(todo_id, self.tag)
+
+
+class TodoStore:
+    """
+    Owns the todo list in memory.
+
+    The backend (see termflow.utils.backends) is read once when the store
+    is created; every read after that is served from memory. Each mutation
+    is queued as one journal record and a debounced background flush hands
+    the queued records to the backend, so the cost of a change does not
+    depend on the size of the list. Call `flush()` before exiting to
+    persist pending changes.
+
+    Every task carries a persistent random ID, and an ID -> record index
+    makes lookups, toggles and deletes independent of list position.
+    Ordered ID sets of unfinished tasks, and of every task per [tag], are
+    updated alongside each change, so "next task", tag views and tag counts
+    never scan the list.
+
+    `add`, `set_done`/`toggle` and `delete` remember how to reverse
+    themselves in a bounded UndoHistory (`undo()`/`redo()`). Changes that
+    come from elsewhere (reloads, other clients of the daemon, imports) are
+    not undoable, and `replace` forgets the history.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        delay: float = FLUSH_DELAY,
+        compact_threshold: int = COMPACT_THRESHOLD,
+        backend: Optional[TodoBackend] = None,
+        undo_limit: int = UNDO_LIMIT,
+    ) -> None:
+        if backend is None:
+            path = Path(path) if path is not None else get_user_data_file("todos.json")
+            backend = JsonBackend(path, compact_threshold)
+        self.backend = backend
+        self._lock = threading.RLock()
+        self._io_lock = threading.Lock()
+        self._pending: List[Dict] = []
+        self._needs_rewrite = False
+        self._disk_signature: tuple = ()
+        self._index: Dict[str, Dict] = {}
+        self._seq: Dict[str, int] = {}
+        # _seq of each task in list order (sorted): ID -> position by bisection
+        self._seqs: List[float] = []
+        self._next_seq = 0
+        self.pending = OrderedIdSet()
+        self._tags_of: Dict[str, Tuple[str, ...]] = {}
+        self._tagged: Dict[str, OrderedIdSet] = {}
+        self._tagged_pending: Dict[str, OrderedIdSet] = {}
+        # Built on first search, then kept up to date by add/delete
+        self._search: Optional[TrigramIndex] = None
+        self.history = UndoHistory(undo_limit)
+        self._todos: List[Dict] = self._read()
+        self._flusher = DebouncedFlush(self._write, delay)
+        self._listeners: List[Callable[[], None]] = []
+        self._save_assigned_ids()
+
+    def _read(self) -> List[Dict]:
+        # Taken before loading, so an edit racing the load is still noticed
+        self._disk_signature = self.backend.signature()
+        try:
+            todos = self.backend.load()
+        except Exception as e:
+            if self._fall_back(e):
+                return self._read()
+            print(f"Error loading todos: {e}")
+            todos = []
+        return self._adopt(todos)
+
+    def _fall_back(self, error: Exception) -> bool:
+        """
+        Swaps a backend that went away (a stopped daemon) for its fallback;
+        True if it did. Once loaded, memory is the best copy there is (the
+        daemon may have died before writing our last edits), so the
+        fallback is then rewritten from it.
+        """
+        replacement = self.backend.fallback()
+        if replacement is None:
+            return False
+        print(f"Lost the todo backend ({error}); using {replacement.name} files directly")
+        self.backend.close()
+        self.backend = replacement
+        with self._lock:
+            self._needs_rewrite = True
+        return True
+
+    def _save_assigned_ids(self) -> None:
+        """Schedules a rewrite if loading had to invent task IDs (legacy or duplicated)."""
+        if self._needs_rewrite or self.backend.assigned_ids:
+            self._needs_rewrite = True
+            self._flusher.schedule()
+
+    def _adopt(self, todos: List[Dict]) -> List[Dict]:
+        self._todos = todos
+        self._rebuild_index()
+        self._rebuild_views()
+        return self._todos
+
+    def _rebuild_index(self) -> None:
+        self._index = {}
+        for todo in self._todos:
+            while todo["id"] in self._index:
+                # Duplicated by a hand edit or a merge; keep both tasks
+                todo["id"] = new_todo_id()
+                self._needs_rewrite = True
+            self._index[todo["id"]] = todo
+
+    def _sync_search(self) -> None:
+        # After the list was swapped wholesale: re-index only the tasks that
+        # changed, instead of dropping the index and rebuilding it on the UI
+        # thread at the next search
+        if self._search is not None:
+            self._search.sync((todo["id"], todo["text"]) for todo in self._todos)
+
+    def _rebuild_views(self) -> None:
+        # Same result as calling _track() on every task, but sequence numbers
+        # only grow here, so the ordered sets are built by appending
+        self._seq = {}
+        self._tags_of = {}
+        pending: List[tuple] = []
+        tagged: Dict[str, List[tuple]] = {}
+        tagged_pending: Dict[str, List[tuple]] = {}
+        for seq, todo in enumerate(self._todos):
+            todo_id = todo["id"]
+            key = (seq, todo_id)
+            self._seq[todo_id] = seq
+            tags = self._tags_of[todo_id] = parse_tags(todo["text"])
+            for tag in tags:
+                tagged.setdefault(tag, []).append(key)
+            if not todo["done"]:
+                pending.append(key)
+                for tag in tags:
+                    tagged_pending.setdefault(tag, []).append(key)
+        self._next_seq = len(self._todos)
+        self._seqs = list(range(len(self._todos)))
+        self.pending = OrderedIdSet.from_sorted(pending)
+        self._tagged = {tag: OrderedIdSet.from_sorted(keys) for tag, keys in tagged.items()}
+        self._tagged_pending = {tag: OrderedIdSet.from_sorted(keys) for tag, keys in tagged_pending.items()}
+
+    def _track(self, todo: Dict, seq: Optional[float] = None) -> None:
+        """Adds a task to the ordered views (at the end of the list, unless `seq` says where)."""
+        todo_id = todo["id"]
+        if seq is None:
+            seq = self._next_seq
+            self._next_seq += 1
+        self._seq[todo_id] = seq
+        tags = self._tags_of[todo_id] = parse_tags(todo["text"])
+        for tag in tags:
+            self._tagged.setdefault(tag, OrderedIdSet()).add(seq, todo_id)
+        if not todo["done"]:
+            self._set_pending(todo_id, True)
+
+    def _untrack(self, todo: Dict) -> None:
+        todo_id = todo["id"]
+        if not todo["done"]:
+            self._set_pending(todo_id, False)
+        seq = self._seq.pop(todo_id)
+        for tag in self._tags_of.pop(todo_id, ()):
+            tagged = self._tagged[tag]
+            tagged.discard(seq, todo_id)
+            if not tagged:
+                del self._tagged[tag]
+                self._tagged_pending.pop(tag, None)
+
+    def _set_pending(self, todo_id: str, pending: bool) -> None:
+        seq = self._seq[todo_id]
+        queues = [self.pending]
+        for tag in self._tags_of.get(todo_id, ()):
+            queues.append(self._tagged_pending.setdefault(tag, OrderedIdSet()))
+        for queue in queues:
+            if pending:
+                queue.add(seq, todo_id)
+            else:
+                queue.discard(seq, todo_id)
+
+    def _write(self) -> None:
+        with self._io_lock:
+            while True:
+                with self._lock:
+                    ops, self._pending = self._pending, []
+                    rewrite = self._needs_rewrite or self.backend.needs_rewrite
+                    self._needs_rewrite = False
+                    # Copy under the lock, serialize outside it so the UI never waits
+                    records = [dict(todo) for todo in self._todos] if rewrite else None
+                try:
+                    if records is not None:
+                        self.backend.rewrite(records)
+                    elif ops:
+                        self.backend.append(ops)
+                    # Our own write is not an external edit
+                    self._disk_signature = self.backend.signature()
+                    return
+                except Exception as e:
+                    # Keep the edits: they go out with the next flush (a failed
+                    # rewrite is retried whole, failed records ahead of newer ones)
+                    with self._lock:
+                        if records is not None:
+                            self._needs_rewrite = True
+                        else:
+                            self._pending[:0] = ops
+                    if self._fall_back(e):
+                        # retry right away: this may be the flush before exit
+                        continue
+                    print(f"Error saving todos: {e}")
+                    self._flusher.mark_dirty()
+                    return
+
+    def reload_if_changed(self) -> bool:
+        """
+        Reloads from the backend if its files were changed by someone else
+        (a script, another terminal) since the last load or write, and
+        notifies subscribers. Changes not yet flushed are re-applied on top.
+        Costs one stat per backend file when nothing changed.
+        """
+        with self._io_lock:
+            try:
+                signature = self.backend.signature()
+            except Exception as e:
+                if self._fall_back(e):
+                    self._flusher.schedule()
+                    return False
+                raise
+            if signature == self._disk_signature:
+                return False
+            self._disk_signature = signature
+            try:
+                todos = self.backend.load()
+            except Exception as e:
+                # Most likely caught mid-write by a non-atomic editor; keep
+                # what we have; the next change to the file triggers a retry
+                print(f"Error reloading todos: {e}")
+                return False
+            with self._lock:
+                ops = list(self._pending)
+                self._adopt(todos)
+                for op in ops:
+                    self._reapply(op)
+                self._sync_search()
+            self._save_assigned_ids()
+        self._notify()
+        return True
+
+    def _reapply(self, op: Dict) -> None:
+        """Applies a not-yet-flushed journal record to a freshly loaded list."""
+        kind, todo_id = op.get("op"), op.get("id")
+        todo = self._index.get(todo_id)
+        if kind == "add" and todo is None:
+            self._insert(normalize_todo(op), op.get("at"))
+        elif kind == "set" and todo is not None and todo["done"] != op["done"]:
+            todo["done"] = op["done"]
+            self._set_pending(todo_id, not op["done"])
+        elif kind == "del" and todo is not None:
+            self._remove(todo_id)
+
+    def _insert(self, todo: Dict, position: Optional[int] = None) -> int:
+        """Puts `todo` into the list at `position` (the end for None); returns where it went."""
+        todo_id = todo["id"]
+        end = len(self._todos)
+        position = end if position is None else max(0, min(position, end))
+        self._todos.insert(position, todo)
+        self._index[todo_id] = todo
+        if position == end:
+            self._track(todo)
+            self._seqs.append(self._seq[todo_id])
+        else:
+            # a sequence number between the neighbours keeps the ordered views valid
+            after = self._seq[self._todos[position + 1]["id"]]
+            before = self._seq[self._todos[position - 1]["id"]] if position else after - 1
+            seq = (before + after) / 2
+            if before < seq < after:
+                self._track(todo, seq)
+                self._seqs.insert(position, seq)
+            else:
+                # out of float precision between the two; renumber everything
+                self._rebuild_views()
+        if self._search is not None:
+            self._search.add(todo_id, todo["text"])
+        return position
+
+    def _remove(self, todo_id: str) -> Tuple[int, Dict]:
+        """Takes `todo_id` out of the list; returns (its former position, the task)."""
+        position = self._position(todo_id)
+        todo = self._index.pop(todo_id)
+        del self._todos[position]
+        del self._seqs[position]
+        self._untrack(todo)
+        if self._search is not None:
+            self._search.remove(todo_id)
+        return position, todo
+
+    def apply(self, ops: List[Dict]) -> None:
+        """
+        Applies journal records made by another TodoStore (a client of the
+        daemon) and journals them here, keeping their task IDs.
+        """
+        with self._lock:
+            for op in ops:
+                # _insert and _remove keep the search index current
+                self._reapply(op)
+                self._pending.append(op)
+        self._changed()
+
+    def _record(self, op: Dict) -> None:
+        with self._lock:
+            self._pending.append(op)
+        self._changed()
+
+    def _changed(self) -> None:
+        self._flusher.schedule()
+        self._notify()
+
+    def _notify(self) -> None:
+        for listener in list(self._listeners):
+            listener()
+
+    def subscribe(self, listener: Callable[[], None]) -> None:
+        """Registers a callback invoked after every mutation."""
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[], None]) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def __len__(self) -> int:
+        return len(self._todos)
+
+    def __getitem__(self, index: int) -> Dict:
+        return self._todos[index]
+
+    def __contains__(self, todo_id: str) -> bool:
+        return todo_id in self._index
+
+    def todos(self) -> List[Dict]:
+        """Returns a shallow copy of the list."""
+        with self._lock:
+            return list(self._todos)
+
+    def get(self, todo_id: str) -> Optional[Dict]:
+        """Returns the task with `todo_id`, or None."""
+        return self._index.get(todo_id)
+
+    def index_of(self, todo_id: str, tag: Optional[str] = None) -> int:
+        """Returns the list position of `todo_id` (among the tasks with `tag`, if given), or -1."""
+        todo = self._index.get(todo_id)
+        if todo is None:
+            return -1
+        with self._lock:
+            if tag is not None:
+                ids = self._tagged.get(tag)
+                return ids.position(self._seq[todo_id], todo_id) if ids else -1
+            return self._position(todo_id)
+
+    def _position(self, todo_id: str) -> int:
+        # Sequence numbers grow along the list, so a binary search finds the
+        # task without scanning for it
+        seq = self._seq[todo_id]
+        i = bisect.bisect_left(self._seqs, seq)
+        return i if i < len(self._seqs) and self._seqs[i] == seq else -1
+
+    def rows(self, tag: Optional[str] = None) -> TodoRows:
+        """A live view of the list (or of the tasks with `tag`) for display."""
+        return TodoRows(self, tag)
+
+    def _pending_queue(self, tag: Optional[str]) -> OrderedIdSet:
+        if tag is None:
+            return self.pending
+        return self._tagged_pending.get(tag) or OrderedIdSet()
+
+    def next_pending(self, tag: Optional[str] = None) -> Optional[Dict]:
+        """Returns the first unfinished task (with `tag`, if given), or None."""
+        head = self._pending_queue(tag).head(1)
+        return self._index[head[0]] if head else None
+
+    def pending_head(self, n: int, tag: Optional[str] = None) -> List[Dict]:
+        """Returns up to `n` unfinished tasks (with `tag`, if given) in list order."""
+        with self._lock:
+            return [self._index[todo_id] for todo_id in self._pending_queue(tag).head(n)]
+
+    def tags_of(self, todo_id: str) -> Tuple[str, ...]:
+        return self._tags_of.get(todo_id, ())
+
+    def tags(self) -> List[str]:
+        """Returns all tags in use, sorted by name."""
+        return sorted(self._tagged)
+
+    def tag_counts(self) -> Dict[str, Tuple[int, int]]:
+        """Returns {tag: (total, pending)} read straight from the tag sets."""
+        with self._lock:
+            return {
+                tag: (len(ids), len(self._tagged_pending.get(tag, ())))
+                for tag, ids in sorted(self._tagged.items())
+            }
+
+    def tagged(self, tag: str) -> List[Dict]:
+        """Returns the tasks carrying `tag`, in list order."""
+        with self._lock:
+            ids = self._tagged.get(tag)
+            return [self._index[todo_id] for todo_id in ids.ids()] if ids else []
+
+    def search_index(self) -> TrigramIndex:
+        """Returns the text index, building it on first use."""
+        with self._lock:
+            if self._search is None:
+                index = TrigramIndex()
+                index.update((todo["id"], todo["text"]) for todo in self._todos)
+                self._search = index
+            return self._search
+
+    def search(self, query: str, limit: int = 20) -> List[Dict]:
+        """Returns up to `limit` tasks whose text matches `query`."""
+        with self._lock:
+            ids = self.search_index().search(query, limit)
+            return [self._index[todo_id] for todo_id in ids]
+
+    def add(self, text: str) -> Dict:
+        with self._lock:
+            todo_id = new_todo_id()
+            while todo_id in self._index:
+                todo_id = new_todo_id()
+            todo = {"id": todo_id, "text": text, "done": False}
+            self._insert(todo)
+            self.history.record(UndoEntry("del", todo_id))
+        self._record({"op": "add", "id": todo_id, "text": text})
+        return todo
+
+    def add_many(self, records: Iterable[Dict]) -> Tuple[int, int]:
+        """
+        Appends tasks from `records` in one change.
+
+        Records keep their IDs; those already in the list are skipped, so
+        importing an export twice does not duplicate it. All records are
+        read before the list changes: if `records` raises, nothing is
+        added. The ordered views are rebuilt once at the end rather than
+        updated per task, and the backend is rewritten on the next flush
+        instead of journaling every task. Returns (added, skipped).
+        """
+        new: Dict[str, Dict] = {}
+        skipped = 0
+        for record in records:
+            todo = normalize_todo(record)
+            if todo["id"] in new:
+                skipped += 1
+            else:
+                new[todo["id"]] = todo
+        with self._lock:
+            added = 0
+            for todo_id, todo in new.items():
+                if todo_id in self._index:
+                    skipped += 1
+                    continue
+                self._todos.append(todo)
+                self._index[todo_id] = todo
+                if self._search is not None:
+                    self._search.add(todo_id, todo["text"])
+                added += 1
+            if added:
+                self._rebuild_views()
+                self._needs_rewrite = True
+        if added:
+            self._changed()
+        return added, skipped
+
+    def toggle(self, todo_id: str) -> Optional[Dict]:
+        todo = self._index.get(todo_id)
+        if todo is None:
+            return None
+        return self.set_done(todo_id, not todo["done"])
+
+    def set_done(self, todo_id: str, done: bool = True) -> Optional[Dict]:
+        with self._lock:
+            todo = self._index.get(todo_id)
+            if todo is None:
+                return None
+            if todo["done"] == done:
+                return todo
+            todo["done"] = done
+            self._set_pending(todo_id, not done)
+            self.history.record(UndoEntry("set", todo_id, done=not done))
+        # Journal the resulting state rather than "toggle" so records stay idempotent
+        self._record({"op": "set", "id": todo_id, "done": done})
+        return todo
+
+    def delete(self, todo_id: str) -> Optional[Dict]:
+        with self._lock:
+            if todo_id not in self._index:
+                return None
+            position, todo = self._remove(todo_id)
+            self.history.record(UndoEntry("ins", todo_id, position, dict(todo)))
+        self._record({"op": "del", "id": todo_id})
+        return todo
+
+    def _revert(self, entry: UndoEntry) -> Optional[Tuple[UndoEntry, Dict, Dict]]:
+        """
+        Applies `entry`; returns (the entry that reverses it, the task, the
+        journal record), or None if the task it refers to has since been
+        changed elsewhere (deleted, or re-added by a reload).
+        """
+        todo = self._index.get(entry.todo_id)
+        if entry.kind == "del" and todo is not None:
+            position, todo = self._remove(entry.todo_id)
+            return UndoEntry("ins", entry.todo_id, position, dict(todo)), todo, {"op": "del", "id": entry.todo_id}
+        if entry.kind == "ins" and todo is None:
+            todo = normalize_todo(entry.record)
+            position = self._insert(todo, entry.position)
+            op = {"op": "add", "id": todo["id"], "text": todo["text"], "done": todo["done"], "at": position}
+            return UndoEntry("del", entry.todo_id), todo, op
+        if entry.kind == "set" and todo is not None:
+            previous = todo["done"]
+            todo["done"] = entry.done
+            if previous != entry.done:
+                self._set_pending(entry.todo_id, not entry.done)
+            return UndoEntry("set", entry.todo_id, done=previous), todo, {"op": "set", "id": entry.todo_id, "done": entry.done}
+        return None
+
+    def undo(self) -> Optional[Dict]:
+        """Reverses the last add, toggle or delete; returns the task it touched, or None."""
+        with self._lock:
+            while True:
+                entry = self.history.pop_undo()
+                if entry is None:
+                    return None
+                result = self._revert(entry)
+                if result is not None:
+                    break
+            inverse, todo, op = result
+            self.history.push_redo(inverse)
+        self._record(op)
+        return todo
+
+    def redo(self) -> Optional[Dict]:
+        """Repeats the last undone change; returns the task it touched, or None."""
+        with self._lock:
+            while True:
+                entry = self.history.pop_redo()
+                if entry is None:
+                    return None
+                result = self._revert(entry)
+                if result is not None:
+                    break
+            inverse, todo, op = result
+            self.history.push_undo(inverse)
+        self._record(op)
+        return todo
+
+    def replace(self, todos: List[Dict]) -> None:
+        """Replaces the whole list (used by the legacy save_todos API)."""
+        with self._lock:
+            self._todos = [normalize_todo(t) for t in todos if isinstance(t, dict)]
+            self._rebuild_index()
+            self._rebuild_views()
+            self._sync_search()
+            self._pending = []
+            self._needs_rewrite = True
+            self.history.clear()
+        self._changed()
+
+    def flush(self) -> None:
+        """Writes pending changes to disk right away."""
+        self._flusher.flush()
+
+    def compact(self) -> None:
+        """Rewrites the backend from memory now (folds the JSON journal)."""
+        with self._lock:
+            self._needs_rewrite = True
+        self._flusher.schedule()
+        self._flusher.flush()
+
+    def close(self) -> None:
+        """
+        Writes everything out before exit, folding the JSON journal into
+        todos.json so the file itself is current (other tools read it).
+        Edits other processes made since the last reload are taken in first.
+        """
+        self.reload_if_changed()
+        self.flush()
+        if self.backend.journaled:
+            self.compact()
+
+
+_store: Optional[TodoStore] = None
+_store_lock = threading.Lock()
+
+
+def _configured_backend(attach: bool = True) -> TodoBackend:
+    """
+    Attaches to a running `termflow daemon` (if `attach` and there is one),
+    else builds the backend named by the `storage_backend` config key.
+    """
+    if attach:
+        backend = _daemon_backend()
+        if backend is not None:
+            return backend
+    # Imported here: storage.py itself builds on this module
+    from termflow.utils.storage import get_config_store
+    name = get_config_store().storage_backend
     try:
-        with open(todo_file, "r") as f:
-            data = json.load(f)
-            # Ensure data is a list of dicts
-            if not isinstance(data, list):
-                return []
-            return data
-    except (json.JSONDecodeError, IOError):
-        return []
+        return make_backend(name, get_user_data_dir())
+    except ValueError as e:
+        print(f"{e}; using json")
+        return make_backend(JsonBackend.name, get_user_data_dir())
 
 
-def save_todos(todos: List[Dict]):
-    """Saves todos to the user's data directory."""
-    todo_file = get_user_data_file("todos.json")
-    
+def _daemon_backend() -> Optional[TodoBackend]:
+    from termflow.utils.ipc import DaemonClient, DaemonError
+    client = DaemonClient.connect()
+    if client is None:
+        return None
     try:
-        # Cleanup before saving to maintain consistency
-        clean_todos = []
-        for todo in todos:
-            if isinstance(todo, dict):
-                # Ensure we use 'done' as the standard key
-                done = todo.get("done", todo.get("completed", False))
-                text = todo.get("text", todo.get("task", "Untitled"))
-                clean_todos.append({"text": text, "done": done})
-        
-        with open(todo_file, "w") as f:
-            json.dump(clean_todos, f, indent=2)
-    except IOError as e:
-        print(f"Error saving todos: {e}")
+        # if the daemon stops, carry on with the files it was writing
+        return DaemonBackend(client, fallback=lambda: _configured_backend(attach=False))
+    except (OSError, ValueError, DaemonError) as e:
+        print(f"Error attaching to the daemon: {e}; using the files directly")
+        client.close()
+        return None
+
+
+def get_todo_store(attach: bool = True) -> TodoStore:
+    """
+    Returns the process-wide TodoStore, loading it on first use (through
+    the daemon, if one is running and `attach` is set).
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = TodoStore(backend=_configured_backend(attach))
+                atexit.register(_store.flush)
+    return _store
+
+
+def load_todos() -> List[Dict]:
+    """Returns the current todos (served from memory unless the files changed)."""
+    store = get_todo_store()
+    store.reload_if_changed()
+    return store.todos()
+
+
+def save_todos(todos: List[Dict]):
+    """Replaces the stored todos with `todos`."""
+    get_todo_store().replace(todos)
 
 
 def add_todo(text: str) -> List[Dict]:
     """Adds a new todo and returns the updated list."""
-    todos = load_todos()
-    todos.append({"text": text, "done": False})
-    save_todos(todos)
-    return todos
+    store = get_todo_store()
+    store.add(text)
+    return store.todos()
 
 def toggle_todo(index: int) -> List[Dict]:
-    """Toggles the completion status of a todo."""
-    todos = load_todos()
-    if 0 <= index < len(todos):
-        todo = todos[index]
-        # Support both keys during toggle
-        current_status = todo.get("done", todo.get("completed", False))
-        todo["done"] = not current_status
-        # Clean up legacy key if present
-        if "completed" in todo:
-            del todo["completed"]
-        save_todos(todos)
-    return todos
+    """Toggles the completion status of a todo by list position."""
+    store = get_todo_store()
+    if 0 <= index < len(store):
+        store.toggle(store[index]["id"])
+    return store.todos()
 
 def delete_todo(index: int) -> List[Dict]:
-    """Deletes a todo by index."""
-    todos = load_todos()
-    if 0 <= index < len(todos):
-        todos.pop(index)
-        save_todos(todos)
-    return todos
+    """Deletes a todo by list position."""
+    store = get_todo_store()
+    if 0 <= index < len(store):
+        store.delete(store[index]["id"])
+    return store.todos()
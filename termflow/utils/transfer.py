@@ -0,0 +1,119 @@
+"""Streaming import/export of tasks as JSONL, CSV or todo.txt."""
+
+import csv
+import json
+import re
+from pathlib import Path
+from typing import IO, Dict, Iterable, Iterator, Optional
+
+FORMATS = ("jsonl", "csv", "todotxt")
+SUFFIXES = {".jsonl": "jsonl", ".ndjson": "jsonl", ".csv": "csv", ".txt": "todotxt"}
+CSV_FIELDS = ("id", "text", "done")
+
+# todo.txt: "x " marks a done task, optionally followed by completion and
+# creation dates; the task ID rides along as an `id:` key:value extension
+TODOTXT_DONE = re.compile(r"^x (?:\d{4}-\d{2}-\d{2} ){0,2}")
+TODOTXT_ID = re.compile(r"(?:^| )id:(\S+)")
+
+
+def guess_format(path: Optional[str], default: str = "jsonl") -> str:
+    """The format named by `path`'s extension, or `default`."""
+    if not path or path == "-":
+        return default
+    return SUFFIXES.get(Path(path).suffix.lower(), default)
+
+
+def _truthy(value) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "x", "done")
+    return bool(value)
+
+
+def read_jsonl(stream: IO[str]) -> Iterator[Dict]:
+    for number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"line {number}: {e}") from e
+        if isinstance(record, dict):
+            yield record
+
+
+def read_csv(stream: IO[str]) -> Iterator[Dict]:
+    for row in csv.DictReader(stream):
+        text = row.get("text") or row.get("task")
+        if not text:
+            continue
+        record = {"text": text, "done": _truthy(row.get("done") or row.get("completed") or "")}
+        if row.get("id"):
+            record["id"] = row["id"]
+        yield record
+
+
+def read_todotxt(stream: IO[str]) -> Iterator[Dict]:
+    for line in stream:
+        text = line.strip()
+        if not text:
+            continue
+        done = TODOTXT_DONE.match(text)
+        if done:
+            text = text[done.end():]
+        record = {"done": bool(done)}
+        found = TODOTXT_ID.search(text)
+        if found:
+            record["id"] = found.group(1)
+            text = (text[:found.start()] + text[found.end():]).strip()
+        record["text"] = text
+        yield record
+
+
+def write_jsonl(stream: IO[str], todos: Iterable[Dict]) -> int:
+    count = 0
+    for todo in todos:
+        stream.write(json.dumps({"id": todo["id"], "text": todo["text"], "done": todo["done"]}, ensure_ascii=False) + "\n")
+        count += 1
+    return count
+
+
+def write_csv(stream: IO[str], todos: Iterable[Dict]) -> int:
+    writer = csv.writer(stream)
+    writer.writerow(CSV_FIELDS)
+    count = 0
+    for todo in todos:
+        writer.writerow((todo["id"], todo["text"], int(todo["done"])))
+        count += 1
+    return count
+
+
+def write_todotxt(stream: IO[str], todos: Iterable[Dict]) -> int:
+    count = 0
+    for todo in todos:
+        # one task per line, so line breaks in the text have to go
+        text = " ".join(todo["text"].split())
+        stream.write(f"{'x ' if todo['done'] else ''}{text} id:{todo['id']}\n")
+        count += 1
+    return count
+
+
+READERS = {"jsonl": read_jsonl, "csv": read_csv, "todotxt": read_todotxt}
+WRITERS = {"jsonl": write_jsonl, "csv": write_csv, "todotxt": write_todotxt}
+
+
+def read_records(stream: IO[str], fmt: str) -> Iterator[Dict]:
+    """
+    Yields task records from `stream` one at a time, so memory use does not
+    depend on the size of the file. Records may lack an ID; the store gives
+    them one.
+    """
+    if fmt not in READERS:
+        raise ValueError(f"Unknown format {fmt!r} (choose from {', '.join(FORMATS)})")
+    return READERS[fmt](stream)
+
+
+def write_records(stream: IO[str], todos: Iterable[Dict], fmt: str) -> int:
+    """Writes `todos` to `stream` one record at a time; returns how many."""
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown format {fmt!r} (choose from {', '.join(FORMATS)})")
+    return WRITERS[fmt](stream, todos)
@@ -0,0 +1,75 @@
+"""Undo/redo for the todo list, kept as inverse operations."""
+
+from collections import deque
+from typing import Deque, Dict, NamedTuple, Optional
+
+# How many actions can be undone; older ones are dropped.
+UNDO_LIMIT = 100
+
+
+class UndoEntry(NamedTuple):
+    """
+    One operation that reverses a change to the todo list.
+
+    kind:
+        "del": delete `todo_id` (reverses an add)
+        "ins": put `record` back at list position `position` (reverses a delete)
+        "set": set `todo_id`'s done flag to `done` (reverses a toggle)
+
+    An entry holds one ID and at most one task record, so its size does
+    not depend on how long the list is. Applying an entry yields the entry
+    that reverses it, which is what moves between the undo and redo stacks.
+    """
+
+    kind: str
+    todo_id: str
+    position: int = -1
+    record: Optional[Dict] = None
+    done: bool = False
+
+
+class UndoHistory:
+    """
+    Bounded undo and redo stacks of UndoEntry.
+
+    Both are ring buffers (`deque(maxlen=limit)`): pushing onto a full
+    stack drops its oldest entry, so memory stays at `limit` entries
+    however long the app runs. A new action clears the redo stack.
+    """
+
+    def __init__(self, limit: int = UNDO_LIMIT) -> None:
+        self._undo: Deque[UndoEntry] = deque(maxlen=limit)
+        self._redo: Deque[UndoEntry] = deque(maxlen=limit)
+
+    def __len__(self) -> int:
+        return len(self._undo)
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def record(self, entry: UndoEntry) -> None:
+        """Remembers how to reverse a new action."""
+        self._undo.append(entry)
+        self._redo.clear()
+
+    def pop_undo(self) -> Optional[UndoEntry]:
+        return self._undo.pop() if self._undo else None
+
+    def pop_redo(self) -> Optional[UndoEntry]:
+        return self._redo.pop() if self._redo else None
+
+    def push_undo(self, entry: UndoEntry) -> None:
+        """Stores the reverse of a redone action (the redo stack is kept)."""
+        self._undo.append(entry)
+
+    def push_redo(self, entry: UndoEntry) -> None:
+        self._redo.append(entry)
+
+    def clear(self) -> None:
+        self._undo.clear()
+        self._redo.clear()
@@ -0,0 +1,188 @@
+"""Change detection for the files TermFlow keeps in its data directory."""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+from pathlib import Path
+from typing import Callable, Dict, NamedTuple, Optional, Set
+
+# How often the polling fallback stats the watched files, in seconds.
+POLL_INTERVAL = 1.0
+# Events arriving within this window are handled as one change (an atomic
+# replace is a create + rename, a SQLite commit touches the WAL repeatedly).
+DEBOUNCE = 0.05
+
+# inotify(7) constants
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_IN_MODIFY = 0x002
+_IN_ATTRIB = 0x004
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_WATCH_MASK = _IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+_EVENT = struct.Struct("iIII")
+
+
+class FileSignature(NamedTuple):
+    """What a cached parse of a file is keyed by."""
+
+    mtime_ns: int
+    size: int
+    inode: int
+
+
+def file_signature(path: Path) -> Optional[FileSignature]:
+    """Returns the signature of `path` (one stat call), or None if it is missing."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return FileSignature(st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _load_libc():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class FileWatcher:
+    """
+    Calls `callback(path)` from a background thread when a watched file changes.
+
+    On Linux the parent directories are watched with inotify (through
+    ctypes, so there is no extra dependency); watching the directory rather
+    than the file keeps working across atomic replaces. Elsewhere, or when
+    inotify is unavailable, the files are stat-polled every `poll_interval`
+    seconds. Either way a file is only reported when its signature (mtime,
+    size, inode) differs from the last one seen.
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[Path], None],
+        poll_interval: float = POLL_INTERVAL,
+        use_inotify: bool = True,
+    ) -> None:
+        self.callback = callback
+        self.poll_interval = poll_interval
+        self._libc = _load_libc() if use_inotify else None
+        self._lock = threading.Lock()
+        self._paths: Dict[Path, Optional[FileSignature]] = {}
+        self._names: Dict[str, Set[str]] = {}
+        self._wds: Dict[int, str] = {}
+        self._fd: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def mode(self) -> str:
+        """"inotify" or "poll"."""
+        return "inotify" if self._fd is not None else "poll"
+
+    def watch(self, path: Path) -> None:
+        """Starts watching `path` (which need not exist yet)."""
+        path = Path(path).absolute()
+        with self._lock:
+            if path in self._paths:
+                return
+            self._paths[path] = file_signature(path)
+            directory = str(path.parent)
+            names = self._names.setdefault(directory, set())
+            names.add(path.name)
+            if self._fd is not None and len(names) == 1:
+                self._add_watch(directory)
+
+    def _add_watch(self, directory: str) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+        if wd >= 0:
+            self._wds[wd] = directory
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        if self._libc is not None:
+            fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+            if fd >= 0:
+                self._fd = fd
+                with self._lock:
+                    for directory in self._names:
+                        self._add_watch(directory)
+        target = self._run_inotify if self._fd is not None else self._run_poll
+        self._thread = threading.Thread(target=target, name="termflow-watch", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def check(self) -> None:
+        """Stats every watched file and reports the ones that changed."""
+        with self._lock:
+            paths = list(self._paths)
+        for path in paths:
+            self._check(path)
+
+    def _check(self, path: Path) -> None:
+        signature = file_signature(path)
+        with self._lock:
+            if self._paths.get(path, signature) == signature:
+                return
+            self._paths[path] = signature
+        try:
+            self.callback(path)
+        except Exception as e:
+            print(f"Error handling change to {path}: {e}")
+
+    def _run_poll(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            self.check()
+
+    def _run_inotify(self) -> None:
+        fd = self._fd
+        while not self._stop.is_set():
+            ready, _, _ = select.select([fd], [], [], 0.5)
+            if not ready:
+                continue
+            changed: Set[Path] = set()
+            # Drain the burst that usually follows the first event
+            while ready:
+                changed |= self._read_events(fd)
+                ready, _, _ = select.select([fd], [], [], DEBOUNCE)
+            for path in changed:
+                self._check(path)
+
+    def _read_events(self, fd: int) -> Set[Path]:
+        try:
+            data = os.read(fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+        changed: Set[Path] = set()
+        offset = 0
+        with self._lock:
+            while offset + _EVENT.size <= len(data):
+                wd, _mask, _cookie, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                name = data[offset:offset + length].rstrip(b"\0").decode(errors="replace")
+                offset += length
+                directory = self._wds.get(wd)
+                if directory is not None and name in self._names.get(directory, ()):
+                    changed.add(Path(directory) / name)
+        return changed
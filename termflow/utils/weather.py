@@ -1,4 +1,170 @@
-import requests
+"""Current weather for the info panel, fetched over HTTP and cached on disk."""
+
+import asyncio
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional
+from urllib.parse import quote
+from termflow.utils.fileio import atomic_write
+from termflow.utils.resources import get_user_data_file
+
+# Default provider; `{city}` is replaced with the URL-quoted city name and the
+# response body (plain text, first line) is what the panel shows.
+DEFAULT_WEATHER_URL = "https://wttr.in/{city}?format=%C+%t"
+# Cached readings younger than this are shown without asking the provider.
+WEATHER_TTL = 30 * 60
+# After a failed fetch, wait BACKOFF_BASE * 2**(failures - 1) seconds (at
+# most BACKOFF_MAX) before trying again; stale data is shown meanwhile.
+BACKOFF_BASE = 30
+BACKOFF_MAX = 60 * 60
+REQUEST_TIMEOUT = 5
+# Longest provider answer we display
+MAX_TEXT = 60
+
+
+class Reading(NamedTuple):
+    text: str
+    fetched_at: float
+
+    def age(self, now: Optional[float] = None) -> float:
+        return (time.time() if now is None else now) - self.fetched_at
+
+
+class WeatherProvider:
+    """
+    Fetches current conditions per city.
+
+    Requests go through one requests.Session (so the connection is pooled)
+    on a worker thread, never on the event loop. Readings are kept in
+    weather.json and reused while younger than `ttl`, so a restart shows the
+    last value at once. Concurrent `get()` calls for the same city share one
+    request. Failures back off exponentially; until the next attempt is due,
+    `get()` returns the last reading, however old.
+
+    The URL template comes from `url`, or else the `weather_url` config key
+    (read on every fetch), so it can point at a local stub server.
+    """
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        ttl: float = WEATHER_TTL,
+        cache_path: Optional[Path] = None,
+        timeout: float = REQUEST_TIMEOUT,
+    ) -> None:
+        self.url = url
+        self.ttl = ttl
+        self.timeout = timeout
+        self.cache_path = Path(cache_path) if cache_path is not None else get_user_data_file("weather.json")
+        self._lock = threading.Lock()
+        self._session = None
+        self._readings: Dict[str, Reading] = self._read()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._failures: Dict[str, int] = {}
+        self._retry_at: Dict[str, float] = {}
+
+    def _read(self) -> Dict[str, Reading]:
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                return {city: Reading(str(r[0]), float(r[1])) for city, r in json.load(f).items()}
+        except (FileNotFoundError, json.JSONDecodeError, AttributeError, IndexError, TypeError, ValueError):
+            return {}
+
+    def _write(self) -> None:
+        with self._lock:
+            payload = json.dumps(self._readings)
+        try:
+            atomic_write(self.cache_path, payload.encode("utf-8"))
+        except OSError as e:
+            print(f"Error saving weather cache: {e}")
+
+    def _template(self) -> str:
+        if self.url:
+            return self.url
+        from termflow.utils.storage import get_config_store
+        return get_config_store().weather_url
+
+    def cached(self, city: str) -> Optional[Reading]:
+        """The last reading for `city`, however old (no network)."""
+        return self._readings.get(city)
+
+    def is_fresh(self, reading: Optional[Reading]) -> bool:
+        return reading is not None and reading.age() < self.ttl
+
+    async def get(self, city: str) -> Optional[Reading]:
+        """
+        Returns a reading for `city`: the cached one while fresh (or while
+        backing off after a failure), else a new one from the provider.
+        None only if nothing was ever fetched and the fetch failed.
+        """
+        cached = self._readings.get(city)
+        if self.is_fresh(cached) or time.time() < self._retry_at.get(city, 0.0):
+            return cached
+        task = self._inflight.get(city)
+        if task is None:
+            task = self._inflight[city] = asyncio.ensure_future(self._refresh(city))
+            task.add_done_callback(lambda _: self._inflight.pop(city, None))
+        # shielded: one caller going away must not cancel the others' request
+        return await asyncio.shield(task)
+
+    async def _refresh(self, city: str) -> Optional[Reading]:
+        try:
+            text = await asyncio.to_thread(self._fetch, city)
+        except Exception:
+            failures = self._failures[city] = self._failures.get(city, 0) + 1
+            self._retry_at[city] = time.time() + min(BACKOFF_BASE * 2 ** (failures - 1), BACKOFF_MAX)
+            return self._readings.get(city)
+        self._failures.pop(city, None)
+        self._retry_at.pop(city, None)
+        reading = Reading(text, time.time())
+        with self._lock:
+            self._readings[city] = reading
+        await asyncio.to_thread(self._write)
+        return reading
+
+    def _fetch(self, city: str) -> str:
+        with self._lock:
+            if self._session is None:
+                # Imported here: requests is slow to import and only needed once a city is set
+                import requests
+                self._session = requests.Session()
+            session = self._session
+        response = session.get(self._template().format(city=quote(city)), timeout=self.timeout)
+        response.raise_for_status()
+        # providers answer in UTF-8 but rarely say so; don't let requests guess
+        body = response.content.decode("utf-8", errors="replace").strip()
+        text = body.splitlines()[0].strip() if body else ""
+        if not text:
+            raise ValueError("empty weather response")
+        return text[:MAX_TEXT]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+_provider: Optional[WeatherProvider] = None
+_provider_lock = threading.Lock()
+
+
+def get_weather_provider() -> WeatherProvider:
+    """Returns the process-wide WeatherProvider."""
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                _provider = WeatherProvider()
+    return _provider
+
 
 def get_weather(city=None):
-    return "N/A"
+    """The cached weather text for `city` (the configured one by default), or "N/A"."""
+    if city is None:
+        from termflow.utils.storage import get_config_store
+        city = get_config_store().city
+    reading = get_weather_provider().cached(city) if city else None
+    return reading.text if reading else "N/A"
@@ -0,0 +1,91 @@
+import json
+
+from termflow.utils.backends import JsonBackend, SQLiteBackend, make_backend
+from termflow.utils.todos import TodoStore
+
+
+def _texts(backend):
+    return [(todo["text"], todo["done"]) for todo in backend.load()]
+
+
+def test_sqlite_imports_todos_json_once(tmp_path):
+    store = TodoStore(tmp_path / "todos.json", delay=60)
+    first = store.add("from json [dev]")
+    store.compact()
+    store.add("from the journal")
+    store.flush()
+
+    backend = make_backend("sqlite", tmp_path)
+    assert _texts(backend) == [("from json [dev]", False), ("from the journal", False)]
+    assert backend.load()[0]["id"] == first["id"]
+    assert [todo["id"] for todo in backend.pending(tag="dev")] == [first["id"]]
+    backend.close()
+
+    # later edits to the old file are not imported again
+    (tmp_path / "todos.json").write_text(json.dumps([{"id": "x", "text": "new", "done": False}]))
+    (tmp_path / "todos.journal.jsonl").unlink()
+    backend = make_backend("sqlite", tmp_path)
+    assert len(backend.load()) == 2
+    backend.close()
+
+
+def test_position_at_shifts_the_tasks_after_it(tmp_path):
+    backend = SQLiteBackend(tmp_path / "todos.db")
+    backend.rewrite([{"id": c, "text": c, "done": False} for c in "abc"])
+    backend.append([{"op": "del", "id": "b"}])
+    # the gap left by "b" is not a list index; "at" counts the tasks left
+    backend.append([{"op": "add", "id": "x", "text": "x", "at": 1}, {"op": "add", "id": "y", "text": "y", "at": 0}])
+    backend.append([{"op": "add", "id": "z", "text": "z", "at": 9}, {"op": "add", "id": "w", "text": "w"}])
+    assert [todo["id"] for todo in backend.load()] == ["y", "a", "x", "c", "z", "w"]
+    backend.close()
+
+
+def test_undone_delete_goes_back_in_place(tmp_path):
+    path = tmp_path / "todos.db"
+    store = TodoStore(backend=SQLiteBackend(path), delay=60)
+    ids = [store.add(text)["id"] for text in ("one", "two", "three")]
+    store.delete(ids[1])
+    store.flush()
+    store.undo()
+    store.flush()
+    assert [todo["id"] for todo in SQLiteBackend(path).load()] == ids
+
+
+def test_wal_readers_see_committed_writes(tmp_path):
+    path = tmp_path / "todos.db"
+    writer, reader = SQLiteBackend(path), SQLiteBackend(path)
+    writer.rewrite([{"id": "a", "text": "a", "done": False}])
+    assert _texts(reader) == [("a", False)]
+    assert writer.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert writer.paths()[1].exists()
+
+    reader.append([{"op": "set", "id": "a", "done": True}, {"op": "add", "id": "b", "text": "b"}])
+    assert _texts(writer) == [("a", True), ("b", False)]
+    writer.close()
+    reader.close()
+    assert _texts(SQLiteBackend(path)) == [("a", True), ("b", False)]
+
+
+def test_sqlite_and_json_keep_the_same_list(tmp_path):
+    stores = [
+        TodoStore(backend=JsonBackend(tmp_path / "todos.json"), delay=60),
+        TodoStore(backend=SQLiteBackend(tmp_path / "todos.db"), delay=60),
+    ]
+    for store in stores:
+        ids = [store.add(f"task {i} [t{i % 2}]")["id"] for i in range(6)]
+        store.set_done(ids[2], True)
+        store.delete(ids[0])
+        store.delete(ids[4])
+        store.flush()
+        store.undo()
+        store.set_done(ids[1], True)
+        store.undo()
+        store.add_many([{"text": "imported", "done": True}])
+        store.flush()
+
+    reloaded = [
+        JsonBackend(tmp_path / "todos.json").load(),
+        SQLiteBackend(tmp_path / "todos.db").load(),
+    ]
+    assert [(t["text"], t["done"]) for t in reloaded[0]] == [(t["text"], t["done"]) for t in reloaded[1]]
+    assert [t["text"] for t in reloaded[0]] == ["task 1 [t1]", "task 2 [t0]", "task 3 [t1]", "task 4 [t0]", "task 5 [t1]", "imported"]
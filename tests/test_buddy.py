@@ -0,0 +1,44 @@
+from termflow.ui.buddy import COMPANIONS, BuddyAnimator, Companion, FocusBuddy
+
+
+def test_frames_are_compiled_once_and_loop():
+    animator = BuddyAnimator(COMPANIONS["cat"])
+    sequence = COMPANIONS["cat"].animations["IDLE_ACTIVE"]
+    seen = []
+    for _ in range(2 * len(sequence)):
+        seen.append(animator.frame())
+        animator.advance()
+    # the second loop hands back the very same renderables
+    assert all(a is b for a, b in zip(seen, seen[len(sequence):]))
+    assert "Begin." in seen[0].plain and "Focus." in seen[1].plain
+
+    animator.configure("IDLE_ONLY", motion=False)
+    assert not animator.animated
+    rest = animator.frame()
+    animator.advance()
+    assert animator.frame() is rest
+
+
+def test_a_new_companion_is_just_data():
+    dot = Companion(frames={"on": "o", "off": "."}, animations={"BLINK": ("on", "off", "off")}, rest="on",
+                    captions=("", " [bold]hm[/]"))
+    animator = BuddyAnimator(dot)
+    frames = []
+    for _ in range(4):
+        frames.append(animator.frame().plain)
+        animator.advance()
+    assert frames == ["o", ". hm", ". hm", "o"]
+    # an unknown mode falls back to the first animation
+    animator.configure("NOPE", motion=True)
+    assert animator.sequence == ("on", "off", "off")
+
+
+def test_repeated_frames_do_not_repaint():
+    buddy = FocusBuddy()
+    painted = []
+    buddy.update = painted.append
+    buddy.animator.configure("IDLE_ACTIVE", motion=True)
+    # walk the table once: "play_a" and "play_b" repeat back to back
+    for _ in range(len(buddy.animator.sequence)):
+        buddy.advance()
+    assert len(painted) == len(buddy.animator.sequence) - 2
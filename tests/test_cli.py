@@ -0,0 +1,63 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _termflow(tmp_path, *args, stdin=None):
+    env = dict(os.environ, HOME=str(tmp_path), XDG_DATA_HOME=str(tmp_path / "data"),
+               TERMFLOW_SOCKET=str(tmp_path / "no-daemon.sock"), PYTHONPATH=str(ROOT))
+    return subprocess.run([sys.executable, "-m", "termflow.main", *args], env=env, input=stdin,
+                          capture_output=True, text=True, cwd=tmp_path)
+
+
+def _todos_file(tmp_path):
+    return tmp_path / "data" / "termflow" / "todos.json"
+
+
+def _texts(tmp_path):
+    return [line.split(". ", 1)[1][4:] for line in _termflow(tmp_path, "list", "-a").stdout.splitlines()]
+
+
+def test_failed_import_adds_nothing(tmp_path):
+    path = _todos_file(tmp_path)
+    path.parent.mkdir(parents=True)
+    # a legacy list without IDs or journal, so the run rewrites the file anyway
+    path.write_text(json.dumps([{"text": "old", "done": False}]))
+    batch = tmp_path / "batch.jsonl"
+    batch.write_text('{"id": "x1", "text": "one"}\n{"id": "x2", "text": "two"}\nnot json\n')
+
+    result = _termflow(tmp_path, "import", str(batch))
+    assert result.returncode == 1
+    assert "import failed: line 3" in result.stderr
+    assert _texts(tmp_path) == ["old"]
+
+
+def test_import_export_round_trip(tmp_path):
+    batch = tmp_path / "batch.jsonl"
+    batch.write_text('{"id": "x1", "text": "one"}\n{"id": "x2", "text": "two", "done": true}\n')
+    assert _termflow(tmp_path, "import", str(batch)).returncode == 0
+    # importing the same tasks again skips them
+    assert "(2 already present)" in _termflow(tmp_path, "import", str(batch)).stderr
+
+    export = _termflow(tmp_path, "export", "--pending")
+    assert [json.loads(line) for line in export.stdout.splitlines()] == [{"id": "x1", "text": "one", "done": False}]
+    export = _termflow(tmp_path, "export", "-f", "csv")
+    assert export.stdout.splitlines()[1:] == ["x1,one,0", "x2,two,1"]
+
+
+def test_add_done_rm(tmp_path):
+    for text in ("first", "second [dev]", "third"):
+        assert _termflow(tmp_path, "add", *text.split()).returncode == 0
+    assert _termflow(tmp_path, "done", "2").returncode == 0
+    listing = _termflow(tmp_path, "list").stdout
+    assert "second" not in listing and "[ ] third" in listing
+    assert "second [dev]" in _termflow(tmp_path, "list", "-a", "-t", "dev").stdout
+
+    # both numbers refer to the list as it was before the command
+    assert _termflow(tmp_path, "rm", "1", "3").returncode == 0
+    assert _texts(tmp_path) == ["second [dev]"]
+    assert _termflow(tmp_path, "rm", "7").returncode == 1
@@ -0,0 +1,105 @@
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from termflow.utils.backends import DaemonBackend, JsonBackend
+from termflow.utils.ipc import DaemonClient
+from termflow.utils.todos import TodoStore
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _start_daemon(tmp_path):
+    socket_path = tmp_path / "daemon.sock"
+    env = dict(os.environ, HOME=str(tmp_path), XDG_DATA_HOME=str(tmp_path / "data"),
+               TERMFLOW_SOCKET=str(socket_path), PYTHONPATH=str(ROOT))
+    process = subprocess.Popen([sys.executable, "-m", "termflow.main", "daemon"], env=env,
+                               stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 10
+    while True:
+        client = DaemonClient.connect(socket_path)
+        if client is not None:
+            return process, client
+        assert process.poll() is None and time.monotonic() < deadline, "daemon did not start"
+        time.sleep(0.05)
+
+
+def test_store_carries_on_when_the_daemon_dies(tmp_path):
+    process, client = _start_daemon(tmp_path)
+    try:
+        backend = DaemonBackend(client, fallback=lambda: JsonBackend(backend.paths()[0]))
+        store = TodoStore(backend=backend, delay=60)
+        store.add("before")
+        store.flush()
+        process.send_signal(signal.SIGKILL)
+        process.wait()
+
+        store.add("after")
+        # the file watcher's check and the flush on quit must not raise
+        store.reload_if_changed()
+        store.flush()
+        assert isinstance(store.backend, JsonBackend)
+    finally:
+        if process.poll() is None:
+            process.kill()
+    texts = [todo["text"] for todo in TodoStore(backend=JsonBackend(backend.paths()[0])).todos()]
+    assert texts == ["before", "after"]
+
+
+def _ask(socket_path, *lines):
+    import socket
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(5)
+        sock.connect(str(socket_path))
+        reader = sock.makefile("rb")
+        answers = []
+        for line in lines:
+            sock.sendall(line.encode("utf-8") + b"\n")
+            answers.append(reader.readline().decode("utf-8").rstrip("\n"))
+        reader.close()
+    return answers
+
+
+def test_socket_protocol(tmp_path):
+    import pytest
+    from termflow.utils.ipc import DaemonError
+
+    process, client = _start_daemon(tmp_path)
+    socket_path = tmp_path / "daemon.sock"
+    try:
+        assert client.request("ping") == "pong"
+        revision = client.request("revision")
+        first = client.request("add", text="write report [work]")
+        client.request("apply", ops=[{"op": "add", "id": "fixed-id", "text": "second"}])
+        assert client.request("revision") > revision
+        assert [todo["id"] for todo in client.request("todos")] == [first["id"], "fixed-id"]
+        status = client.request("status")
+        assert (status["pending"], status["total"]) == (2, 2)
+        assert status["task"] == {"id": first["id"], "text": "write report [work]"}
+        assert client.request("config", key="pomodoro_duration") == 25
+
+        # errors come back as replies; the connection stays usable
+        with pytest.raises(DaemonError, match="unknown op"):
+            client.request("nope")
+        with pytest.raises(DaemonError, match="TypeError"):
+            client.request("add", wrong="argument")
+        assert client.request("ping") == "pong"
+
+        # bare words for statuslines, several on one connection, next to a second client
+        assert _ask(socket_path, "ping", "task", "prompt", "pomodoro", "bogus") == [
+            "pong", "write report [work]", "write report [work]", "", "error: unknown query",
+        ]
+        reply = json.loads(_ask(socket_path, '{"op": "todos"')[0])
+        assert not reply["ok"] and reply["error"].startswith("JSONDecodeError")
+    finally:
+        client.close()
+        process.send_signal(signal.SIGTERM)
+        process.wait(timeout=10)
+    # shut down cleanly: socket removed, tasks written
+    assert not socket_path.exists()
+    texts = [todo["text"] for todo in TodoStore(tmp_path / "data" / "termflow" / "todos.json").todos()]
+    assert texts == ["write report [work]", "second"]
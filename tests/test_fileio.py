@@ -0,0 +1,48 @@
+import os
+import stat
+
+from termflow.utils import fileio
+from termflow.utils.fileio import atomic_write
+
+
+def _mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def test_atomic_write_keeps_the_file_mode(tmp_path):
+    path = tmp_path / "config.toml"
+    path.write_text("old")
+    os.chmod(path, 0o640)
+    atomic_write(path, b"new")
+    assert path.read_bytes() == b"new"
+    assert _mode(path) == 0o640
+
+    created = tmp_path / "todos.json"
+    atomic_write(created, b"[]")
+    assert _mode(created) == 0o666 & ~fileio._UMASK
+    # no temporary files left behind
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["config.toml", "todos.json"]
+
+
+def test_debounced_flush_coalesces_a_burst(tmp_path):
+    import threading
+    import time
+    from termflow.utils.fileio import DebouncedFlush
+
+    calls = []
+    done = threading.Event()
+    flusher = DebouncedFlush(lambda: (calls.append(time.monotonic()), done.set()), delay=0.05)
+    started = time.monotonic()
+    for _ in range(20):
+        flusher.schedule()
+    assert done.wait(2)
+    time.sleep(0.1)
+    assert len(calls) == 1 and calls[0] - started >= 0.05
+
+    # flush() runs pending work at once, and nothing is left for the timer
+    flusher.schedule()
+    flusher.flush()
+    time.sleep(0.1)
+    assert len(calls) == 2
+    flusher.flush()
+    assert len(calls) == 2
@@ -0,0 +1,70 @@
+import asyncio
+import random
+
+from textual.widgets import Static
+
+import termflow.utils.todos as todos_module
+from termflow.utils.todos import TodoStore
+
+
+def _scan(store, tag=None):
+    """What the queue replaced: every unfinished task, found by walking the list."""
+    return [todo["id"] for todo in store.todos()
+            if not todo["done"] and (tag is None or tag in store.tags_of(todo["id"]))]
+
+
+def test_pending_queue_matches_a_full_scan_through_random_edits(tmp_path):
+    rng = random.Random(7)
+    store = TodoStore(tmp_path / "todos.json", delay=60)
+    for step in range(2000):
+        ids = [todo["id"] for todo in store.todos()]
+        action = rng.random()
+        if action < 0.35 or not ids:
+            store.add(f"task {step} [{rng.choice(['dev', 'home', 'work'])}]")
+        elif action < 0.6:
+            store.toggle(rng.choice(ids))
+        elif action < 0.75:
+            store.delete(rng.choice(ids))
+        elif action < 0.9:
+            store.undo()
+        else:
+            store.redo()
+        if step % 50 == 0:
+            for tag in (None, "dev", "home"):
+                assert [t["id"] for t in store.pending_head(10**6, tag)] == _scan(store, tag)
+                head = store.next_pending(tag)
+                assert (head["id"] if head else None) == (_scan(store, tag) or [None])[0]
+    assert [t["id"] for t in store.pending_head(3, "work")] == _scan(store, "work")[:3]
+
+
+def test_flow_mode_advances_without_reading_the_disk(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path / "data"))
+    store = TodoStore(tmp_path / "todos.json", delay=60)
+    for text in ("first", "second", "third", "fourth", "fifth"):
+        store.add(text)
+    store.set_done(store[1]["id"], True)
+    monkeypatch.setattr(todos_module, "_store", store)
+    from termflow.ui.app import TermFlowApp
+
+    def no_disk():
+        raise AssertionError("flow mode read the task file")
+
+    async def run():
+        app = TermFlowApp()
+        async with app.run_test(size=(120, 50)) as pilot:
+            await pilot.pause()
+            monkeypatch.setattr(store.backend, "load", no_disk)
+            app.action_enter_flow()
+            await pilot.pause()
+            shown = [app.current_task["text"]]
+            upcoming = str(app.query_one("#flow-upnext", Static).render())
+            for _ in range(4):
+                app.action_complete_task()
+                await pilot.pause()
+                shown.append(app.current_task["text"] if app.current_task else None)
+            return shown, upcoming
+
+    shown, upcoming = asyncio.run(run())
+    assert shown == ["first", "third", "fourth", "fifth", None]
+    assert "third" in upcoming and "fifth" in upcoming and "second" not in upcoming
@@ -0,0 +1,47 @@
+from datetime import date, datetime
+
+from termflow.core.history import SessionHistory
+
+
+def _at(day, hour=9):
+    return datetime(2026, 3, day, hour).timestamp()
+
+
+def test_rollups_by_day_week_and_task(tmp_path):
+    path = tmp_path / "sessions.jsonl"
+    history = SessionHistory(path)
+    report = {"id": "a", "text": "write report"}
+    # Sunday 1 March ends ISO week 9; Monday 2 March starts week 10
+    history.record(_at(1), _at(1) + 1500, 1500, report)
+    history.record(_at(2), _at(2) + 1500, 1500, report)
+    history.record(_at(2, 14), _at(2, 14) + 600, 600, {"id": "b", "text": "review"}, interrupted=True)
+    history.record(_at(3), _at(3) + 1500, 1500)
+
+    assert history.day(date(2026, 3, 2)) == (1, 1, 2100.0)
+    assert history.day(date(2026, 3, 4)) == (0, 0, 0.0)
+    assert history.week(date(2026, 3, 1)) == (1, 0, 1500.0)
+    assert history.week(date(2026, 3, 8)) == (2, 1, 3600.0)
+    assert history.task("a").minutes == 50
+    assert [(todo_id, text) for todo_id, text, _ in history.top_tasks()] == [("a", "write report"), ("b", "review")]
+
+
+def test_rollups_resume_from_their_offset_and_rebuild_when_the_log_shrinks(tmp_path):
+    path = tmp_path / "sessions.jsonl"
+    history = SessionHistory(path)
+    history.record(_at(2), _at(2) + 1500, 1500, {"id": "a", "text": "a"})
+
+    # another process appends a session, plus a torn line from a crash
+    other = SessionHistory(path)
+    other.record(_at(3), _at(3) + 1500, 1500, {"id": "a", "text": "a"})
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"start": 1')
+    assert history.catch_up()
+    assert history.task("a").sessions == 2
+    assert SessionHistory(path).task("a").sessions == 2
+
+    # replaced by a shorter log: rebuilt from scratch rather than trusted
+    lines = path.read_text(encoding="utf-8").splitlines(keepends=True)
+    path.write_text(lines[0], encoding="utf-8")
+    reloaded = SessionHistory(path)
+    assert reloaded.task("a").sessions == 1
+    assert reloaded.week(date(2026, 3, 2)) == (1, 0, 1500.0)
@@ -0,0 +1,38 @@
+import asyncio
+
+from textual.app import App
+from textual.widgets import Label
+
+from termflow.panels.info import InfoPanel
+
+
+class _Data:
+    """Stands in for the app's DataService; the panel only subscribes."""
+
+    def subscribe(self, topic, widget, callback, replay=True):
+        pass
+
+    def unsubscribe(self, topic, callback):
+        pass
+
+
+class _InfoApp(App):
+    def __init__(self):
+        super().__init__()
+        self.data = _Data()
+
+    def compose(self):
+        yield InfoPanel()
+
+
+def test_bracketed_quote_is_shown_verbatim():
+    quote = "Use [/] sparingly. [bold]Really[/bold]."
+
+    async def run():
+        app = _InfoApp()
+        async with app.run_test() as pilot:
+            app.query_one(InfoPanel).show_reflection(quote)
+            await pilot.pause()
+            return str(app.query_one("#reflection", Label).render())
+
+    assert asyncio.run(run()) == quote
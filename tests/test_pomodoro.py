@@ -0,0 +1,60 @@
+import pytest
+
+from termflow.core import pomodoro as pomodoro_module
+from termflow.core.history import SessionHistory
+from termflow.core.pomodoro import PomodoroEngine
+from termflow.utils.storage import ConfigStore
+
+
+class _Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+def _engine(tmp_path):
+    config = ConfigStore(tmp_path / "config.toml", delay=60)
+    history = SessionHistory(tmp_path / "sessions.jsonl")
+    return PomodoroEngine(tmp_path / "pomodoro.json", config=config, history=history), config, history
+
+
+def test_deadline_survives_lag_pauses_and_restarts(tmp_path, monkeypatch):
+    clock = _Clock(1_700_000_000.25)
+    monkeypatch.setattr(pomodoro_module, "time", clock)
+    engine, config, history = _engine(tmp_path)
+    engine.task = {"id": "t1", "text": "write report"}
+    start = clock.now
+    engine.start()
+
+    # a laggy event loop: ticks arrive late and unevenly for ten minutes
+    shown = []
+    while clock.now < start + 600:
+        clock.now += 0.9 + (len(shown) % 7) * 0.13
+        shown.append(engine.display_seconds())
+        assert not engine.check()
+    assert engine.remaining() == pytest.approx(25 * 60 - (clock.now - start))
+    assert shown == sorted(shown, reverse=True)
+
+    # a five-minute pause does not count, and a restart picks up where it was
+    engine.pause()
+    left = engine.remaining()
+    clock.now += 300
+    engine, _, _ = _engine(tmp_path)
+    assert engine.remaining() == left and not engine.running
+    engine.start()
+    assert engine.deadline == clock.now + left
+
+    # suspended past the deadline: the session ends at the deadline, not on wake-up
+    deadline = engine.deadline
+    clock.now += 3 * 3600
+    assert engine.display_seconds() == 0
+    assert engine.check()
+    assert not engine.check()
+    history = SessionHistory(tmp_path / "sessions.jsonl")
+    assert history.task("t1").sessions == 1
+    assert history.task("t1").seconds == 25 * 60
+    assert engine.remaining() == 0 and engine.deadline is None
+    assert deadline - start == 25 * 60 + 300
+    config._flusher.cancel()
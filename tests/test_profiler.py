@@ -0,0 +1,55 @@
+import asyncio
+import json
+
+from textual.app import App
+from textual.widgets import Static
+
+from termflow.core.profiler import Profiler
+from termflow.utils.todos import TodoStore
+
+
+class _App(App):
+    def compose(self):
+        yield Static("hello")
+
+
+def test_trace_records_storage_listeners_and_frames(tmp_path):
+    profiler = Profiler()
+    original_notify = TodoStore._notify
+    profiler.enable()
+    try:
+        store = TodoStore(tmp_path / "todos.json", delay=60)
+        store.subscribe(lambda: None)
+        store.add("profiled")
+        store.flush()
+
+        async def run():
+            async with _App().run_test() as pilot:
+                await pilot.pause()
+
+        asyncio.run(run())
+        path = profiler.dump(tmp_path / "trace.json")
+    finally:
+        profiler.disable()
+    assert TodoStore._notify is original_notify
+
+    trace = json.loads(path.read_text(encoding="utf-8"))
+    names = {event["name"] for event in trace["traceEvents"]}
+    assert {"io TodoStore.read", "io TodoStore._write", "frame"} <= names
+    assert any(name.startswith("listener test_trace_records") for name in names)
+    assert all(event["ph"] == "X" and event["dur"] >= 0 for event in trace["traceEvents"])
+    assert trace["stats"]["io TodoStore._write"]["count"] == 1
+
+
+def test_wrap_times_coroutines_and_names_from_arguments():
+    profiler = Profiler()
+
+    async def fetch(city):
+        await asyncio.sleep(0.01)
+        return city
+
+    wrapped = profiler.wrap(fetch, lambda city: f"fetch {city}")
+    assert asyncio.run(wrapped("Oslo")) == "Oslo"
+    assert profiler.stats["fetch Oslo"].count == 1
+    assert profiler.stats["fetch Oslo"].total >= 0.01
+    assert profiler.summary(1)[0][0] == "fetch Oslo"
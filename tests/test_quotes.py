@@ -0,0 +1,42 @@
+import os
+
+import termflow.utils.resources as resources
+from termflow.utils.quotes import QuoteCorpus
+
+
+def test_index_lives_in_the_data_dir_not_next_to_the_corpus(tmp_path, monkeypatch):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    monkeypatch.setattr(resources, "get_user_data_file", lambda name: data_dir / name)
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    corpus_path = shared / "quotes.txt"
+    corpus_path.write_text("# header\nfirst quote\n\nsecond quote\n", encoding="utf-8")
+    os.chmod(shared, 0o555)
+    try:
+        corpus = QuoteCorpus(corpus_path)
+        assert [corpus.line(i) for i in range(len(corpus))] == ["first quote", "second quote"]
+        corpus.close()
+    finally:
+        os.chmod(shared, 0o755)
+    assert list(shared.iterdir()) == [corpus_path]
+    assert [path.suffix for path in data_dir.iterdir()] == [".idx"]
+
+
+def test_source_follows_the_quotes_file_setting(tmp_path, monkeypatch):
+    from termflow.utils import quotes, storage
+
+    monkeypatch.setattr(resources, "get_user_data_file", lambda name: tmp_path / name)
+    config = storage.ConfigStore(tmp_path / "config.toml", delay=60)
+    monkeypatch.setattr(storage, "_config_store", config)
+    monkeypatch.setattr(quotes, "_source", None)
+    first, second = tmp_path / "first.txt", tmp_path / "second.txt"
+    first.write_text("from the first file\n", encoding="utf-8")
+    second.write_text("from the second file\n", encoding="utf-8")
+
+    config.set("quotes_file", str(first))
+    assert quotes.get_quote() == "from the first file"
+    config.set("quotes_file", str(second))
+    assert quotes.get_quote() == "from the second file"
+    quotes.get_quote_source().close()
+    config._flusher.cancel()
@@ -0,0 +1,88 @@
+from types import SimpleNamespace
+
+from termflow.core import scheduler as scheduler_module
+from termflow.core.scheduler import TickScheduler
+
+
+class _Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+class _Timer:
+    def __init__(self, app, due, callback):
+        self.app, self.due, self.callback = app, due, callback
+
+    def stop(self):
+        self.app.timers.remove(self)
+
+
+class _App:
+    """Stands in for the Textual app: one-shot timers on a simulated clock."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.timers = []
+
+    def set_timer(self, delay, callback, name=None):
+        timer = _Timer(self, self.clock.now + delay, callback)
+        self.timers.append(timer)
+        return timer
+
+    def advance_to(self, end):
+        while self.timers and min(t.due for t in self.timers) <= end:
+            timer = min(self.timers, key=lambda t: t.due)
+            self.timers.remove(timer)
+            self.clock.now = timer.due
+            timer.callback()
+        self.clock.now = end
+
+
+_SHOWN = SimpleNamespace(is_attached=True, region=SimpleNamespace(area=1))
+_HIDDEN = SimpleNamespace(is_attached=True, region=SimpleNamespace(area=0))
+
+
+def test_a_day_of_ticks_keeps_cadence_and_coalesces(monkeypatch):
+    clock = _Clock(1_000_000.0)
+    monkeypatch.setattr(scheduler_module, "time", clock)
+    app = _App(clock)
+    scheduler = TickScheduler(app, idle_after=float("inf"))
+    runs = {"clock": [], "stats": [], "hidden": []}
+    scheduler.register(_SHOWN, lambda: runs["clock"].append(clock.now), 1)
+    scheduler.register(_SHOWN, lambda: runs["stats"].append(clock.now), 60)
+    scheduler.register(_HIDDEN, lambda: runs["hidden"].append(clock.now), 1)
+
+    day = 24 * 3600
+    app.advance_to(clock.now + day)
+    # no drift: one run per interval, each on a whole multiple of it
+    assert len(runs["clock"]) == day
+    assert all(t % 1 == 0 for t in runs["clock"])
+    assert len(runs["stats"]) == day // 60
+    assert all(t % 60 == 0 for t in runs["stats"])
+    # the minute job rides along with the second job's wake-ups
+    assert scheduler.wakeups == day
+    assert runs["hidden"] == []
+
+
+def test_idle_switches_to_low_power_and_input_wakes_it(monkeypatch):
+    clock = _Clock(2_000_000.0)
+    monkeypatch.setattr(scheduler_module, "time", clock)
+    app = _App(clock)
+    scheduler = TickScheduler(app, idle_after=60)
+    runs = []
+    scheduler.register(_SHOWN, lambda: runs.append(clock.now), 1, low_power_interval=30)
+    power = []
+    scheduler.subscribe_power(power.append)
+
+    app.advance_to(clock.now + 3600)
+    assert power == [True]
+    # about 60 one-second runs, then one every 30 seconds for the rest of the hour
+    assert 60 + 115 <= len(runs) <= 60 + 121
+    scheduler.touch()
+    assert power == [True, False]
+    before = len(runs)
+    app.advance_to(clock.now + 10)
+    assert len(runs) - before >= 10
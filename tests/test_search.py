@@ -0,0 +1,53 @@
+from termflow.utils.search import TrigramIndex
+
+
+def _index(*texts):
+    index = TrigramIndex()
+    index.update((str(i), text) for i, text in enumerate(texts))
+    return index
+
+
+def test_misspelled_queries_still_match():
+    index = _index("Review the PR", "Task list cleanup", "Buy milk")
+    assert index.search("revew") == ["0"]
+    assert index.search("tsk") == ["1"]
+    assert index.search("zzz") == []
+
+
+def test_best_match_comes_first_whatever_the_limit():
+    noise = [f"preview notes {i}" for i in range(50)]
+    index = _index(*noise, "review")
+    # the only word-start match ranks first, not lost to the limit
+    assert index.search("review", limit=1) == [str(len(noise))]
+    assert index.search("review", limit=3) == [str(len(noise)), "0", "1"]
+
+
+def test_ties_keep_list_order():
+    index = _index(*(f"task {i}" for i in range(30)))
+    assert index.search("task", limit=5) == ["0", "1", "2", "3", "4"]
+
+
+def test_short_words_match_word_starts():
+    index = _index("go shopping", "algorithm")
+    assert index.search("go") == ["0"]
+
+
+def test_bracketed_tags_are_words():
+    index = _index("write report [work]", "pay rent [home]", "homework")
+    assert index.search("home") == ["1", "2"]
+    assert index.search("[work]") == ["0", "2"]
+    assert index.search("wo") == ["0"]
+
+
+def test_loose_word_with_a_short_one():
+    index = _index(*(f"task {i}" for i in range(200)))
+    assert index.search("tsk 12", limit=20) == ["12", *(str(i) for i in range(120, 130))]
+
+
+def test_palette_shows_task_text_verbatim():
+    from textual.fuzzy import Matcher
+    from termflow.ui.app import highlight_plain
+
+    content = highlight_plain(Matcher("fix"), "fix [dev] build [/]")
+    assert content.plain == "fix [dev] build [/]"
+    assert [(span.start, span.end) for span in content.spans] == [(0, 1), (1, 2), (2, 3)]
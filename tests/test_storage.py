@@ -0,0 +1,69 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_import_does_not_create_the_data_dir(tmp_path):
+    env = dict(os.environ, HOME=str(tmp_path), XDG_DATA_HOME=str(tmp_path / "data"), PYTHONPATH=str(ROOT))
+    subprocess.run([sys.executable, "-c", "import termflow.utils.storage"], env=env, check=True)
+    assert not (tmp_path / "data" / "termflow").exists()
+
+
+def test_failed_config_save_is_retried(tmp_path, monkeypatch):
+    from termflow.utils import storage
+    from termflow.utils.storage import ConfigStore
+
+    path = tmp_path / "config.toml"
+    config = ConfigStore(path, delay=60)
+    real_write = storage.atomic_write
+
+    def disk_full(target, data):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(storage, "atomic_write", disk_full)
+    config.set("city", "Oslo")
+    config.flush()
+    assert not path.exists()
+    assert config._flusher.pending
+
+    # someone edits the file meanwhile; the unsaved key still wins
+    path.write_text('pomodoro_duration = 50\ncity = "Rome"\n')
+    config.reload_if_changed()
+    assert (config.get("city"), config.pomodoro_duration) == ("Oslo", 50)
+
+    monkeypatch.setattr(storage, "atomic_write", real_write)
+    config.flush()
+    assert ConfigStore(path).get("city") == "Oslo"
+    config._flusher.cancel()
+
+
+def test_config_burst_is_one_write_and_exit_flushes(tmp_path, monkeypatch):
+    from termflow.utils import storage
+    from termflow.utils.storage import ConfigStore
+
+    writes = []
+    real_write = storage.atomic_write
+    monkeypatch.setattr(storage, "atomic_write", lambda path, data: (writes.append(data), real_write(path, data)))
+    config = ConfigStore(tmp_path / "config.toml", delay=60)
+    for minutes in range(10, 60):
+        config.set("pomodoro_duration", minutes)
+    config.update({"theme": "builtin:light", "buddy_enabled": False})
+    assert writes == []
+    config.flush()
+    config.flush()
+    assert len(writes) == 1
+    assert ConfigStore(tmp_path / "config.toml").pomodoro_duration == 59
+
+    # a change still waiting on the timer is written when the process exits
+    env = dict(os.environ, HOME=str(tmp_path), XDG_DATA_HOME=str(tmp_path / "data"), PYTHONPATH=str(ROOT))
+    script = (
+        "from termflow.utils.storage import get_config_store\n"
+        "config = get_config_store()\n"
+        "config._flusher.delay = 60\n"
+        "config.set('city', 'Lisbon')\n"
+    )
+    subprocess.run([sys.executable, "-c", script], env=env, check=True)
+    assert ConfigStore(tmp_path / "data" / "termflow" / "config.toml").get("city") == "Lisbon"
@@ -0,0 +1,84 @@
+import asyncio
+
+from textual.app import App
+
+from termflow.panels.todo_list import TodoListView
+
+
+class _ListApp(App):
+    def compose(self):
+        yield TodoListView()
+
+
+def test_row_cache_is_keyed_by_task_id():
+    todos = [{"id": f"t{i}", "text": f"task {i}", "done": False} for i in range(5)]
+
+    async def run():
+        app = _ListApp()
+        async with app.run_test(size=(40, 10)) as pilot:
+            view = app.query_one(TodoListView)
+            rendered = []
+            render_row = view._render_row
+            view._render_row = lambda todo, *args: rendered.append(todo["id"]) or render_row(todo, *args)
+            view.set_rows(todos)
+            await pilot.pause()
+            first = len(rendered)
+            # a reload hands the view new dicts for the same tasks
+            view.set_rows([dict(todo) for todo in todos])
+            await pilot.pause()
+            unchanged = len(rendered) - first
+            # a new task in a recycled dict must not reuse another task's row
+            view.set_rows([{"id": "new", "text": "other", "done": False}] + todos[1:])
+            await pilot.pause()
+            return first, unchanged, rendered[-1]
+
+    first, unchanged, last = asyncio.run(run())
+    assert first == 5
+    assert unchanged == 0
+    assert last == "new"
+
+
+def test_cursor_follows_its_task_when_a_row_is_inserted_above():
+    todos = [{"id": f"t{i}", "text": f"task {i}", "done": False} for i in range(5)]
+
+    async def run():
+        app = _ListApp()
+        async with app.run_test(size=(40, 10)) as pilot:
+            view = app.query_one(TodoListView)
+            view.set_rows(todos)
+            view.cursor = 2
+            await pilot.pause()
+            # an undo puts a deleted task back above the cursor
+            view.set_rows([todos[0], {"id": "back", "text": "restored", "done": False}, *todos[1:]])
+            await pilot.pause()
+            moved = view.cursor_todo["id"]
+            view.set_rows([todo for todo in todos if todo["id"] != "t0"])
+            await pilot.pause()
+            return moved, view.cursor_todo["id"]
+
+    assert asyncio.run(run()) == ("t2", "t2")
+
+
+def test_cursor_follows_its_task_in_a_live_store_view(tmp_path):
+    from termflow.utils.todos import TodoStore
+
+    store = TodoStore(tmp_path / "todos.json", delay=60)
+    added = [store.add(f"task {i} [dev]") for i in range(5)]
+
+    async def run():
+        app = _ListApp()
+        async with app.run_test(size=(40, 10)) as pilot:
+            view = app.query_one(TodoListView)
+            results = []
+            for tag in (None, "dev"):
+                view.set_rows(store.rows(tag))
+                view.cursor = view.index_of(added[3]["id"])
+                await pilot.pause()
+                # the rows change in place; set_rows is told afterwards
+                store.delete(added[len(results)]["id"])
+                view.set_rows(store.rows(tag))
+                await pilot.pause()
+                results.append(view.cursor_todo["id"])
+            return results
+
+    assert asyncio.run(run()) == [added[3]["id"], added[3]["id"]]
@@ -0,0 +1,40 @@
+import asyncio
+
+from textual.app import App
+from textual.widgets import Input, ListView
+
+import termflow.utils.todos as todos_module
+from termflow.panels.todo import TodoPanel
+from termflow.utils.todos import TodoStore
+
+
+class _PanelApp(App):
+    flow_state = "IDLE"
+
+    def compose(self):
+        yield TodoPanel()
+
+
+def test_space_toggle_can_be_undone(tmp_path, monkeypatch):
+    store = TodoStore(tmp_path / "todos.json", delay=60)
+    monkeypatch.setattr(todos_module, "_store", store)
+
+    async def run():
+        app = _PanelApp()
+        async with app.run_test() as pilot:
+            panel = app.query_one(TodoPanel)
+            todo_input = app.query_one("#todo-input", Input)
+            panel.on_input_submitted(Input.Submitted(todo_input, "write report"))
+            await pilot.pause()
+            app.query_one("#todo-list", ListView).focus()
+            app.query_one("#todo-list", ListView).index = 0
+            await pilot.press("space")
+            await pilot.pause()
+
+    asyncio.run(run())
+    assert store[0]["done"] is True
+    # the toggle, then the add, are still on the undo stack
+    store.undo()
+    assert store[0]["done"] is False
+    store.undo()
+    assert len(store) == 0
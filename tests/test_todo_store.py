@@ -0,0 +1,172 @@
+import json
+
+from termflow.utils.backends import JsonBackend
+from termflow.utils.todos import TodoStore
+
+
+def _legacy_file(tmp_path):
+    path = tmp_path / "todos.json"
+    # written before tasks had IDs
+    path.write_text(json.dumps([{"text": "write docs", "done": False}, {"task": "old key", "completed": True}]))
+    return path
+
+
+def test_legacy_ids_are_stable_across_loads(tmp_path):
+    path = _legacy_file(tmp_path)
+    first = TodoStore(path)
+    ids = [todo["id"] for todo in first.todos()]
+    # what atexit (or the CLI) does on the way out; no other change was made
+    first.flush()
+    second = TodoStore(path)
+    assert [todo["id"] for todo in second.todos()] == ids
+
+
+
+class _FailingOnce(JsonBackend):
+    def __init__(self, path):
+        super().__init__(path)
+        self.fail = False
+
+    def append(self, ops):
+        if self.fail:
+            self.fail = False
+            raise OSError("disk full")
+        super().append(ops)
+
+
+def test_failed_write_keeps_the_edits(tmp_path):
+    path = tmp_path / "todos.json"
+    store = TodoStore(backend=_FailingOnce(path))
+    store.add("first")
+    store.flush()
+    store.backend.fail = True
+    todo = store.add("second")
+    store.flush()
+    # nothing changed since the failure; quitting must still write it
+    store.flush()
+    assert [t["id"] for t in TodoStore(path).todos()][-1] == todo["id"]
+
+
+def test_mismatched_journal_is_still_replayed(tmp_path):
+    path = tmp_path / "todos.json"
+    store = TodoStore(path, delay=60)
+    first = store.add("first")
+    second = store.add("second")
+    store.compact()
+    store.set_done(first["id"], True)
+    store.delete(second["id"])
+    store.add("third")
+    store.flush()
+    # the snapshot changes under the journal, as when a compaction is
+    # interrupted or the file is edited by hand
+    data = json.loads(path.read_text())
+    data.append({"id": "handmade", "text": "added by hand", "done": False})
+    path.write_text(json.dumps(data))
+    reloaded = TodoStore(path)
+    assert [(todo["text"], todo["done"]) for todo in reloaded.todos()] == [
+        ("first", True), ("added by hand", False), ("third", False),
+    ]
+
+
+def test_close_folds_the_journal_into_the_snapshot(tmp_path):
+    path = tmp_path / "todos.json"
+    store = TodoStore(path, delay=60)
+    store.add("one")
+    store.compact()
+    store.add("two")
+    store.close()
+    assert [todo["text"] for todo in json.loads(path.read_text())] == ["one", "two"]
+    assert not store.backend.journaled
+
+
+def test_reload_updates_the_search_index_in_place(tmp_path):
+    path = tmp_path / "todos.json"
+    store = TodoStore(path, delay=60)
+    store.add("water plants")
+    store.flush()
+    index = store.search_index()
+    # another process rewrites the file
+    other = TodoStore(path, delay=60)
+    other.replace([{"id": "x1", "text": "review budget", "done": False}])
+    other.flush()
+    assert store.reload_if_changed()
+    assert store.search_index() is index
+    assert [todo["text"] for todo in store.search("review")] == ["review budget"]
+    assert store.search("water") == []
+
+
+def test_hand_edited_bad_text_is_repaired_on_load(tmp_path):
+    path = tmp_path / "todos.json"
+    path.write_text(json.dumps([
+        {"id": "a", "text": None, "done": False},
+        {"id": "b", "text": 42, "done": True},
+        {"id": "c", "text": "fine [dev]", "done": False},
+    ]))
+    store = TodoStore(path)
+    assert [todo["text"] for todo in store.todos()] == ["Untitled", "42", "fine [dev]"]
+    assert store.tags() == ["dev"]
+
+
+def test_positions_follow_deletes_and_undone_inserts(tmp_path):
+    store = TodoStore(tmp_path / "todos.json", delay=60)
+    ids = [store.add(f"task {i}")["id"] for i in range(6)]
+    store.delete(ids[1])
+    store.delete(ids[4])
+    store.undo()  # back between two existing tasks
+    store.undo()
+    store.delete(ids[0])
+    order = [todo["id"] for todo in store.todos()]
+    assert order == ids[1:]
+    assert [store.index_of(todo_id) for todo_id in order] == list(range(len(order)))
+    assert store.index_of(ids[0]) == -1
+
+
+class _Counting(JsonBackend):
+    def __init__(self, path):
+        super().__init__(path)
+        self.writes = []
+
+    def append(self, ops):
+        self.writes.append(("append", len(ops)))
+        super().append(ops)
+
+    def rewrite(self, todos):
+        self.writes.append(("rewrite", len(todos)))
+        super().rewrite(todos)
+
+
+def test_a_burst_of_edits_is_one_write(tmp_path):
+    store = TodoStore(backend=_Counting(tmp_path / "todos.json"), delay=60)
+    todos = [store.add(f"task {i}") for i in range(50)]
+    for todo in todos[::2]:
+        store.set_done(todo["id"], True)
+    store.delete(todos[1]["id"])
+    assert store.backend.writes == []
+    store.flush()
+    # the first save creates todos.json; later ones go to the journal
+    assert store.backend.writes == [("rewrite", 49)]
+    store.set_done(todos[0]["id"], False)
+    store.add("one more")
+    store.flush()
+    store.flush()
+    assert store.backend.writes == [("rewrite", 49), ("append", 2)]
+
+
+def test_unflushed_edits_are_written_on_exit(tmp_path):
+    import os
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    env = dict(os.environ, HOME=str(tmp_path), XDG_DATA_HOME=str(tmp_path / "data"),
+               TERMFLOW_SOCKET=str(tmp_path / "no-daemon.sock"),
+               PYTHONPATH=str(Path(__file__).resolve().parents[1]))
+    script = (
+        "from termflow.utils.todos import get_todo_store\n"
+        "store = get_todo_store()\n"
+        "store._flusher.delay = 60\n"
+        "store.add('written by atexit')\n"
+    )
+    subprocess.run([sys.executable, "-c", script], env=env, check=True)
+    texts = [todo["text"] for todo in TodoStore(tmp_path / "data" / "termflow" / "todos.json").todos()]
+    assert texts == ["written by atexit"]
@@ -0,0 +1,62 @@
+import asyncio
+
+from textual.widgets._toast import Toast
+
+import termflow.utils.todos as todos_module
+from termflow.utils.todos import TodoStore
+from termflow.utils.undo import UndoEntry, UndoHistory
+
+
+def test_history_is_bounded_and_a_new_action_clears_redo():
+    history = UndoHistory(limit=3)
+    for i in range(5):
+        history.record(UndoEntry("del", f"id{i}"))
+    assert len(history) == 3
+    assert history.pop_undo().todo_id == "id4"
+    history.push_redo(UndoEntry("ins", "id4"))
+    assert history.can_redo
+    history.record(UndoEntry("del", "id5"))
+    assert not history.can_redo
+    assert [history.pop_undo().todo_id for _ in range(3)] == ["id5", "id3", "id2"]
+    assert history.pop_undo() is None
+
+
+def test_store_undo_and_redo_round_trip(tmp_path):
+    store = TodoStore(tmp_path / "todos.json", delay=60)
+    first = store.add("first")
+    second = store.add("second")
+    store.set_done(first["id"], True)
+    store.delete(second["id"])
+
+    assert store.undo()["id"] == second["id"]
+    assert store.undo()["id"] == first["id"]
+    assert [(t["text"], t["done"]) for t in store.todos()] == [("first", False), ("second", False)]
+    store.redo()
+    store.redo()
+    assert [(t["text"], t["done"]) for t in store.todos()] == [("first", True)]
+    assert store.redo() is None
+
+
+def test_app_undo_notice_keeps_markup_in_task_text(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path / "data"))
+    store = TodoStore(tmp_path / "todos.json", delay=60)
+    monkeypatch.setattr(todos_module, "_store", store)
+    from termflow.ui.app import TermFlowApp
+
+    async def run():
+        app = TermFlowApp()
+        async with app.run_test(size=(120, 50), notifications=True) as pilot:
+            store.add("fix [dev] build")
+            store.add("odd [/] text")
+            await pilot.pause()
+            app.action_undo()
+            app.action_undo()
+            await pilot.pause()
+            app.action_redo()
+            await pilot.pause()
+            # what the toasts show, not the markup handed to them
+            return [toast.render().plain for toast in app.screen.query(Toast)]
+
+    shown = asyncio.run(run())
+    assert shown == ["Undone: odd [/] text", "Undone: fix [dev] build", "Redone: fix [dev] build"]
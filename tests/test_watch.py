@@ -0,0 +1,37 @@
+import os
+import queue
+
+import pytest
+
+from termflow.utils.watch import FileWatcher
+
+
+@pytest.mark.parametrize("use_inotify", [True, False], ids=["inotify", "poll"])
+def test_external_edits_are_reported(tmp_path, use_inotify):
+    changes = queue.Queue()
+    watcher = FileWatcher(changes.put, poll_interval=0.05, use_inotify=use_inotify)
+    todos, config = tmp_path / "todos.json", tmp_path / "config.toml"
+    todos.write_text("[]")
+    watcher.watch(todos)
+    watcher.watch(config)
+    watcher.start()
+    if use_inotify and watcher.mode != "inotify":
+        watcher.stop()
+        pytest.skip("inotify is not available here")
+    assert watcher.mode == ("inotify" if use_inotify else "poll")
+    try:
+        # an in-place write, an atomic replace (as the stores save) and a new file
+        todos.write_text('[{"text": "edited"}]')
+        assert changes.get(timeout=5) == todos
+        replacement = tmp_path / ".todos.json.tmp"
+        replacement.write_text('[{"text": "replaced"}]')
+        os.replace(replacement, todos)
+        assert changes.get(timeout=5) == todos
+        config.write_text('theme = "builtin:light"\n')
+        assert changes.get(timeout=5) == config
+        # files that are not watched are ignored
+        (tmp_path / "other.txt").write_text("x")
+        with pytest.raises(queue.Empty):
+            changes.get(timeout=0.3)
+    finally:
+        watcher.stop()
@@ -0,0 +1,78 @@
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from termflow.utils import weather
+from termflow.utils.weather import WeatherProvider
+
+
+class _Stub(ThreadingHTTPServer):
+    """A local weather provider that counts requests and can be made to fail."""
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.requests = []
+        self.status = 200
+        self.body = "Sunny +21°C"
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_port}/{{city}}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        body = self.server.body.encode("utf-8")
+        self.send_response(self.server.status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_cache_last_reading_and_backoff(tmp_path):
+    server = _Stub()
+    cache = tmp_path / "weather.json"
+    try:
+        provider = WeatherProvider(url=server.url, cache_path=cache, timeout=2)
+        reading = asyncio.run(provider.get("New York"))
+        assert reading.text == "Sunny +21°C"
+        assert server.requests == ["/New%20York"]
+
+        # fresh in memory, then from weather.json after a restart: no request
+        assert asyncio.run(provider.get("New York")) == reading
+        restarted = WeatherProvider(url=server.url, cache_path=cache, timeout=2)
+        assert asyncio.run(restarted.get("New York")) == reading
+        assert len(server.requests) == 1
+
+        # expired, and the provider answers with an error
+        stale = WeatherProvider(url=server.url, ttl=0, cache_path=cache, timeout=2)
+        server.status = 503
+        started = time.time()
+        assert asyncio.run(stale.get("New York")) == reading
+        assert len(server.requests) == 2
+        assert stale._retry_at["New York"] - started >= weather.BACKOFF_BASE
+        # backing off: the old reading again, without asking
+        assert asyncio.run(stale.get("New York")) == reading
+        assert len(server.requests) == 2
+
+        # each further failure doubles the wait
+        stale._retry_at["New York"] = 0
+        started = time.time()
+        asyncio.run(stale.get("New York"))
+        assert stale._retry_at["New York"] - started >= 2 * weather.BACKOFF_BASE
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    # the provider is gone altogether
+    stale._retry_at["New York"] = 0
+    assert asyncio.run(stale.get("New York")) == reading
+    assert stale.cached("New York") == reading
+    stale.close()
+    provider.close()